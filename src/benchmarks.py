@@ -0,0 +1,271 @@
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Iterator
+from database.Database import Database, schema_version
+from database.bulk.Generator import Generator
+from cli.TextTable import TextTable
+
+# times the public functions of the tables and every named statistic against generated datasets of several sizes
+# run from the src directory with: python benchmarks.py --flights 1000 10000 --output results.json
+# the results are written as JSON so the runs of different versions can be compared. --label names the run e.g. a git commit
+#
+# every size of dataset is generated with Generator into a new database with the same seed so two runs of the same
+# version benchmark the same rows. the benchmarks that read run first and the rows they insert are deleted again by the
+# delete_and_return benchmarks so every benchmark sees the dataset that was generated
+#
+# the public functions that aren't benchmarked are the ones that make or upgrade the schema (create_table, create_indexes,
+# the migrations and backfills, rebuild and run_in_chunks), the ones the menus use to build prompts (get_column, get_placeholder,
+# get_insert_values and get_column_choices), clear_cache and get_seat_map (which every seat function calls), the insert_many
+# of flight_passengers and flight_pilots (a pair can only be inserted once so there aren't enough new pairs for every call)
+# and update_seat_number (which change_seat calls)
+
+# the percentiles of the time taken by each call that are reported
+percentiles = [50, 90, 99]
+
+# for each table with an integer key (x, y, z) where x is the values of a row to insert, y is a column to search by
+# and update and z is the field of the rows from get that has the value of y. e.g. terminals are searched by their name
+# which is the terminal_name of an ExtendedTerminal
+keyed_tables = {
+    "pilots": (("Amelia", "Earhart", "1897-07-24"), "last_name", "last_name"),
+    "airports": (("Heathrow", "Longford, Hounslow"), "name", "name"),
+    "terminals": (("1", "Terminal 1"), "name", "terminal_name"),
+    "customers": (("John", "Smith", "1990-01-01", "1 High Street", "07123456789"), "last_name", "last_name"),
+    "aircrafts": (("Boeing 747", "1", "400"), "name", "name"),
+    "flights": (("1", "1", "London", "2030-01-01 09:00:00", "2030-01-01 10:00:00", "2030-01-01 12:00:00"), "destination", "destination")
+}
+
+# the number of rows inserted by each call of insert_many
+insert_many_size = 100
+
+# yields (name, run, num_of_calls) for every benchmark. run is called with the number of the call (0, 1, ...)
+# and returns the number of rows it read, inserted, changed or deleted
+# counts is the number of rows of each table that the dataset was generated with. their ids are 1 to the count
+# this is a generator so the benchmarks that delete rows are made after the rows have been inserted
+def get_benchmarks(db: Database, counts: dict[str, int], num_of_calls: int, seed: int) -> Iterator[tuple[str, Callable[[int], int], int]]:
+    rng = random.Random(seed)
+
+    # the ids of each table to use in the calls. the same ids are used by every benchmark of a table
+    ids = {table_name: [rng.randint(1, counts[table_name]) for _ in range(num_of_calls)] for table_name in keyed_tables}
+
+    # a flight on an aircraft with two seats for every call so the passenger and pilot benchmarks can add to it
+    # and every passenger can change seat. it is made before the benchmarks so it is part of the dataset that every benchmark sees
+    aircraft = db.aircrafts.insert(("Benchmark", "1", str(2 * num_of_calls)))
+    flight = db.flights.insert((str(aircraft.aircraft_id), "1", "London", "2030-01-01 09:00:00", "2030-01-01 10:00:00", "2030-01-01 12:00:00"))
+    customer_ids = rng.sample(range(1, counts["customers"] + 1), min(num_of_calls, counts["customers"]))
+    pilot_ids = rng.sample(range(1, counts["pilots"] + 1), min(num_of_calls, counts["pilots"]))
+
+    for (table_name, (values, column_name, field)) in keyed_tables.items():
+        table = getattr(db, table_name)
+        key_column = table.key
+        table_ids = ids[table_name]
+
+        # the values to search by are taken from the rows with the ids so that most searches find rows
+        search_values = [str(getattr(next(table.get(key_column, str(id))), field)) for id in table_ids[:10]]
+
+        yield (f"{table_name}.get({key_column.split('.')[1]})", lambda i, table=table, key_column=key_column, table_ids=table_ids : len(list(table.get(key_column, str(table_ids[i])))), num_of_calls)
+        yield (f"{table_name}.get({column_name})", lambda i, table=table, column_name=column_name, search_values=search_values : len(list(table.get(column_name, search_values[i % len(search_values)]))), num_of_calls)
+        yield (f"{table_name}.get_all", lambda i, table=table : sum(1 for _ in table.get_all()), num_of_calls)
+        yield (f"{table_name}.get_page", lambda i, table=table, table_ids=table_ids : len(table.get_page(table_ids[i], 20)), num_of_calls)
+        yield (f"{table_name}.count_rows", lambda i, table=table : table.count_rows(), num_of_calls)
+        yield (f"{table_name}.exists", lambda i, table=table, table_ids=table_ids : int(table.exists(table_ids[i])), num_of_calls)
+        yield (f"{table_name}.exists_many", lambda i, table=table, table_ids=table_ids : len(table.exists_many(table_ids)), num_of_calls)
+        yield (f"{table_name}.get_key_at", lambda i, table=table, table_ids=table_ids : int(table.get_key_at(table_ids[i] - 1) is not None), num_of_calls)
+        yield (f"{table_name}.count_cascaded_rows", lambda i, table=table, key_column=key_column, table_ids=table_ids : sum(table.count_cascaded_rows(key_column, str(table_ids[i])).values()), num_of_calls)
+
+    yield ("flight_passengers.get", lambda i : len(list(db.flight_passengers.get(ids["flights"][i]))), num_of_calls)
+    yield ("flight_passengers.get_all", lambda i : sum(1 for _ in db.flight_passengers.get_all()), num_of_calls)
+    yield ("flight_passengers.exists", lambda i : int(db.flight_passengers.exists(ids["flights"][i], ids["customers"][i])), num_of_calls)
+    yield ("flight_passengers.get_next_available_seat", lambda i : int(db.flight_passengers.get_next_available_seat(ids["flights"][i]) is not None), num_of_calls)
+    yield ("flight_passengers.is_seat_available", lambda i : int(db.flight_passengers.is_seat_available(ids["flights"][i], 1)), num_of_calls)
+    yield ("flight_passengers.get_num_of_free_seats", lambda i : int(db.flight_passengers.get_num_of_free_seats(ids["flights"][i]) > 0), num_of_calls)
+    yield ("flight_passengers.get_adjacent_available_seats", lambda i : int(db.flight_passengers.get_adjacent_available_seats(ids["flights"][i], 2) is not None), num_of_calls)
+    yield ("flight_passengers.get_max_passengers", lambda i : int(db.flight_passengers.get_max_passengers(ids["flights"][i]) is not None), num_of_calls)
+    yield ("flight_pilots.get", lambda i : len(list(db.flight_pilots.get(ids["flights"][i]))), num_of_calls)
+    yield ("flight_pilots.get_all", lambda i : sum(1 for _ in db.flight_pilots.get_all()), num_of_calls)
+    yield ("flight_pilots.exists", lambda i : int(db.flight_pilots.exists(ids["flights"][i], ids["pilots"][i])), num_of_calls)
+
+    # the arguments of the named statistics. see Statistics.named_statistics
+    for statistic_name in ["flights-per-week", "flights-per-month", "customers-per-day-of-week", "pilot-air-time", "pilot-flights-per-day-of-week",
+                           "destination-popularity", "upcoming-flights-by-used-seats", "pilots-by-flights", "customers-by-flights",
+                           "flight-passenger-count", "flight-pilot-count"]:
+        def run_statistic(i: int, statistic_name: str = statistic_name) -> int:
+            arguments = {"destination": "Malaga", "pilot_id": str(ids["pilots"][i]), "flight_id": str(ids["flights"][i]), "limit": "50"}
+            result = db.statistics.get_named_statistic(statistic_name, arguments)
+            return len(result) if isinstance(result, list) else int(result is not None)
+
+        yield (f"statistics.{statistic_name}", run_statistic, num_of_calls)
+
+    # the rows inserted by each table's insert benchmark. they are changed and deleted by its update and delete_and_return benchmarks
+    inserted_ids = {table_name: [] for table_name in keyed_tables}
+
+    for (table_name, (values, column_name, field)) in keyed_tables.items():
+        table = getattr(db, table_name)
+
+        def insert(i: int, table=table, values=values, table_ids=inserted_ids[table_name]) -> int:
+            table_ids.append(table.insert(values)[0])
+            return 1
+
+        yield (f"{table_name}.insert", insert, num_of_calls)
+        yield (f"{table_name}.insert_many", lambda i, table=table, values=values : table.insert_many([values] * insert_many_size).count, num_of_calls)
+
+    yield ("flight_passengers.insert", lambda i : int(db.flight_passengers.insert(flight.flight_id, customer_ids[i], i + 1) is not None), len(customer_ids))
+    yield ("flight_pilots.insert", lambda i : int(db.flight_pilots.insert(flight.flight_id, pilot_ids[i]) is not None), len(pilot_ids))
+
+    for (table_name, (values, column_name, field)) in keyed_tables.items():
+        table = getattr(db, table_name)
+        table_ids = inserted_ids[table_name]
+
+        # each inserted row is given the value of the column from the same row that the insert benchmark gave it
+        new_value = values[[column.name for column in table.columns.values()].index(column_name) - 1]
+        yield (f"{table_name}.update", lambda i, table=table, column_name=column_name, new_value=new_value, table_ids=table_ids : int(table.update(table_ids[i], column_name, new_value) is not None), len(table_ids))
+
+    # each passenger moves from their seat in the first half of the flight to the next available seat in the second half
+    yield ("flight_passengers.change_seat", lambda i : int(db.flight_passengers.change_seat(flight.flight_id, customer_ids[i]) is not None), len(customer_ids))
+
+    yield ("flight_passengers.delete_and_return", lambda i : db.flight_passengers.delete_and_return(flight.flight_id, customer_ids[i]).count, len(customer_ids))
+    yield ("flight_pilots.delete_and_return", lambda i : db.flight_pilots.delete_and_return(flight.flight_id, pilot_ids[i]).count, len(pilot_ids))
+
+    # the passengers are added to the empty flight again in the next available seat. they are left on the benchmark flight
+    yield ("flight_passengers.assign_seat", lambda i : int(db.flight_passengers.assign_seat(flight.flight_id, customer_ids[i]) is not None), len(customer_ids))
+
+    # the tables that are referenced by the others are deleted from last so deleting a row never cascades
+    for table_name in reversed(keyed_tables):
+        table = getattr(db, table_name)
+        key_column = table.key
+        table_ids = inserted_ids[table_name]
+        yield (f"{table_name}.delete_and_return", lambda i, table=table, key_column=key_column, table_ids=table_ids : table.delete_and_return(key_column, str(table_ids[i])).count, len(table_ids))
+
+# returns the time in times that p percent of the times are less than or equal to. times must be sorted
+def get_percentile(times: list[float], p: int) -> float:
+    return times[max(0, math.ceil(p / 100 * len(times)) - 1)]
+
+# calls run num_of_calls times or until max_seconds have passed and returns how long the calls took
+# the first call is not timed as it fills the caches (e.g. the pages of the table and the ids in Table.ids). it is traced with
+# tracemalloc instead to find the most memory that a call allocates. this is only the memory of python objects (e.g. the rows)
+# and not the memory that sqlite uses, which is part of the max_rss_bytes of each dataset
+def run_benchmark(name: str, run: Callable[[int], int], num_of_calls: int, max_seconds: float) -> dict:
+    if num_of_calls == 0:
+        return {"name": name, "calls": 0}
+
+    tracemalloc.start()
+    try:
+        run(0)
+        (_, peak_memory) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times = []
+    num_of_rows = 0
+    start = time.perf_counter()
+    for i in range(1, num_of_calls):
+        call_start = time.perf_counter()
+        num_of_rows += run(i)
+        times.append(time.perf_counter() - call_start)
+
+        if call_start - start > max_seconds:
+            break
+
+    total_seconds = sum(times)
+    times.sort()
+
+    result = {"name": name, "calls": len(times), "rows": num_of_rows, "total_seconds": total_seconds}
+    for p in percentiles:
+        result[f"p{p}_ms"] = get_percentile(times, p) * 1000 if len(times) > 0 else None
+    result["max_ms"] = times[-1] * 1000 if len(times) > 0 else None
+    result["calls_per_second"] = len(times) / total_seconds if total_seconds > 0 else None
+    result["rows_per_second"] = num_of_rows / total_seconds if total_seconds > 0 else None
+    result["peak_memory_bytes"] = peak_memory
+
+    return result
+
+# generates a dataset with num_of_flights flights in a new database and runs every benchmark against it
+def benchmark_dataset(num_of_flights: int, booked_fraction: float, profile: str, num_of_calls: int, max_seconds: float, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        # errors raise a DatabaseError instead of exiting so a failing benchmark shows where it failed
+        db = Database(os.path.join(directory, "airline"), profile, exit_on_error=False)
+        db.connect()
+        db.create_tables()
+
+        try:
+            start = time.perf_counter()
+            counts = Generator(db, seed, show_progress=sys.stdout.isatty()).generate(num_of_flights, booked_fraction)
+            generate_seconds = time.perf_counter() - start
+
+            results = []
+            for (name, run, calls) in get_benchmarks(db, counts, num_of_calls, seed):
+                results.append(run_benchmark(name, run, calls, max_seconds))
+        finally:
+            db.close()
+
+    return {
+        "num_of_flights": num_of_flights,
+        "booked_fraction": booked_fraction,
+        "counts": counts,
+        "generate_seconds": generate_seconds,
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, # the most memory the process has used so far. in KiB on linux
+        "benchmarks": results
+    }
+
+# prints the results of a dataset as a text table
+def print_results(dataset: dict) -> None:
+    print(f"\n{dataset['num_of_flights']} flights ({dataset['counts']['flight_passengers']} passengers) generated in {dataset['generate_seconds']:.1f}s")
+
+    text_table = TextTable(["Benchmark", "Calls", "p50 ms", "p90 ms", "p99 ms", "Rows/s", "Peak KiB"])
+    for result in dataset["benchmarks"]:
+        if result["calls"] == 0:
+            continue
+
+        text_table.add_row([
+            result["name"],
+            str(result["calls"]),
+            *(f"{result[f'p{p}_ms']:.3f}" for p in percentiles),
+            f"{result['rows_per_second']:.0f}" if result["rows_per_second"] is not None else "",
+            str(result["peak_memory_bytes"] // 1024)
+        ])
+
+    print(text_table.get_string())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="benchmarks.py", description="time the tables and statistics against generated datasets")
+    parser.add_argument("--flights", type=int, nargs="+", default=[1000, 10000], help="the number of flights in each dataset")
+    parser.add_argument("--booked-fraction", type=float, default=1.0, help="the fraction of flights with passengers. see Generator")
+    parser.add_argument("--calls", type=int, default=200, help="the most times each function is called")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="each function stops being called after this many seconds")
+    parser.add_argument("--profile", default="interactive", help="the connection profile. see profiles in database/Database.py")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", help="the name of this run in the results e.g. a git commit or version")
+    parser.add_argument("--output", help="the file to write the results to as JSON")
+    parsed = parser.parse_args()
+
+    results = {
+        "label": parsed.label,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python_version": platform.python_version(),
+        "sqlite_version": sqlite3.sqlite_version,
+        "schema_version": schema_version,
+        "profile": parsed.profile,
+        "seed": parsed.seed,
+        "calls": parsed.calls,
+        "max_seconds": parsed.max_seconds,
+        "datasets": []
+    }
+
+    for num_of_flights in parsed.flights:
+        dataset = benchmark_dataset(num_of_flights, parsed.booked_fraction, parsed.profile, parsed.calls, parsed.max_seconds, parsed.seed)
+        results["datasets"].append(dataset)
+        print_results(dataset)
+
+    if parsed.output is not None:
+        with open(parsed.output, "w") as file:
+            json.dump(results, file, indent=4)
\ No newline at end of file
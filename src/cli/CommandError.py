@@ -0,0 +1,3 @@
+# raised by CommandLine when a command can't be run. e.g. a value is not valid for its column
+class CommandError(Exception):
+    pass
\ No newline at end of file
@@ -0,0 +1,336 @@
+import argparse
+import io
+import json
+import os
+import shlex
+import sys
+from contextlib import redirect_stdout
+from typing import Iterable
+from database.DatabaseError import DatabaseError
+from database.bulk.Importer import Importer
+from database.bulk.Exporter import Exporter, strip_compression
+from database.bulk.Generator import Generator, scales
+from database.statistics.Statistics import named_statistics
+from cli.CommandError import CommandError
+from cli.TextTable import TextTable, get_terminal_width
+
+# the tables that rows can be inserted into, searched, deleted from, imported and exported. the same tables as the menus
+tables = ["pilots", "customers", "aircrafts", "airports", "terminals", "flights"]
+
+# runs a command given as arguments to main.py instead of starting the menus so a program or a script can use the database
+#   python main.py insert customers first_name=Amy last_name=Smith date_of_birth=2000-01-01 home_address="1 Road" phone_number=0123
+#   python main.py insert flight_passengers flight_id=3 customer_id=4          (the next available seat or seat_number=x)
+#   python main.py search flights --column destination --value Rome
+#   python main.py delete customers --column customer_id --value 4
+#   python main.py stats flights-per-month destination=Rome
+#   python main.py import customers.csv flights.jsonl.gz --rejects rej.jsonl   (the table is the name of the file)
+#   python main.py export flights flights.csv.gz                               (.csv or JSON lines. .gz or .xz compresses it)
+#   python main.py snapshot extracts --extension .jsonl.gz                     (every table from one version of the database)
+#   python main.py stats flights-per-week --output weeks.csv
+#   python main.py generate --scale 1m --seed 7                                (fills the database with realistic rows)
+#   python main.py batch commands.txt                                          (one command per line. - reads stdin)
+# rows are printed as one JSON object per line so other programs can read them. --format table prints text tables instead
+class CommandLine:
+    def __init__(self, database: 'Database'):
+        self.db = database
+        self.format = "json" # how rows are printed. "json" or "table"
+
+        self.parser = argparse.ArgumentParser(prog="main.py", description="Runs a command on the airline database. Starts the menus without a command.")
+        self.parser.add_argument("--format", choices=["json", "table"], default="json", help="print rows as JSON lines or text tables")
+        commands = self.parser.add_subparsers(dest="command", required=True)
+
+        insert = commands.add_parser("insert", help="insert a row")
+        insert.add_argument("table", choices=tables + ["flight_passengers", "flight_pilots"])
+        insert.add_argument("values", nargs="+", metavar="column=value")
+
+        search = commands.add_parser("search", help="print every row or the rows where a column has a value")
+        search.add_argument("table", choices=tables)
+        search.add_argument("--column")
+        search.add_argument("--value")
+
+        delete = commands.add_parser("delete", help="delete the rows where a column has a value")
+        delete.add_argument("table", choices=tables)
+        delete.add_argument("--column", required=True)
+        delete.add_argument("--value", required=True)
+
+        stats = commands.add_parser("stats", help="print a statistic from the statistics menu")
+        stats.add_argument("statistic", choices=list(named_statistics))
+        stats.add_argument("arguments", nargs="*", metavar="parameter=value")
+        stats.add_argument("--output", help="write the rows to a .csv or JSON lines file instead of printing them")
+
+        import_rows = commands.add_parser("import", help="insert every row in .csv or JSON lines files named after their tables")
+        import_rows.add_argument("files", nargs="+", metavar="file")
+        import_rows.add_argument("--rejects", default="rejects.jsonl", help="the file that rows which can't be imported are written to")
+
+        export_rows = commands.add_parser("export", help="write every row to a .csv or JSON lines file")
+        export_rows.add_argument("table", choices=tables + ["flight_passengers", "flight_pilots"])
+        export_rows.add_argument("file", nargs="?", default="-")
+
+        snapshot = commands.add_parser("snapshot", help="export tables into a directory from one version of the database")
+        snapshot.add_argument("directory")
+        snapshot.add_argument("--tables", nargs="+", choices=tables + ["flight_passengers", "flight_pilots"], default=tables + ["flight_passengers", "flight_pilots"])
+        snapshot.add_argument("--extension", default=".csv", help="e.g. .csv, .jsonl or .csv.gz")
+
+        generate = commands.add_parser("generate", help="fill the database with a realistic dataset. the same seed makes the same dataset")
+        generate.add_argument("--scale", choices=list(scales), default="10k", help="the number of flights")
+        generate.add_argument("--flights", type=int, help="the number of flights instead of --scale")
+        generate.add_argument("--booked-fraction", type=float, help="the fraction of flights with passengers. depends on --scale by default")
+        generate.add_argument("--seed", type=int, default=0)
+
+        batch = commands.add_parser("batch", help="run every command in a file in one transaction")
+        batch.add_argument("file")
+
+    # runs the command in arguments (e.g. sys.argv[1:]) and returns the exit code of the program
+    def run(self, arguments: list[str]) -> int:
+        parsed = self.parser.parse_args(arguments)
+        self.format = parsed.format
+
+        try:
+            self.run_command(parsed)
+        except (CommandError, DatabaseError) as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 1
+        except BrokenPipeError:
+            # the program reading the output has stopped (e.g. | head) so there is no one to tell. a batch is rolled back
+            # stdout is pointed at /dev/null so python doesn't fail again flushing it when it exits
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 141 # the exit code of a program ended by SIGPIPE in a shell
+        else:
+            return 0
+
+    def run_command(self, parsed: argparse.Namespace) -> None:
+        match parsed.command:
+            case "insert":
+                self.insert(parsed.table, self.get_pairs(parsed.values))
+            case "search":
+                self.search(parsed.table, parsed.column, parsed.value)
+            case "delete":
+                self.delete(parsed.table, parsed.column, parsed.value)
+            case "stats":
+                self.print_statistic(parsed.statistic, self.get_pairs(parsed.arguments), parsed.output)
+            case "import":
+                self.import_rows(parsed.files, parsed.rejects)
+            case "export":
+                self.export_tables({parsed.table: parsed.file})
+            case "snapshot":
+                self.export_snapshot(parsed.directory, parsed.tables, parsed.extension)
+            case "generate":
+                self.generate(parsed.scale, parsed.flights, parsed.booked_fraction, parsed.seed)
+            case "batch":
+                self.run_batch(parsed.file)
+
+    # generates a dataset of the size of scale in scales (see Generator) unless num_of_flights or booked_fraction are given
+    def generate(self, scale: str, num_of_flights: int | None, booked_fraction: float | None, seed: int) -> None:
+        (scale_num_of_flights, scale_booked_fraction) = scales[scale]
+        num_of_flights = scale_num_of_flights if num_of_flights is None else num_of_flights
+        booked_fraction = scale_booked_fraction if booked_fraction is None else booked_fraction
+
+        if num_of_flights < 1 or not 0 <= booked_fraction <= 1:
+            raise CommandError("--flights must be positive and --booked-fraction must be between 0 and 1")
+
+        # the progress is only shown to a person so it isn't mixed in with the rows when stdout is read by a program
+        counts = Generator(self.db, seed, show_progress=sys.stdout.isatty()).generate(num_of_flights, booked_fraction)
+        self.print_rows([{"table": table_name, "count": count} for (table_name, count) in counts.items()])
+
+    # runs every line of the file as a command in one transaction so either every command is done or none of them are
+    # blank lines and lines starting with # are skipped
+    def run_batch(self, file_name: str) -> None:
+        file = sys.stdin if file_name == "-" else self.open_file(file_name, "r")
+
+        # the output of each line is kept until every line has been done so a program reading it never sees rows
+        # from a batch that was rolled back. it is written before the commit so a closed pipe still rolls the batch back
+        output = io.StringIO()
+        try:
+            with self.db.transaction():
+                with redirect_stdout(output):
+                    self.run_lines(file, file_name)
+
+                sys.stdout.write(output.getvalue())
+                sys.stdout.flush()
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+    # runs every line of a batch file. see run_batch
+    def run_lines(self, file: 'TextIO', file_name: str) -> None:
+        for (line_number, line) in enumerate(file, start=1):
+            arguments = shlex.split(line, comments=True)
+            if len(arguments) == 0:
+                continue
+
+            try:
+                parsed = self.parser.parse_args(arguments)
+            except SystemExit: # argparse has already printed why
+                raise CommandError(f"Line {line_number} of {file_name} is not a valid command")
+
+            if parsed.command == "batch":
+                raise CommandError(f"Line {line_number} of {file_name}: a batch can't run another batch")
+
+            try:
+                self.run_command(parsed)
+            except (CommandError, DatabaseError) as error:
+                # the error can already end with a full stop
+                raise CommandError(f"Line {line_number} of {file_name}: {str(error).rstrip('.')}. Nothing in the batch was done")
+
+    def open_file(self, file_name: str, mode: str) -> 'TextIO':
+        try:
+            return open(file_name, mode, newline="")
+        except OSError as error:
+            raise CommandError(f"Unable to open {file_name}: {error.strerror}")
+
+    # turns ["column=value", ...] into {"column": "value", ...}
+    def get_pairs(self, pairs: list[str]) -> dict[str, str]:
+        values = {}
+        for pair in pairs:
+            (name, equals, value) = pair.partition("=")
+            if equals == "":
+                raise CommandError(f"{pair} must be in the format name=value")
+            values[name] = value
+
+        return values
+
+    # returns the Column of table called column_name after checking that value is valid for it
+    def get_column(self, table: 'Table', column_name: str, value: str) -> 'Column':
+        column = table.get_column(column_name)
+        if column is None:
+            raise CommandError(f"{table.name} has no column named {column_name}")
+        if not column.is_valid(value):
+            raise CommandError(f"Invalid {column_name}. {column.validation_prompt}")
+
+        return column
+
+    # prints rows (named tuples or dictionaries) in self.format
+    # raises a BrokenPipeError if the program reading the output stops part of the way through (e.g. | head). see run
+    def print_rows(self, rows: Iterable) -> None:
+        try:
+            if self.format == "json":
+                for row in rows:
+                    print(json.dumps(row if isinstance(row, dict) else row._asdict()))
+                sys.stdout.flush() # so a closed pipe is found here instead of when the program exits
+                return
+
+            text_table = None
+            for row in rows:
+                if text_table is None:
+                    text_table = TextTable(list(row) if isinstance(row, dict) else row.get_column_names(), get_terminal_width())
+
+                text_table.add_row([str(value) for value in row.values()] if isinstance(row, dict) else row.to_row())
+
+            print("No rows." if text_table is None else text_table.get_string())
+            sys.stdout.flush()
+        finally:
+            # releases the reader of rows from get_all or a statistic if printing stopped part way through
+            if hasattr(rows, "close"):
+                rows.close()
+
+    def insert(self, table_name: str, values: dict[str, str]) -> None:
+        if table_name == "flight_passengers":
+            self.print_rows([self.assign_seat(values)])
+        elif table_name == "flight_pilots":
+            for column_name in ["flight_id", "pilot_id"]:
+                self.get_column(self.db.flight_pilots, column_name, values.get(column_name, ""))
+            if self.db.flight_pilots.exists(values["flight_id"], values["pilot_id"]):
+                raise CommandError("That pilot is already on that flight")
+
+            self.print_rows([self.db.flight_pilots.insert(values["flight_id"], values["pilot_id"])])
+        else:
+            table = getattr(self.db, table_name)
+            try:
+                row = table.insert(table.get_insert_values(values))
+            except ValueError as error:
+                raise CommandError(str(error))
+
+            self.print_rows([row])
+
+    # gives the customer the seat_number in values on the flight or the next available seat without one
+    def assign_seat(self, values: dict[str, str]) -> 'FlightPassenger':
+        for column_name in ["flight_id", "customer_id"]:
+            self.get_column(self.db.flight_passengers, column_name, values.get(column_name, ""))
+        (flight_id, customer_id) = (values["flight_id"], values["customer_id"])
+
+        if self.db.flight_passengers.exists(flight_id, customer_id):
+            raise CommandError("That customer is already on that flight")
+
+        seat_number = values.get("seat_number")
+        if seat_number is not None:
+            max_passengers = self.db.flight_passengers.get_max_passengers(flight_id)
+            if not seat_number.isdigit() or not 1 <= int(seat_number) <= max_passengers:
+                raise CommandError(f"Seat number must be an integer between 1 and {max_passengers} inclusive")
+
+        flight_passenger = self.db.flight_passengers.assign_seat(flight_id, customer_id, seat_number)
+        if flight_passenger is None:
+            raise CommandError("There are no more available seats on this flight" if seat_number is None else "That seat is taken")
+
+        return flight_passenger
+
+    def search(self, table_name: str, column_name: str | None, value: str | None) -> None:
+        table = getattr(self.db, table_name)
+        if column_name is None:
+            self.print_rows(table.get_all())
+        else:
+            if value is None:
+                raise CommandError("--column needs a --value")
+            self.print_rows(table.get(self.get_column(table, column_name, value).name, value))
+
+    def delete(self, table_name: str, column_name: str, value: str) -> None:
+        table = getattr(self.db, table_name)
+        result = table.delete_and_return(self.get_column(table, column_name, value).name, value)
+
+        # the counts of the rows deleted by ON DELETE CASCADE are printed to stderr so stdout only has the deleted rows
+        cascaded = [f"{count} {cascaded_table_name.replace('_', ' ')}" for (cascaded_table_name, count) in result.cascaded_counts.items() if count > 0]
+        print(f"Deleted {result.count} rows" + (f". This also deleted {', '.join(cascaded)}" if len(cascaded) > 0 else ""), file=sys.stderr)
+        self.print_rows(result.rows)
+
+    def print_statistic(self, statistic_name: str, arguments: dict[str, str], output_file_name: str | None = None) -> None:
+        try:
+            if output_file_name is not None:
+                Exporter(self.db).export_statistic(statistic_name, arguments, output_file_name)
+                return
+
+            rows = self.db.statistics.iterate_named_statistic(statistic_name, arguments)
+        except ValueError as error:
+            raise CommandError(str(error))
+        except OSError as error:
+            raise CommandError(f"Unable to write {output_file_name}: {error.strerror}")
+
+        self.print_rows(rows)
+
+    # imports every file into the table it is named after (e.g. flights.csv into flights) in the order of db.tables
+    # so the rows that foreign keys point to are imported first. ids in the files are kept
+    # rows that can't be imported are written to rejects_file_name with why instead of stopping the import
+    def import_rows(self, file_names: list[str], rejects_file_name: str) -> None:
+        files = {}
+        for file_name in file_names:
+            table_name = os.path.splitext(strip_compression(os.path.basename(file_name)))[0]
+            if table_name not in tables + ["flight_passengers", "flight_pilots"]:
+                raise CommandError(f"{file_name} must be named after a table. e.g. flights.csv")
+            if not os.path.isfile(file_name):
+                raise CommandError(f"Unable to open {file_name}")
+            files[table_name] = file_name
+
+        summaries = Importer(self.db, rejects_file_name).import_files(files)
+        self.print_rows([{"table": table_name, "count": summary.count, "rejected": summary.rejected} for (table_name, summary) in summaries.items()])
+
+    # writes every row of each table to its file as it is returned by get_all (e.g. flights include the names of their
+    # aircraft and terminal). import reads these files back
+    def export_tables(self, files: dict[str, str]) -> None:
+        try:
+            counts = Exporter(self.db).export_tables(files)
+        except OSError as error:
+            raise CommandError(f"Unable to write {error.filename or 'stdout'}: {error.strerror}")
+
+        if "-" not in files.values():
+            self.print_rows([{"table": table_name, "count": count} for (table_name, count) in counts.items()])
+
+    # writes each table to directory/table_name + extension (e.g. extracts/flights.csv.gz) from one snapshot
+    # so the files match each other. the directory can be imported with python main.py import directory/*
+    def export_snapshot(self, directory: str, table_names: list[str], extension: str) -> None:
+        if not strip_compression(extension).endswith((".csv", ".jsonl")):
+            raise CommandError("The extension must be .csv or .jsonl optionally followed by .gz or .xz")
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as error:
+            raise CommandError(f"Unable to make {directory}: {error.strerror}")
+
+        self.export_tables({table_name: os.path.join(directory, table_name + extension) for table_name in table_names})
\ No newline at end of file
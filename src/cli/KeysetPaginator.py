@@ -0,0 +1,123 @@
+import math
+from cli.TextTable import TextTable, get_terminal_width
+
+# a paginator that gets each page from the database when it is shown instead of being given every row up front
+# it uses Table.get_page so showing a page only reads the rows on that page, however big the table is
+# see Paginator.py for a paginator of rows that have already been got
+class KeysetPaginator:
+    def __init__(self, table: 'Table', column_name: str | None = None, value: str | None = None, page_size: int = 5, count_limit: int = 10000):
+        self.table = table
+
+        # only rows where column_name = value are shown. every row is shown if column_name is None
+        self.column_name = column_name
+        self.value = value
+
+        self.page_size = page_size
+        self.cur_page = -1 # 0-indexed
+        self.is_last = False # whether cur_page is the last page
+
+        # the key of the row before the start of each page that has been found so far
+        # going to one of these pages is just a get_page using this key
+        self.page_keys = {0: None}
+
+        # the number of rows is only counted when it is first shown and counting stops at count_limit
+        # so the first page takes the same time to show however many rows there are
+        self.count_limit = count_limit
+        self.num_of_rows = None
+
+    # the name of the attribute of a row that stores its key. e.g. "flight_id"
+    def get_key_name(self) -> str:
+        return self.table.key.split(".")[-1]
+
+    # returns (x, y) where x is the number of pages and y is whether x is exact
+    # x is a lower bound if there are more than count_limit rows
+    def get_num_of_pages(self) -> (int, bool):
+        if self.num_of_rows is None:
+            self.num_of_rows = self.table.count_rows(self.column_name, self.value, self.count_limit)
+
+        num_of_pages = math.ceil(self.num_of_rows / self.page_size)
+        return (num_of_pages, self.num_of_rows < self.count_limit)
+
+    # gets the rows on a page (0-indexed). returns an empty list if the page does not exist
+    def get_page(self, page: int) -> list['Row']:
+        if page < 0:
+            return []
+
+        if page not in self.page_keys:
+            # the key before this page is unknown as it has not been visited. find it from its position instead
+            after_key = self.table.get_key_at(page * self.page_size - 1, self.column_name, self.value)
+            if after_key is None:
+                return []
+            self.page_keys[page] = after_key
+
+        # get one extra row to determine if there is a next page
+        rows = self.table.get_page(self.page_keys[page], self.page_size + 1, self.column_name, self.value)
+
+        self.is_last = len(rows) <= self.page_size
+        rows = rows[:self.page_size]
+
+        if not self.is_last:
+            self.page_keys[page + 1] = getattr(rows[-1], self.get_key_name())
+
+        self.cur_page = page
+        return rows
+
+    # gets a string to output a page of rows
+    def get_string(self, rows: list['Row']) -> str:
+        page_table = TextTable(rows[0].get_column_names(), get_terminal_width())
+        for row in rows:
+            page_table.add_row(row.to_row())
+
+        (num_of_pages, is_exact) = self.get_num_of_pages()
+        if self.is_last: # the exact number of pages is known once the last page is reached
+            num_of_pages = self.cur_page + 1
+            is_exact = True
+
+        output = page_table.get_string()
+        output += f"\nPage {self.cur_page+1} of {num_of_pages if is_exact else f'more than {num_of_pages}'}."
+        if self.is_last_page():
+            output += " Press Enter to go back to the menu. Input a page number to go to that page."
+        else:
+            output += " Press Enter to go to the next page. Input a page number to go to that page. Input 0 to go back to the menu."
+
+        return output
+
+    # determines if we're on the last page
+    def is_last_page(self) -> bool:
+        return self.is_last
+
+    # returns the 0-indexed page that option is the number of or None if it isn't a number. e.g. "2" is page 1
+    def get_page_number(self, option: str) -> int | None:
+        try:
+            return int(option) - 1
+        except ValueError:
+            return None
+
+    # begin the paginator
+    def start(self) -> None:
+        rows = self.get_page(0)
+        if len(rows) == 0:
+            print("Page 0 of 0. No results. Press Enter to go back to the menu.")
+            input(">> ")
+            return
+
+        print(self.get_string(rows))
+        option = input(">> ")
+        # stop if the user input is 0 (or less e.g. "00") or if Enter is pressed on the last page
+        while True:
+            page = self.get_page_number(option)
+            if page is None:
+                if self.is_last_page():
+                    return
+                page = self.cur_page + 1
+            elif page < 0:
+                return
+
+            prev_page = self.cur_page
+            rows = self.get_page(page)
+            if len(rows) == 0:
+                rows = self.get_page(prev_page) # stay on the current page
+                print(f"There is no page {page+1}.")
+
+            print(self.get_string(rows))
+            option = input(">> ")
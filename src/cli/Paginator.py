@@ -1,20 +1,19 @@
 import math
-from cli.TextTable import TextTable
+from cli.TextTable import get_terminal_width
 
 class Paginator:
-    def __init__(self, text_table):
+    def __init__(self, text_table, page_size: int = 5):
         self.text_table = text_table
+        if self.text_table.max_width is None: # the widest columns are cut short so each page fits in the terminal
+            self.text_table.max_width = get_terminal_width()
+        self.page_size = page_size # the maximum number of rows on each page
         self.cur_page = -1 # 0-indexed
-        self.num_of_pages = math.ceil(len(self.text_table.rows) / 5) # each page has 5 rows max
+        self.num_of_pages = math.ceil(len(self.text_table.rows) / self.page_size)
     
     # gets a string to output the current page
     def get_string(self) -> str:
-        page_table = TextTable(self.text_table.column_names)
-        # min(x, y) is used as there could be less than 5 rows remaining
-        for i in range(self.cur_page*5, min((self.cur_page+1)*5, len(self.text_table.rows))):
-            page_table.add_row(self.text_table.rows[i])
-        
-        output = page_table.get_string()
+        # only the rows on the current page are formatted
+        output = self.text_table.get_string(self.cur_page*self.page_size, (self.cur_page+1)*self.page_size)
         if self.is_last_page():
             output += f"\nPage {self.cur_page+1} of {self.num_of_pages}. Press Enter to go back to the menu."
         else:
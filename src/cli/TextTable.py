@@ -1,43 +1,78 @@
+import shutil
+import sys
+from operator import itemgetter
+
+# returns the number of characters that fit on a line of the terminal or None if the output isn't going to a terminal
+# (e.g. it is piped to a file) so a table is only cut short to fit when a person is reading it
+def get_terminal_width() -> int | None:
+    if not sys.stdout.isatty():
+        return None
+
+    return shutil.get_terminal_size().columns
+
 class TextTable:
-    def __init__(self, column_names: list[str]) -> None:
+    # max_width is the number of characters that each line of the table must fit in. e.g. get_terminal_width()
+    # the widest columns are cut short to fit and end with ... . the table is as wide as it needs to be if it is None
+    def __init__(self, column_names: list[str], max_width: int | None = None) -> None:
         self.column_names = column_names
         self.num_of_columns = len(column_names)
+        self.max_width = max_width
 
         self.rows = []
-    
-    def add_row(self, row: list[str]) -> 'TextTable': 
+
+    def add_row(self, row: list[str]) -> 'TextTable':
         if self.num_of_columns != len(row):
-            raise Exception("Trying to add a row to a TextTable whose length is not equal to the number of columns") 
+            raise Exception("Trying to add a row to a TextTable whose length is not equal to the number of columns")
 
         self.rows.append(row)
 
         return self
-    
-    # gets a string to output the TextTable
-    def get_string(self) -> str:
-        column_widths = [] # stores the maximum widths for each column 
-        all_rows = [self.column_names] + self.rows 
-        for c in range(self.num_of_columns):
-            cur_max = -1
-            for r in range(len(all_rows)):
-                cur_max = max(cur_max, len(all_rows[r][c])) # get the maximum width
-            column_widths.append(cur_max)
-        
-        # generate the bar to separate rows
-        row_bar = "+"
-        for width in column_widths:
-            row_bar += "-" * width + "+"
-            
-        output = [row_bar]
-
-        for r in range(len(all_rows)):
-            row = "|"
-            for c in range(self.num_of_columns):
-                # calculates the required number of padding
-                row += all_rows[r][c] + (" " * (column_widths[c] - len(all_rows[r][c]))) + "|" 
-            output.append(row)
-            if r == 0: # add a bar under the column names
-                output.append(row_bar)
+
+    # returns the widths of the columns after cutting the widest ones short so the table fits in max_width
+    # every column wider than some limit is cut down to that limit, which is the largest limit that fits
+    # a column is never cut shorter than 3 characters so there is room for ...
+    def fit_widths(self, widths: list[int]) -> list[int]:
+        if self.max_width is None:
+            return widths
+
+        # each line has a | at the start and after every column
+        available_width = self.max_width - self.num_of_columns - 1
+        limit = max(widths, default=0)
+        while limit > 3 and sum(min(width, limit) for width in widths) > available_width:
+            limit -= 1
+
+        return [min(width, limit) for width in widths]
+
+    # gets a string to output the rows from start up to (but not including) end of the TextTable. every row by default
+    # only the rows being output are looked at so a paginator can output one page of a large table without
+    # going through the rest. the columns are only as wide as the widest value in these rows
+    def get_string(self, start: int = 0, end: int | None = None) -> str:
+        rows = self.rows if start == 0 and end is None else self.rows[start:end]
+
+        # the maximum width of each column. one pass over the rows for each column without copying them
+        widths = [max(len(column_name), max(map(len, map(itemgetter(c), rows)), default=0)) for (c, column_name) in enumerate(self.column_names)]
+        fitted_widths = self.fit_widths(widths)
+
+        # the values of the columns that had to be cut short to fit are cut short before being padded
+        cut_columns = [c for c in range(self.num_of_columns) if fitted_widths[c] < widths[c]]
+        if len(cut_columns) > 0:
+            rows = [self.cut_row(row, cut_columns, fitted_widths) for row in rows]
+
+        # each value is padded to the width of its column by the format spec e.g. {:<5}
+        line_format = "|" + "|".join(f"{{:<{width}}}" for width in fitted_widths) + "|"
+        row_bar = "+" + "+".join("-" * width for width in fitted_widths) + "+" # the bar to separate rows
+
+        output = [row_bar, line_format.format(*self.cut_row(self.column_names, cut_columns, fitted_widths)), row_bar] # a bar under the column names
+        output.extend(line_format.format(*row) for row in rows)
         output.append(row_bar)
 
-        return "\n".join(output)
\ No newline at end of file
+        return "\n".join(output)
+
+    # returns the row with the values in cut_columns that are wider than their column cut short and ending with ...
+    def cut_row(self, row: list[str], cut_columns: list[int], widths: list[int]) -> list[str]:
+        row = list(row)
+        for c in cut_columns:
+            if len(row[c]) > widths[c]:
+                row[c] = row[c][:widths[c] - 3] + "..."
+
+        return row
\ No newline at end of file
@@ -21,9 +21,9 @@ class DeleteMenu(Menu):
         """)
     
     def respond(self, option: str) -> None:
-        # initialise variable to store the remaining rows after the deletion
+        # initialise variable to store the deleted rows
         # this will be used later
-        remaining_rows = None 
+        deleted_rows = None 
         
         # if the inputted option meets these conditions then its a standard input
         # i.e. the table classes and their functions can be used
@@ -50,17 +50,18 @@ class DeleteMenu(Menu):
             if value is None:
                 return
             
-            remaining_rows = table.delete_and_return(column.name, value) # delete the rows from the table
+            result = table.delete_and_return(column.name, value) # delete the rows from the table
+            deleted_rows = result.rows
 
-            try:
-                self.db.cursor.execute("SELECT changes();") # determine if any rows were deleted
-                num_of_deleted_rows = self.db.cursor.fetchone()        
-                if num_of_deleted_rows is None or num_of_deleted_rows[0] is None or num_of_deleted_rows[0] == 0:
-                    print("No rows matched the critera. No rows deleted. Here are the rows of this table:") 
+            if result.count == 0:
+                print("No rows matched the critera. No rows deleted.") 
+            else:
+                # the rows deleted from other tables by ON DELETE CASCADE. e.g. ["2 flights", "150 flight passengers"]
+                cascaded = [f"{count} {table_name.replace('_', ' ')}" for (table_name, count) in result.cascaded_counts.items() if count > 0]
+                if len(cascaded) > 0:
+                    print(f"Successfully deleted {result.count} rows. This also deleted {', '.join(cascaded)}. Here are the deleted rows:")
                 else:
-                    print(f"Successfully deleted {num_of_deleted_rows[0]} rows. Here are the remaining rows of this table:") 
-            except:
-                self.db.handle_error("Unable to get number of deleted rows")
+                    print(f"Successfully deleted {result.count} rows. Here are the deleted rows:") 
         elif option == "7": # remove a pilot from a flight
             flight_id = self.get_valid_input(
                 prompt="What is the ID of the flight that you want to remove the pilot from?",
@@ -84,8 +85,8 @@ class DeleteMenu(Menu):
                 self.get_input()
                 return
 
-            remaining_rows = self.db.flight_pilots.delete_and_return(flight_id, pilot_id)
-            print("Successfully removed pilot from flight. Here are the remaining pilots of this flight:") 
+            deleted_rows = self.db.flight_pilots.delete_and_return(flight_id, pilot_id).rows
+            print("Successfully removed pilot from flight.") 
         elif option == "8": # remove a customer
             flight_id = self.get_valid_input(
                 prompt="What is the ID of the flight that you want to remove the customer from?",
@@ -109,7 +110,7 @@ class DeleteMenu(Menu):
                 self.get_input()
                 return
 
-            remaining_rows = self.db.flight_passengers.delete_and_return(flight_id, customer_id)
-            print("Successfully removed customer from flight. Here are the remaining customers of this flight:") 
+            deleted_rows = self.db.flight_passengers.delete_and_return(flight_id, customer_id).rows
+            print("Successfully removed customer from flight.") 
 
-        self.start_paginator_from_rows(remaining_rows) # start paginator using the remaining_rows
\ No newline at end of file
+        self.start_paginator_from_rows(deleted_rows) # start paginator using the deleted_rows
\ No newline at end of file
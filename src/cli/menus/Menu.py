@@ -1,6 +1,7 @@
 from typing import Callable, Iterator
 from cli.TextTable import TextTable
 from cli.Paginator import Paginator
+from cli.KeysetPaginator import KeysetPaginator
 
 # base class representing a menu
 # each menu will inherit this class and add their own print_menu() and respond()
@@ -74,3 +75,10 @@ class Menu:
         
         paginator = Paginator(text_table)
         paginator.start()
+
+
+    # start a paginator that gets each page of rows from table as it is shown
+    # only rows where column_name = value are shown. every row in the table is shown if column_name is None
+    def start_paginator_from_table(self, table: 'Table', column_name: str | None = None, value: str | None = None) -> None:
+        paginator = KeysetPaginator(table, column_name, value)
+        paginator.start()
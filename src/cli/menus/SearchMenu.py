@@ -34,7 +34,8 @@ class SearchMenu(Menu):
             if option is None:
                 return
             elif option == "1":
-                rows = table.get_all()
+                self.start_paginator_from_table(table)
+                return
             else:
                 # determine the column that the user wants to search by
                 (column_names, options) = table.get_column_choices()
@@ -55,8 +56,9 @@ class SearchMenu(Menu):
                 )                
                 if value is None:
                     return
-            
-                rows = table.get(column.name, value)
+
+                self.start_paginator_from_table(table, column.name, value)
+                return
         elif option == "7" or option == "8": # these two options are similar so combine them into one
             word = "pilots" if option == "7" else "passengers"
 
@@ -97,29 +97,31 @@ class UpdateMenu(Menu):
 
             seat_number = None
             if option == "1":
-                max_passengers = self.db.flight_passengers.get_max_passengers(flight_id)
+                # checked against the flight's seat map so a seat that isn't on the flight is never reported as taken
+                seat_map = self.db.flight_passengers.get_seat_map(flight_id)
                 seat_number = self.get_valid_input(
                     prompt="What's the new seat number for this customer?",
-                    is_valid=lambda x : x.isdigit() and 1 <= int(x) <= max_passengers, 
-                    error_message=f"Seat number must be an integer between 1 and {max_passengers} (the maximum passengers for this flight) (inclusive)"
+                    is_valid=lambda x : x.isdigit() and seat_map.is_seat(int(x)), 
+                    error_message=f"Seat must be between 1 and {seat_map.num_of_seats} (the maximum passengers for this flight) (inclusive)"
                 )  
                 if seat_number is None:
                     return
-                
-                # determine if inputted seat is available
-                if not self.db.flight_passengers.is_seat_available(flight_id, seat_number):
+
+            # seat_number is None if the next available seat was chosen
+            flight_passenger = self.db.flight_passengers.change_seat(flight_id, customer_id, seat_number)
+
+            if flight_passenger is None:
+                # the aircraft's number of seats can be lowered after the seat number was input
+                seat_map = self.db.flight_passengers.get_seat_map(flight_id)
+                if option == "1" and not seat_map.is_seat(int(seat_number)):
+                    print(f"Seat must be between 1 and {seat_map.num_of_seats}. Press Enter to go back to the menu.")
+                elif option == "1":
                     print("That seat is taken by another customer on this flight. Press Enter to go back to the menu.")
-                    self.get_input()
-                    return
-            elif option == "2":
-                seat_number = self.db.flight_passengers.get_next_available_seat(flight_id)
-                # seat_number is None if there are no more available seats
-                if seat_number is None:
+                else:
                     print("There are no more available seats on this flight. Press Enter to go back to the menu.")
-                    self.get_input()
-                    return
+                self.get_input()
+                return
 
-            flight_passenger = self.db.flight_passengers.update_seat_number(flight_id, customer_id, seat_number) 
             print(f"The seat number of customer with ID: {flight_passenger.customer_id} on flight with ID: {flight_passenger.flight_id} has been changed to {flight_passenger.seat_number}") 
 
         print("Press Enter to go to back to the update menu.")
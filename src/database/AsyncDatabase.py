@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterator
+from database.Database import Database
+
+# lets a program using asyncio use the database without blocking its event loop
+# every call is run on a thread from a thread pool with as many threads as the Database has read only connections
+# so each thread can read through its own connection (see Database.get_read_cursor) and writes take turns on the writer
+# the functions take the name of a table in Database (e.g. "flights") and the same arguments as the function of the table
+# they call and return the same rows. e.g. await async_db.insert("customers", values) returns a Customer
+# errors raise a DatabaseError instead of ending the program
+#
+# cancelling a call that hasn't started stops it from running. a call that has already started (e.g. an insert) is
+# still finished so a transaction is never left half done but its result is thrown away
+class AsyncDatabase:
+    def __init__(self, db_name: str = "airline", profile: str = "interactive", num_of_threads: int = 8, fetch_size: int = 500):
+        self.db = Database(db_name, profile, fetch_size=fetch_size, num_of_readers=num_of_threads, exit_on_error=False)
+        self.executor = ThreadPoolExecutor(num_of_threads, thread_name_prefix="database")
+
+    # runs function(*args) on the thread pool and returns what it returns
+    async def run(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(function, *args))
+
+    async def connect(self) -> None:
+        await self.run(self.db.connect)
+        await self.run(self.db.create_tables)
+
+    async def close(self) -> None:
+        await self.run(self.db.close)
+        self.executor.shutdown()
+
+    async def insert(self, table_name: str, *args) -> 'Row':
+        return await self.run(getattr(self.db, table_name).insert, *args)
+
+    async def update(self, table_name: str, *args) -> 'Row':
+        return await self.run(getattr(self.db, table_name).update, *args)
+
+    async def exists(self, table_name: str, *args) -> bool:
+        return await self.run(getattr(self.db, table_name).exists, *args)
+
+    async def get(self, table_name: str, *args) -> AsyncIterator['Row']:
+        async for row in self.iterate(getattr(self.db, table_name).get, *args):
+            yield row
+
+    async def get_all(self, table_name: str) -> AsyncIterator['Row']:
+        async for row in self.iterate(getattr(self.db, table_name).get_all):
+            yield row
+
+    # runs the function called statistic_name in Statistics. e.g. await async_db.get_statistic("get_pilot_air_time", 1)
+    async def get_statistic(self, statistic_name: str, *args) -> Any:
+        return await self.run(getattr(self.db.statistics, statistic_name), *args)
+
+    # iterates over the rows returned by function(*args) (e.g. FlightsTable.get_all) db.fetch_size rows at a time
+    # each batch is fetched on the thread pool. the rows are released (see Table.fetch_rows) if the iteration stops early
+    async def iterate(self, function: Callable[..., Iterator], *args) -> AsyncIterator['Row']:
+        rows = await self.run(function, *args)
+        if rows is None:
+            return
+
+        future = None
+        try:
+            while True:
+                future = self.executor.submit(lambda : list(islice(rows, self.db.fetch_size)))
+                batch = await asyncio.wrap_future(future)
+                if len(batch) == 0:
+                    break
+
+                for row in batch:
+                    yield row
+        finally:
+            # a batch may still be being fetched on another thread if this was cancelled so the rows are released after it
+            # a done callback runs straight away if the batch has already been fetched
+            if future is None:
+                rows.close()
+            else:
+                future.add_done_callback(lambda _ : rows.close())
\ No newline at end of file
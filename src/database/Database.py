@@ -1,5 +1,9 @@
 import sqlite3
 import sys
+import threading
+from queue import Queue, Empty
+from contextlib import contextmanager
+from typing import Iterator
 from database.pilot.PilotsTable import PilotsTable
 from database.airport.AirportsTable import AirportsTable
 from database.terminal.TerminalsTable import TerminalsTable
@@ -8,10 +12,81 @@ from database.aircraft.AircraftsTable import AircraftsTable
 from database.flight.FlightsTable import FlightsTable
 from database.flight_passenger.FlightPassengersTable import FlightPassengersTable
 from database.flight_pilot.FlightPilotsTable import FlightPilotsTable
+from database.statistics.FlightCountsTable import FlightCountsTable
+from database.statistics.Statistics import Statistics
+from database.DatabaseError import DatabaseError
+
+# the version of the tables that create_tables makes. see Database.create_tables
+# this has to go up by one whenever a table, column, trigger or index is changed and the change has to be added to the
+# migrations and backfills of the tables it changes so databases made by older versions of this program are upgraded
+# 0: databases made before versions were stored
+# 1: flight times are stored as unix epochs with calendar columns, flights store their passenger count and load factor,
+#    flights are counted per week and month in flight counts tables and flight pilots and flight passengers have no rowids
+schema_version = 1
+
+# named sets of pragmas that tune sqlite for how the database is being used
+# a profile is chosen when the Database is created. see https://www.sqlite.org/pragma.html for what each pragma does
+profiles = {
+    # a person using the menus. lots of small reads and writes
+    # WAL lets reads happen during a write and synchronous = NORMAL is still safe from corruption in WAL mode
+    "interactive": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000, # negative values are in KiB so this is about 16MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000 # milliseconds to wait for another connection's lock before failing
+    },
+    # inserting a large amount of data at once e.g. importing or generating data
+    # synchronous = OFF does not wait for the disk so the last transactions can be lost if the machine crashes
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144, # about 256MB
+        "mmap_size": 268435456, # 256MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000
+    },
+    # statistics and exports that read large parts of the tables
+    # memory mapping avoids copying pages into the cache and sorts are done in memory
+    "read-analytics": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -262144,
+        "mmap_size": 1073741824, # 1GB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000
+    }
+}
 
 class Database:
-    def __init__(self, db_name: str = "airline"):
+    def __init__(self, db_name: str = "airline", profile: str = "interactive", fetch_size: int = 500, chunk_size: int = 10000, num_of_readers: int = 4, exit_on_error: bool = True):
         self.db_name = db_name # the name of the database file
+        self.num_of_readers = num_of_readers # the number of read only connections kept open for reads. see get_read_cursor
+        self.exit_on_error = exit_on_error # whether an error ends the program or raises a DatabaseError. see handle_error
+        self.fetch_size = fetch_size # the number of rows fetched at a time when iterating over the results of a query
+        self.chunk_size = chunk_size # the number of rows changed in each transaction when changing every row of a table. see Table.run_in_chunks
+
+        if profile not in profiles:
+            self.handle_error(f"Unknown connection profile {profile}. Must be one of {', '.join(profiles)}")
+        self.profile = profile # the name of the profile in profiles used to configure the connection
+
+        # the number of transactions that are currently open. see transaction()
+        self.transaction_depth = 0
+
+        # every write goes through one connection (self.connection) and only one thread can use it at a time
+        # a thread holds this lock for as long as it has a transaction open. it is reentrant so transactions can be nested
+        # tables that cache rows (see Table.clear_cache) also hold it while they fill their caches so a cache can't be
+        # filled with rows that a transaction in another thread is changing
+        self.lock = threading.RLock()
+        self.writer_thread = None # the id of the thread with a transaction open or None
+
+        # read only connections that aren't being used. reads are spread across them so a long read
+        # (e.g. a statistic) doesn't stop other threads from reading or writing. see get_read_cursor
+        self.readers = Queue()
+
+        # the reader that each thread inside `with db.snapshot():` reads through. see snapshot
+        self.snapshots = threading.local()
         
         # each table has their own property in this class so they can be easily accessed from the menus
         self.pilots = PilotsTable(self)
@@ -27,9 +102,18 @@ class Database:
         self.flight_passengers = FlightPassengersTable(self)
         self.flight_pilots = FlightPilotsTable(self)
 
+        self.flight_counts = FlightCountsTable(self)
+
+        # every table in the order they have to be created in. a table must come after the tables it references
+        self.tables = [self.pilots, self.airports, self.terminals, self.customers, self.aircrafts, self.flights, self.flight_passengers, self.flight_pilots, self.flight_counts]
+
+        self.statistics = Statistics(self)
+
     def connect(self) -> None:
         try:
-            self.connection = sqlite3.connect(f"{self.db_name}.db")
+            # isolation_level=None stops python from starting transactions itself. they are started by transaction() instead
+            # check_same_thread=False lets any thread use it. self.lock makes sure only one does at a time
+            self.connection = sqlite3.connect(f"{self.db_name}.db", isolation_level=None, check_same_thread=False)
         except:
             self.handle_error("Unable to connect to the database")
 
@@ -38,33 +122,224 @@ class Database:
         except:
             self.handle_error("Unable to enable foreign keys")
 
+        try:
+            for (pragma, value) in profiles[self.profile].items():
+                self.connection.execute(f"PRAGMA {pragma} = {value};")
+        except:
+            self.handle_error(f"Unable to apply the {self.profile} connection profile")
+
         try:
             self.cursor = self.connection.cursor()
         except:
             self.handle_error("Unable to make a cursor")
 
-    # creates the tables if they do not exist
+    # opens a read only connection with the same profile as the writer
+    # readers can read while the writer is writing as every profile uses WAL mode
+    def open_reader(self) -> sqlite3.Connection:
+        try:
+            connection = sqlite3.connect(f"file:{self.db_name}.db?mode=ro", uri=True, isolation_level=None, check_same_thread=False)
+
+            # the journal mode is stored in the database file by the writer and can't be changed by a read only connection
+            for (pragma, value) in profiles[self.profile].items():
+                if pragma != "journal_mode":
+                    connection.execute(f"PRAGMA {pragma} = {value};")
+        except:
+            self.handle_error("Unable to open a read only connection")
+        else:
+            return connection
+
+    # checks out a connection and returns a new cursor on it to run a read only query with
+    # the connection must be checked back in with release_cursor once every row has been read (Table.fetch_rows does this)
+    # a thread with a transaction open reads through the writer instead so it can see the changes it hasn't committed yet
+    def get_read_cursor(self) -> sqlite3.Cursor:
+        if self.writer_thread == threading.get_ident():
+            return self.connection.cursor()
+
+        snapshot = getattr(self.snapshots, "connection", None)
+        if snapshot is not None:
+            return snapshot.cursor()
+
+        # a new connection is opened when they are all checked out instead of waiting for one to be checked in
+        # as a thread that is iterating over the rows of one query could be waiting for itself
+        try:
+            connection = self.readers.get_nowait()
+        except Empty:
+            connection = self.open_reader()
+
+        return connection.cursor()
+
+    # closes a cursor made by get_read_cursor and checks in its connection
+    # at most num_of_readers connections are kept open. the rest are closed
+    def release_cursor(self, cursor: sqlite3.Cursor) -> None:
+        connection = cursor.connection
+        cursor.close()
+
+        if connection is self.connection or connection is getattr(self.snapshots, "connection", None):
+            return
+
+        if self.readers.qsize() < self.num_of_readers:
+            self.readers.put(connection)
+        else:
+            connection.close()
+
+    # gives a cursor from get_read_cursor to the statements inside `with db.reader() as cursor:` and releases it afterwards
+    # used for reads that fetch every row straight away. e.g. exists
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Cursor]:
+        cursor = self.get_read_cursor()
+        try:
+            yield cursor
+        finally:
+            self.release_cursor(cursor)
+
+    # makes every read in this thread inside `with db.snapshot():` see the database as it was when the `with` started
+    # even if other threads commit changes in the meantime. e.g. an export of flights and flight_passengers will
+    # never have passengers on a flight that isn't in the export of flights
+    # the reads go through one reader with a read transaction open. WAL mode keeps the pages it can see until it ends
+    # so writes don't have to wait for it
+    @contextmanager
+    def snapshot(self) -> Iterator[None]:
+        # a snapshot inside another snapshot or a transaction already sees one version of the database
+        if self.writer_thread == threading.get_ident() or getattr(self.snapshots, "connection", None) is not None:
+            yield
+            return
+
+        cursor = self.get_read_cursor()
+        try:
+            # a read transaction only starts at its first read so something is read straight away
+            cursor.execute("BEGIN;")
+            cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1;").fetchall()
+        except:
+            self.release_cursor(cursor)
+            self.handle_error("Unable to start a snapshot")
+
+        self.snapshots.connection = cursor.connection
+        try:
+            yield
+        finally:
+            self.snapshots.connection = None
+            cursor.execute("COMMIT;")
+            self.release_cursor(cursor)
+
+    # creates the tables, triggers and indexes of the latest version of the schema (schema_version)
+    # a database made by an older version of this program is upgraded by running the migrations and backfills
+    # of each table (see Table) for every version after the database's version, in order
+    # the version of a database is stored in the database file with PRAGMA user_version
     def create_tables(self) -> None:
-        self.pilots.create_table()
-        
-        self.airports.create_table()
-        self.terminals.create_table()
+        try:
+            version = self.connection.execute("PRAGMA user_version;").fetchone()[0]
+            is_empty = self.connection.execute("SELECT NOT EXISTS(SELECT 1 FROM sqlite_master WHERE type = 'table');").fetchone()[0] == 1
+        except:
+            self.handle_error("Unable to get the version of the database")
+
+        # the database is already up to date so nothing needs to be made
+        if version == schema_version:
+            return
+
+        if version > schema_version:
+            self.handle_error(f"The database is version {version} but this program only knows up to version {schema_version}")
+
+        # a new database is made at the latest version so there is nothing to upgrade
+        upgrades = [] if is_empty else range(version + 1, schema_version + 1)
+
+        for upgrade in upgrades:
+            for table in self.tables:
+                if upgrade in table.migrations:
+                    table.migrations[upgrade]()
 
-        self.customers.create_table()
+        with self.transaction():
+            for table in self.tables:
+                table.create_table()
 
-        self.aircrafts.create_table()
+            for table in self.tables:
+                table.create_indexes()
 
-        self.flights.create_table()
-        self.flight_passengers.create_table()
-        self.flight_pilots.create_table()
+        for upgrade in upgrades:
+            for table in self.tables:
+                if upgrade in table.backfills:
+                    table.backfills[upgrade]()
 
-    # responds to a database error. for now, terminates the program if theres an error
+        # the version is only changed once everything has been upgraded so an upgrade that is stopped starts again
+        self.connection.execute(f"PRAGMA user_version = {schema_version};")
+
+    # drops every trigger. create_tables makes them again
+    def drop_triggers(self) -> None:
+        try:
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger';")
+            for (trigger_name,) in self.cursor.fetchall():
+                self.cursor.execute(f"DROP TRIGGER {trigger_name};")
+        except:
+            self.handle_error("Unable to drop triggers")
+
+    # shows how far through a long running task (e.g. upgrading a large database) is. fraction is between 0 and 1
+    def report_progress(self, message: str, fraction: float) -> None:
+        # \r goes back to the start of the line so the percentage is updated in place
+        print(f"\r{message}... {fraction * 100:.1f}%", end="\n" if fraction >= 1 else "", flush=True)
+
+    # groups every statement run inside `with db.transaction():` into one transaction
+    # the transaction is only committed when the outermost `with` ends so the table classes can be used inside
+    # one without committing after each statement. e.g. a flight and all of its passengers can be inserted with one commit
+    # a transaction inside another transaction is a savepoint so it can be rolled back without rolling back the outer one
+    # if an exception is raised inside the `with` then everything done inside it is rolled back and the exception is raised again
+    # other threads wait for the outermost transaction to end before they can start one
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self.lock:
+            savepoint = f"savepoint_{self.transaction_depth}"
+            
+            # IMMEDIATE takes the write lock straight away so a read inside the transaction cannot go out of date before the write
+            self.connection.execute("BEGIN IMMEDIATE;" if self.transaction_depth == 0 else f"SAVEPOINT {savepoint};")
+            self.transaction_depth += 1
+            self.writer_thread = threading.get_ident()
+
+            try:
+                yield
+            except:
+                # anything cached during the transaction may now be different to what is in the database
+                self.clear_caches()
+
+                self.transaction_depth -= 1
+                if self.transaction_depth == 0:
+                    self.writer_thread = None
+                    self.connection.execute("ROLLBACK;")
+                else:
+                    self.connection.execute(f"ROLLBACK TO {savepoint};")
+                    self.connection.execute(f"RELEASE {savepoint};")
+                raise
+            else:
+                self.transaction_depth -= 1
+                if self.transaction_depth == 0:
+                    self.writer_thread = None
+                self.connection.execute("COMMIT;" if self.transaction_depth == 0 else f"RELEASE {savepoint};")
+
+                # other programs can insert rows once the transaction has ended. see Table.ids
+                if self.transaction_depth == 0:
+                    for table in self.tables:
+                        table.ids.forget_missing()
+
+    # makes every table forget the rows it has cached so they are read from the database again
+    def clear_caches(self) -> None:
+        for table in self.tables:
+            table.clear_cache()
+
+    # responds to a database error. terminates the program if theres an error unless exit_on_error is False
+    # then a DatabaseError is raised instead so a program that keeps running (e.g. one using AsyncDatabase) can handle it
     def handle_error(self, error_message) -> None:
+        if not self.exit_on_error:
+            raise DatabaseError(error_message)
+
         print(error_message + "... Exiting...")
         sys.exit(0)
     
     # we must close cursor and connection before dropping this class from memory
     # otherwise there will be opened connections not being used
     def __exit__(self):
+        self.close()
+
+    # closes the writer and every reader that has been checked in
+    def close(self) -> None:
+        while not self.readers.empty():
+            self.readers.get_nowait().close()
+
         self.cursor.close()
         self.connection.close()
\ No newline at end of file
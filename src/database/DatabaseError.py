@@ -0,0 +1,4 @@
+# raised by Database.handle_error instead of ending the program when exit_on_error is False
+# the error that caused it (e.g. a sqlite3.Error) is its __context__
+class DatabaseError(Exception):
+    pass
\ No newline at end of file
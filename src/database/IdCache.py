@@ -0,0 +1,41 @@
+from typing import Iterable
+
+# the ids of a table that are known to exist and known not to exist so checking a foreign key (e.g. in Column.is_valid)
+# doesn't have to query the database every time. see Table.exists_many
+# each set is emptied once it has more than max_size ids so a large table can't fill up the memory
+class IdCache:
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max_size
+        self.existing = set()
+        self.missing = set()
+
+    # returns True or False if id is known to exist or not and None if it isn't known
+    def get(self, id: int) -> bool | None:
+        if id in self.existing:
+            return True
+        if id in self.missing:
+            return False
+
+        return None
+
+    def add_existing(self, ids: Iterable[int]) -> None:
+        if len(self.existing) > self.max_size:
+            self.existing = set()
+
+        for id in ids:
+            self.existing.add(id)
+            self.missing.discard(id)
+
+    def add_missing(self, ids: Iterable[int]) -> None:
+        if len(self.missing) > self.max_size:
+            self.missing = set()
+
+        self.missing.update(ids)
+
+    # called when rows are inserted without knowing their ids. e.g. Table.insert_rows
+    def forget_missing(self) -> None:
+        self.missing = set()
+
+    def clear(self) -> None:
+        self.existing = set()
+        self.missing = set()
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import Callable
+import json
+import threading
+from typing import Callable, Iterable, Iterator
+from database.IdCache import IdCache
 from cli.TextTable import TextTable
 
 # a base class that represents a table in the database
@@ -7,7 +10,382 @@ from cli.TextTable import TextTable
 class Table:
     def __init__(self, database: 'Database'):
         self.db = database
+
+        self.name = None # the name of the table in the database
+
+        # tables that can be paged through with get_page also set these in their constructor
+        self.key = None # the integer primary key that the rows are ordered by. e.g. "flights.flight_id"
+        self.select = None # a SELECT statement without a WHERE clause that returns rows for row_type
+        self.row_type = None # the class that each row is converted to. e.g. ExtendedFlight
+
+        # the tables with a foreign key to this table that are deleted from by ON DELETE CASCADE
+        # each one is (x, y) where x is the name of the table and y is its foreign key column. e.g. ("flights", "aircraft_id")
+        self.cascades = []
+
+        # secondary indexes on this table. maps the name of an index to what it indexes. e.g. "flights (destination)"
+        # tables that need indexes overwrite this in their constructor
+        self.indexes = {}
+
+        # the changes to this table that upgrade a database from an older version of the schema. see Database.create_tables
+        # each maps a schema version to a function that changes this table from the version before it
+        # migrations run before the tables, triggers and indexes of the new version are made and backfills run after
+        # so a backfill can fill in a new column while the triggers that keep it up to date are already running
+        # both have to be safe to run again as an upgrade that was stopped part of the way through starts again
+        self.migrations = {}
+        self.backfills = {}
+
+        # the ids of this table that have been checked with exists_many. only used by tables with a key
+        # inserts add to it and deletes clear it (see delete_and_return). it is only filled while db.lock is held
+        # in the same way as the seat maps of FlightPassengersTable
+        # another program (e.g. server.py and main.py on the same file) can insert a row without this one knowing so ids
+        # are only cached as missing inside a transaction, which stops other programs writing, and forgotten when it ends.
+        # an id cached as existing can still be deleted by another program but then the foreign key stops the write
+        self.ids = IdCache()
+
+    # tables that keep rows from the database in memory (e.g. the seat maps in FlightPassengersTable) overwrite this to forget them
+    # and call this to forget their ids. it is called when the cached rows may have changed without the table knowing
+    # e.g. a rollback or a cascaded delete
+    def clear_cache(self) -> None:
+        self.ids.clear()
+
+    # returns the ids in ids that are the key of a row in this table as ints
+    # ids that are already in self.ids don't query the database and the rest are checked with one query
+    # ids that aren't integers never exist
+    def exists_many(self, ids: Iterable) -> set[int]:
+        existing_ids = set()
+        unknown_ids = []
+        for id in ids:
+            try:
+                id = int(id) # ids from the menus are strings
+            except (TypeError, ValueError):
+                continue
+
+            exists = self.ids.get(id)
+            if exists is None:
+                unknown_ids.append(id)
+            elif exists:
+                existing_ids.add(id)
+
+        if len(unknown_ids) == 0:
+            return existing_ids
+
+        # a row can't be inserted or deleted by another thread between reading the ids and caching them
+        with self.db.lock:
+            try:
+                self.db.cursor.execute(
+                    f"""
+                        SELECT {self.key}
+                        FROM {self.name}
+                        WHERE {self.key} IN (SELECT value FROM json_each(?));
+                    """,
+                    (json.dumps(unknown_ids),)
+                )
+                found_ids = {id for (id,) in self.db.cursor.fetchall()}
+            except:
+                self.db.handle_error(f"Unable to determine if rows exist in {self.name} table")
+            else:
+                self.ids.add_existing(found_ids)
+                if self.db.writer_thread == threading.get_ident():
+                    self.ids.add_missing(set(unknown_ids) - found_ids)
+                return existing_ids | found_ids
+
+    # creates every index in self.indexes if it does not exist
+    def create_indexes(self) -> None:
+        try:
+            for (index_name, definition) in self.indexes.items():
+                self.db.cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition};")
+        except:
+            self.db.handle_error("Unable to create indexes")
     
+    # returns an iterator of row_type for the rows of a query that has been run on cursor
+    # the rows are fetched db.fetch_size at a time so only one batch is ever in memory
+    # each query should have its own cursor from db.get_read_cursor so running another query while iterating does not replace these rows
+    # the cursor is released (see Database.release_cursor) once every row has been fetched or the iterator is dropped
+    def fetch_rows(self, cursor: 'sqlite3.Cursor', row_type: type) -> Iterator:
+        rows = self.fetch_batches(cursor, row_type)
+
+        # a generator that has not started is dropped without running its finally so it is started here.
+        # it stops at the yield at the start of its try so dropping it without iterating over it still releases the cursor
+        next(rows)
+        return rows
+
+    def fetch_batches(self, cursor: 'sqlite3.Cursor', row_type: type) -> Iterator:
+        try:
+            yield # where fetch_rows stops
+
+            # sqlite makes each row_type itself as it fetches the rows. row_type is a named tuple so tuple.__new__
+            # makes one straight from sqlite's tuple without unpacking it into arguments
+            cursor.row_factory = lambda cursor, row : tuple.__new__(row_type, row)
+
+            rows = cursor.fetchmany(self.db.fetch_size)
+            while len(rows) > 0:
+                yield from rows
+                rows = cursor.fetchmany(self.db.fetch_size)
+        except GeneratorExit: # raised when the iterator is dropped before the end which is not an error
+            raise
+        except:
+            self.db.handle_error("Unable to fetch rows")
+        finally:
+            self.db.release_cursor(cursor)
+
+    # returns a WHERE clause and its parameters that filters rows by column_name = value (if column_name is given)
+    # and to rows whose key is greater than after_key (if after_key is given)
+    def get_page_conditions(self, after_key: int | None, column_name: str | None, value: str | None) -> (str, tuple):
+        conditions = []
+        parameters = []
+
+        if column_name is not None:
+            conditions.append(f"{column_name} = {self.get_placeholder(column_name)}")
+            parameters.append(value)
+
+        if after_key is not None:
+            conditions.append(f"{self.key} > ?")
+            parameters.append(after_key)
+
+        if len(conditions) == 0:
+            return ("1", ())
+
+        return (" AND ".join(conditions), tuple(parameters))
+
+    # gets up to limit rows whose key is greater than after_key, ordered by key. i.e. a page of rows
+    # the next page is got by passing the key of the last row on this page as after_key
+    # this only reads the rows on the page unlike using OFFSET which reads every row before the page as well
+    # column_name and value optionally filter the rows like get()
+    def get_page(self, after_key: int | None, limit: int, column_name: str | None = None, value: str | None = None) -> list:
+        (conditions, parameters) = self.get_page_conditions(after_key, column_name, value)
+        cursor = self.db.get_read_cursor()
+        try:
+            cursor.execute(
+                f"""
+                    {self.select}
+                    WHERE {conditions}
+                    ORDER BY {self.key}
+                    LIMIT ?;
+                """,
+                parameters + (limit,)
+            )
+        except:
+            self.db.release_cursor(cursor)
+            self.db.handle_error(f"Unable to get a page of rows from {self.name} table")
+        else:
+            return list(self.fetch_rows(cursor, self.row_type))
+
+    # gets the key of the row at position offset (0-indexed) when the rows are ordered by key
+    # returns None if there are not that many rows
+    # this is used to jump to a page without getting every page before it
+    def get_key_at(self, offset: int, column_name: str | None = None, value: str | None = None) -> int | None:
+        (conditions, parameters) = self.get_page_conditions(None, column_name, value)
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    f"""
+                        SELECT {self.key}
+                        FROM {self.name}
+                        WHERE {conditions}
+                        ORDER BY {self.key}
+                        LIMIT 1 OFFSET ?;
+                    """,
+                    parameters + (offset,)
+                )
+                row = cursor.fetchone()
+        except:
+            self.db.handle_error(f"Unable to get a row from {self.name} table")
+        else:
+            return None if row is None else row[0]
+
+    # counts the rows where column_name = value (or every row if column_name is not given)
+    # stops counting at limit so counting a large table does not take long. the result is limit if there are more rows
+    def count_rows(self, column_name: str | None = None, value: str | None = None, limit: int = -1) -> int:
+        (conditions, parameters) = self.get_page_conditions(None, column_name, value)
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    f"""
+                        SELECT COUNT(*)
+                        FROM (
+                            SELECT 1
+                            FROM {self.name}
+                            WHERE {conditions}
+                            LIMIT ?
+                        );
+                    """,
+                    parameters + (limit,)
+                )
+                count = cursor.fetchone()[0]
+        except:
+            self.db.handle_error(f"Unable to count rows in {self.name} table")
+        else:
+            return count
+
+    # counts the rows in other tables that ON DELETE CASCADE will delete when the rows where column_name = value are deleted
+    # returns a dictionary that maps the name of each table to the number of its rows that will be deleted
+    # e.g. deleting an aircraft deletes its flights which deletes their flight passengers and flight pilots
+    # the counts are only correct if the rows are deleted in the same transaction
+    def count_cascaded_rows(self, column_name: str, value: str) -> dict[str, int]:
+        counts = {}
+        self.count_cascaded_rows_of_keys(f"SELECT {self.key} FROM {self.name} WHERE {column_name} = {self.get_placeholder(column_name)}", (value,), counts)
+        return counts
+
+    # adds the rows that will be deleted when the rows with the keys returned by keys_query are deleted to counts
+    def count_cascaded_rows_of_keys(self, keys_query: str, parameters: tuple, counts: dict[str, int]) -> None:
+        for (table_name, foreign_key) in self.cascades:
+            table = getattr(self.db, table_name)
+            try:
+                with self.db.reader() as cursor:
+                    cursor.execute(
+                        f"""
+                            SELECT COUNT(*)
+                            FROM {table_name}
+                            WHERE {foreign_key} IN ({keys_query});
+                        """,
+                        parameters
+                    )
+                    counts[table_name] = counts.get(table_name, 0) + cursor.fetchone()[0]
+            except:
+                self.db.handle_error(f"Unable to count the rows that will be deleted from {table_name} table")
+
+            # the rows deleted from this table can cascade as well
+            table.count_cascaded_rows_of_keys(f"SELECT {table.key} FROM {table_name} WHERE {foreign_key} IN ({keys_query})", parameters, counts)
+
+    # runs run(start, end) on the rows whose key_column is greater than start and less than or equal to end
+    # for every range of about db.chunk_size rows in the table, each in its own transaction, in order of key_column
+    # this is used for changes to every row of a large table so other connections only ever wait for one chunk
+    # rows inserted after this starts are not included. message is shown with the progress. e.g. "Copying flights"
+    def run_in_chunks(self, key_column: str, run: Callable[[int, int], None], message: str) -> None:
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(f"SELECT MIN({key_column}), MAX({key_column}) FROM {self.name};")
+                (first_key, last_key) = cursor.fetchone()
+        except:
+            self.db.handle_error(f"Unable to get the rows of {self.name} table")
+
+        if first_key is None: # the table is empty
+            return
+
+        start = first_key - 1
+        while start < last_key:
+            try:
+                # the last key of the chunk. a chunk can be bigger than chunk_size if rows share a key e.g. a flight's passengers
+                with self.db.reader() as cursor:
+                    cursor.execute(
+                        f"SELECT {key_column} FROM {self.name} WHERE {key_column} > ? ORDER BY {key_column} LIMIT 1 OFFSET ?;",
+                        (start, self.db.chunk_size - 1)
+                    )
+                    row = cursor.fetchone()
+            except:
+                self.db.handle_error(f"Unable to get the rows of {self.name} table")
+
+            end = last_key if row is None else min(row[0], last_key)
+            with self.db.transaction():
+                run(start, end)
+
+            self.db.report_progress(message, (end - first_key + 1) / (last_key - first_key + 1))
+            start = end
+
+    # replaces this table with a new table made by create_sql(table_name), with every row copied into it
+    # this is how a migration changes a table in ways ALTER TABLE can't. e.g. changing the type of a column
+    # columns are the columns of the new table that are copied into and select is what each one is copied from
+    # key_columns identify a row in both tables. the rows are copied in chunks in order of the first one (see run_in_chunks)
+    def rebuild(self, create_sql: Callable[[str], str], columns: list[str], select: list[str], key_columns: list[str]) -> None:
+        new_name = f"new_{self.name}"
+        column_list = ", ".join(columns)
+        select_list = ", ".join(select)
+        is_new_row = " AND ".join(f"{column} = NEW.{column}" for column in key_columns)
+        is_old_row = " AND ".join(f"{column} = OLD.{column}" for column in key_columns)
+
+        # other connections can change rows while they are being copied so these triggers copy every change to the new table
+        # IF NOT EXISTS carries on with a rebuild that was stopped part of the way through
+        copy_new_row = f"INSERT OR REPLACE INTO {new_name} ({column_list}) SELECT {select_list} FROM {self.name} WHERE {is_new_row};"
+        delete_old_row = f"DELETE FROM {new_name} WHERE {is_old_row};"
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute(create_sql(new_name))
+                self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {self.name}_copy_insert AFTER INSERT ON {self.name} BEGIN {copy_new_row} END;")
+                self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {self.name}_copy_update AFTER UPDATE ON {self.name} BEGIN {delete_old_row} {copy_new_row} END;")
+                self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {self.name}_copy_delete AFTER DELETE ON {self.name} BEGIN {delete_old_row} END;")
+        except:
+            self.db.handle_error(f"Unable to start rebuilding {self.name} table")
+
+        # OR IGNORE skips the rows that the triggers have already copied, which are more up to date
+        def copy_rows(start: int, end: int) -> None:
+            try:
+                self.db.cursor.execute(
+                    f"INSERT OR IGNORE INTO {new_name} ({column_list}) SELECT {select_list} FROM {self.name} WHERE {key_columns[0]} > ? AND {key_columns[0]} <= ?;",
+                    (start, end)
+                )
+            except:
+                self.db.handle_error(f"Unable to copy rows of {self.name} table")
+
+        self.run_in_chunks(key_columns[0], copy_rows, f"Copying {self.name}")
+
+        # foreign keys can only be turned off outside of a transaction
+        # they have to be off or dropping the old table deletes the rows that reference it with ON DELETE CASCADE
+        self.db.connection.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            with self.db.transaction():
+                # a table can't be renamed while a trigger uses a table that doesn't exist
+                # dropping the old table drops the copy triggers and the other triggers are made again by create_tables
+                self.db.drop_triggers()
+                self.db.cursor.execute(f"DROP TABLE {self.name};")
+                self.db.cursor.execute(f"ALTER TABLE {new_name} RENAME TO {self.name};")
+        except:
+            self.db.handle_error(f"Unable to replace {self.name} table")
+        self.db.connection.execute("PRAGMA foreign_keys = ON;")
+
+    # inserts every row in rows using one executemany inside one transaction
+    # rows can be a generator. executemany takes one row at a time from it so the rows are never all in memory
+    # has_ids should be False for tables without an integer id. e.g. flight_passengers
+    def insert_rows(self, sql: str, rows: Iterable[tuple], error_message: str, has_ids: bool = True) -> 'InsertSummary':
+        try:
+            with self.db.transaction():
+                self.db.cursor.executemany(sql, rows)
+                count = self.db.cursor.rowcount
+                self.ids.forget_missing() # the ids of the new rows may have been cached as missing
+
+                last_id = None
+                if has_ids and count > 0:
+                    self.db.cursor.execute("SELECT last_insert_rowid();")
+                    last_id = self.db.cursor.fetchone()[0]
+        except:
+            self.db.handle_error(error_message)
+        else:
+            return InsertSummary(count, None if last_id is None else last_id - count + 1, last_id)
+
+    # returns the sql that a value of the column named column_name is put into a query with. see Column.placeholder
+    def get_placeholder(self, column_name: str) -> str:
+        for column in self.columns.values():
+            if column.name == column_name:
+                return column.placeholder
+
+        return "?"
+
+    # returns the Column whose name without the table's name is column_name or None if there isn't one
+    # e.g. "flight_id" for the Column named "flight_passengers.flight_id"
+    def get_column(self, column_name: str) -> 'Column | None':
+        for column in self.columns.values():
+            if column.name.split(".")[-1] == column_name:
+                return column
+
+        return None
+
+    # returns the values of the settable columns in values in the order that insert takes them
+    # values maps the name of each column without the table's name to its value. e.g. {"first_name": "Amy", ...}
+    # raises a ValueError saying why if a value is missing or is not valid
+    def get_insert_values(self, values: dict) -> tuple[str]:
+        insert_values = []
+        for column in self.columns.values():
+            if column.settable:
+                column_name = column.name.split(".")[-1]
+                if values.get(column_name) is None:
+                    raise ValueError(f"Missing {column_name}")
+
+                value = str(values[column_name]) # the columns are validated as strings like the menus input them
+                if not column.is_valid(value):
+                    raise ValueError(f"Invalid {column_name}. {column.validation_prompt}")
+                insert_values.append(value)
+
+        return tuple(insert_values)
+
     # creates a string that allows the user to input an integer to select a column in this table
     # returns (x, y) where x is a list of the names of the columns and y is this output string
     # the all_columns parameters determines if it should return all columns or only columns that are settable
@@ -24,6 +402,31 @@ class Table:
         
         return (column_names, output)
 
+# the result of inserting many rows at once. see Table.insert_rows
+# the id of every inserted row is not stored. sqlite gives a new row the largest id in the table plus one 
+# and nothing else can write during the transaction, so the ids are every integer from first_id to last_id
+class InsertSummary:
+    def __init__(self, count: int, first_id: int | None = None, last_id: int | None = None):
+        self.count = count # the number of inserted rows
+        self.first_id = first_id # None if no rows were inserted or the table has no integer id
+        self.last_id = last_id
+
+    # returns the ids of the inserted rows
+    def get_ids(self) -> range:
+        if self.first_id is None:
+            return range(0)
+
+        return range(self.first_id, self.last_id + 1)
+
+# the result of deleting rows. see delete_and_return in the table classes
+class DeleteResult:
+    def __init__(self, rows: list['Row'], cascaded_counts: dict[str, int]):
+        self.rows = rows # the deleted rows
+        self.count = len(rows) # the number of deleted rows
+
+        # maps the name of a table to the number of its rows that were deleted by ON DELETE CASCADE
+        self.cascaded_counts = cascaded_counts
+
 # represents a column in a table
 # every Table class should contain a columns property that contains a dictionary of Columns
 class Column:
@@ -34,7 +437,9 @@ class Column:
         is_valid: Callable[str, bool], 
         validation_prompt: str, 
         insert_prompt: str = None, 
-        update_prompt: str = None
+        update_prompt: str = None,
+        placeholder: str = "?",
+        references: str = None
     ):
         self.name = name # name of the column in snake_case
 
@@ -43,4 +448,12 @@ class Column:
         self.update_prompt = update_prompt # what to show the user to get them to update a value in this column
         
         self.is_valid = is_valid # function to determine if a value meets the validation requirements of this column
-        self.validation_prompt = validation_prompt + "." # what to show the user if their input is invalid
\ No newline at end of file
+        self.validation_prompt = validation_prompt + "." # what to show the user if their input is invalid
+
+        # the sql that a value the user inputs is put into a query with. e.g. the flight times are input as
+        # YYYY-MM-DD HH:MM:SS but stored as seconds since 1970 so their placeholder is "unixepoch(?)"
+        self.placeholder = placeholder
+
+        # the name of the table in Database that this column is a foreign key to. e.g. "airports" for a terminal's airport_id
+        # is_valid checks that the row exists one value at a time. the importer (see bulk/Importer.py) checks a whole batch at once instead
+        self.references = references
\ No newline at end of file
@@ -1,18 +1,15 @@
-class Aircraft:
-    def __init__(
-        self, 
-        aircraft_id: int,
-        name: str, 
-        type: int, 
-        max_passengers: int
-    ) -> None:
-        self.aircraft_id = aircraft_id
-        self.name = name
-        self.type = type
-        self.max_passengers = max_passengers
+from typing import NamedTuple
 
-    def get_column_names(self) -> list[str]:
-        return ["Aircraft ID", "Name", "Type", "Max Passengers"]
+class Aircraft(NamedTuple):
+    aircraft_id: int
+    name: str
+    type: int
+    max_passengers: int
+
+    column_names = ("Aircraft ID", "Name", "Type", "Max Passengers")
+
+    def get_column_names(self) -> tuple[str, ...]:
+        return self.column_names
 
     def to_row(self) -> list[str]:
         return [str(self.aircraft_id), self.name, "Helicopter" if int(self.type) == 2 else "Plane", str(self.max_passengers)]
\ No newline at end of file
@@ -1,12 +1,21 @@
-from typing import Iterator
+from typing import Iterator, Iterable
 from database.aircraft.Aircraft import Aircraft 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from cli.TextTable import TextTable
 
 class AircraftsTable(Table):
     def __init__(self, database):
         super().__init__(database)
 
+        # used by get_page to page through the aircrafts. see Table
+        self.name = "aircrafts"
+        self.key = "aircrafts.aircraft_id"
+        self.select = "SELECT * FROM aircrafts"
+        self.row_type = Aircraft
+
+        # the tables that ON DELETE CASCADE deletes from when aircrafts are deleted
+        self.cascades = [("flights", "aircraft_id")]
+
         self.columns = {
             "Aircraft ID": Column(
                 name="aircrafts.aircraft_id", 
@@ -53,7 +62,6 @@ class AircraftsTable(Table):
                     );
                 """
             )
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create aircrafts table")
 
@@ -61,18 +69,18 @@ class AircraftsTable(Table):
     # the values parameter is a row. e.g. (name, type, max_passengers)
     def insert(self, values: tuple[str]) -> Aircraft:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO aircrafts 
-                    VALUES (NULL, ?, ?, ?)
-                    RETURNING aircraft_id;
-                """,
-                values
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO aircrafts 
+                        VALUES (NULL, ?, ?, ?)
+                        RETURNING *;
+                    """,
+                    values
+                )
 
-            aircraft = Aircraft(self.db.cursor.fetchone()[0], *values) # create the new aircraft
-
-            self.db.connection.commit()
+                aircraft = Aircraft(*self.db.cursor.fetchone()) # create the new aircraft
+                self.ids.add_existing([aircraft.aircraft_id])
         except:
             self.db.handle_error("Unable to insert into aircrafts table")
         else:
@@ -81,39 +89,48 @@ class AircraftsTable(Table):
     # updates column_name to new_value for a certain aircraft_id and returns the updated aircraft
     def update(self, aircraft_id: int, column_name: str, new_value: str) -> Aircraft:
         try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE aircrafts 
-                    SET {column_name} = ?
-                    WHERE aircraft_id = ?
-                    RETURNING *;
-                """,
-                (new_value, aircraft_id)
-            )
-            # the * operator is used to unpack the row tuple into parameters
-            aircraft = Aircraft(*self.db.cursor.fetchone()) # create the updated aircraft
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE aircrafts 
+                        SET {column_name} = ?
+                        WHERE aircraft_id = ?
+                        RETURNING *;
+                    """,
+                    (new_value, aircraft_id)
+                )
+                # the * operator is used to unpack the row tuple into parameters
+                aircraft = Aircraft(*self.db.cursor.fetchone()) # create the updated aircraft
 
-            self.db.connection.commit()
+                if column_name.endswith("max_passengers"): # the seat maps of the aircraft's flights have the old number of seats
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to update aircrafts table")
         else:
             return aircraft
         
+    # inserts many aircrafts at once. each row is (name, type, max_passengers)
+    # returns an InsertSummary with the number of inserted aircrafts and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO aircrafts VALUES (NULL, ?, ?, ?);", rows, "Unable to insert into aircrafts table")
+
     # gets every aircraft in the table
-    # this returns an iterator because map is used to convert all rows to aircrafts
+    # this returns an iterator that fetches the aircrafts in batches as it is iterated over
     def get_all(self) -> Iterator[Aircraft]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute("SELECT * FROM aircrafts;")
-            rows = self.db.cursor.fetchall()
+            cursor.execute("SELECT * FROM aircrafts;")
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all rows in aircrafts table")
         else:
-            return map(lambda row : Aircraft(*row), rows)
+            return self.fetch_rows(cursor, Aircraft)
 
     # gets aircrafts whose column_name value is equal to value
     def get(self, column_name: str, value: str) -> Iterator[Aircraft]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 f"""
                     SELECT *
                     FROM aircrafts
@@ -121,44 +138,38 @@ class AircraftsTable(Table):
                 """,
                 (value,) # trailing comma is required to create the tuple
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in aircrafts table")
         else:
-            return map(lambda row : Aircraft(*row), rows)
+            return self.fetch_rows(cursor, Aircraft)
 
     # deletes all aircrafts from the table whose column_name value equals value
-    # returns the remaining aircrafts
-    def delete_and_return(self, column_name: str, value: str) -> Iterator[Aircraft]:
+    # returns the deleted aircrafts and the number of flights and their bookings deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM aircrafts
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
+
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM aircrafts
+                        WHERE {column_name} = ?
+                        RETURNING *;
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Aircraft._make(row) for row in self.db.cursor.fetchall()]
+
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete rows from aircrafts table")
         else:
-            return self.get_all() # get remaining aircrafts
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     # determines if an aircraft with aircraft_id exists in the table
     def exists(self, aircraft_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM aircrafts 
-                        WHERE aircraft_id = ?
-                    );
-                """,
-                (aircraft_id,)
-            )
-            exists = self.db.cursor.fetchone()[0] 
-        except:
-            self.db.handle_error("Unable to determine if aircraft exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([aircraft_id])) > 0
\ No newline at end of file
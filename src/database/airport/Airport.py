@@ -1,16 +1,14 @@
-class Airport:
-    def __init__(
-        self, 
-        airport_id: int, 
-        name: str, 
-        address: str
-    ) -> None:
-        self.airport_id = airport_id
-        self.name = name
-        self.address = address
-    
-    def get_column_names(self) -> list[str]:
-        return ["Airport ID", "Name", "Address"]
-    
+from typing import NamedTuple
+
+class Airport(NamedTuple):
+    airport_id: int
+    name: str
+    address: str
+
+    column_names = ("Airport ID", "Name", "Address")
+
+    def get_column_names(self) -> tuple[str, ...]:
+        return self.column_names
+
     def to_row(self) -> list[str]:
         return [str(self.airport_id), self.name, self.address]
\ No newline at end of file
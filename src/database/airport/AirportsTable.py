@@ -1,11 +1,20 @@
-from typing import Iterator
+from typing import Iterator, Iterable
 from database.airport.Airport import Airport 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from cli.TextTable import TextTable
 
 class AirportsTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        # used by get_page to page through the airports. see Table
+        self.name = "airports"
+        self.key = "airports.airport_id"
+        self.select = "SELECT * FROM airports"
+        self.row_type = Airport
+
+        # the tables that ON DELETE CASCADE deletes from when airports are deleted
+        self.cascades = [("terminals", "airport_id")]
         
         self.columns = {
             "Airport ID": Column(
@@ -43,63 +52,67 @@ class AirportsTable(Table):
                     );
                 """
             )
-
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create airports table")
 
     # values = (name, address)
     def insert(self, values: tuple[str]) -> Airport:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO airports 
-                    VALUES (NULL, ?, ?)
-                    RETURNING airport_id;
-                """,
-                values
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO airports 
+                        VALUES (NULL, ?, ?)
+                        RETURNING *;
+                    """,
+                    values
+                )
 
-            airport = Airport(self.db.cursor.fetchone()[0], *values)  
-
-            self.db.connection.commit()
+                airport = Airport(*self.db.cursor.fetchone())  
+                self.ids.add_existing([airport.airport_id])
         except:
             self.db.handle_error("Unable to insert into airports table")
         else:
             return airport
 
+    # inserts many airports at once. each row is (name, address)
+    # returns an InsertSummary with the number of inserted airports and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO airports VALUES (NULL, ?, ?);", rows, "Unable to insert into airports table")
+
     def update(self, airport_id: int, column_name: str, new_value: str) -> Airport:
         try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE airports 
-                    SET {column_name} = ?
-                    WHERE airport_id = ?
-                    RETURNING *;
-                """,
-                (new_value, airport_id)
-            )
-
-            airport = Airport(*self.db.cursor.fetchone())  
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE airports 
+                        SET {column_name} = ?
+                        WHERE airport_id = ?
+                        RETURNING *;
+                    """,
+                    (new_value, airport_id)
+                )
 
-            self.db.connection.commit()
+                airport = Airport(*self.db.cursor.fetchone())  
         except:
             self.db.handle_error("Unable to update airports table")
         else:
             return airport
 
     def get_all(self) -> Iterator[Airport]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute("SELECT * FROM airports;")
-            rows = self.db.cursor.fetchall()
+            cursor.execute("SELECT * FROM airports;")
         except:
-            self.handle_error("Unable to get all rows from airports table")
+            self.db.release_cursor(cursor)
+            self.db.handle_error("Unable to get all rows from airports table")
         else:
-            return map(lambda row : Airport(*row), rows)
+            return self.fetch_rows(cursor, Airport)
 
     def get(self, column_name: str, value: str) -> Iterator[Airport]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 f"""
                     SELECT *
                     FROM airports
@@ -107,41 +120,37 @@ class AirportsTable(Table):
                 """,
                 (value,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in airports table")
         else:
-            return map(lambda row : Airport(*row), rows)
+            return self.fetch_rows(cursor, Airport)
 
-    def delete_and_return(self, column_name: str, value: str) -> Iterator[Airport]:
+    # deletes all airports from the table whose column_name value equals value
+    # returns the deleted airports and the number of terminals, flights and their bookings deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM airports
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
+
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM airports
+                        WHERE {column_name} = ?
+                        RETURNING *;
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Airport._make(row) for row in self.db.cursor.fetchall()]
+
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete from airports table")
         else:
-            return self.get_all()
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     def exists(self, airport_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM airports 
-                        WHERE airport_id = ?
-                    );
-                """,
-                (airport_id,)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if airport exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([airport_id])) > 0
\ No newline at end of file
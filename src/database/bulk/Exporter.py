@@ -0,0 +1,105 @@
+import csv
+import gzip
+import io
+import json
+import lzma
+import sys
+from functools import partial
+from typing import BinaryIO, Iterable
+
+# the compressions that a file can be written with. chosen by the end of the file's name e.g. flights.csv.gz
+compressions = {
+    ".gz": partial(gzip.open, compresslevel=6), # the default of 9 is much slower for files that are barely smaller
+    ".xz": lzma.open
+}
+
+# returns the name of the file without its compression. e.g. flights.csv for flights.csv.gz
+def strip_compression(file_name: str) -> str:
+    for extension in compressions:
+        if file_name.endswith(extension):
+            return file_name[:-len(extension)]
+
+    return file_name
+
+# writes rows (e.g. from Table.get_all or a statistic) to .csv files (with the names of the columns in their first line)
+# or JSON lines files, optionally compressed with gzip or lzma. the file type is chosen by the name of the file
+# e.g. flights.jsonl.gz. the rows are written as they are fetched so memory use stays the same however many there are
+#
+# rows are turned into text fetch_size rows at a time and written to the file as one chunk instead of one write per row
+# every export inside `with exporter.db.snapshot():` reads the same version of the database (see export_tables)
+# the files made from tables can be imported again by the import command (see Importer)
+class Exporter:
+    def __init__(self, database: 'Database'):
+        self.db = database
+
+    # writes every row of each table in tables (e.g. {"flights": "flights.csv.gz"}) to its file
+    # all of the tables are read from one snapshot so the files match each other
+    # returns the number of rows written to each file
+    def export_tables(self, tables: dict[str, str]) -> dict[str, int]:
+        counts = {}
+        with self.db.snapshot():
+            for (table_name, file_name) in tables.items():
+                counts[table_name] = self.export_rows(getattr(self.db, table_name).get_all(), file_name)
+
+        return counts
+
+    # writes the rows of a named statistic (see Statistics.named_statistics) to the file
+    # the rows are written as they are fetched in the same way as a table so a large statistic is never all in memory
+    # returns the number of rows written
+    def export_statistic(self, statistic_name: str, arguments: dict[str, str], file_name: str) -> int:
+        return self.export_rows(self.db.statistics.iterate_named_statistic(statistic_name, arguments), file_name)
+
+    # opens the file to write bytes to. "-" is stdout
+    def open_file(self, file_name: str) -> BinaryIO:
+        if file_name == "-":
+            return sys.stdout.buffer
+
+        for (extension, open_compressed) in compressions.items():
+            if file_name.endswith(extension):
+                return open_compressed(file_name, "wb")
+
+        return open(file_name, "wb")
+
+    # writes rows (named tuples or dictionaries) to the file and returns how many were written
+    def export_rows(self, rows: Iterable, file_name: str) -> int:
+        is_csv = strip_compression(file_name).endswith(".csv")
+        count = 0
+
+        # each chunk is written to text and then to the file at once
+        text = io.StringIO()
+        writer = csv.writer(text)
+
+        file = self.open_file(file_name)
+        try:
+            for row in rows:
+                if isinstance(row, dict):
+                    (fields, values) = (row.keys(), row.values())
+                else:
+                    (fields, values) = (row._fields, row)
+
+                if is_csv:
+                    if count == 0:
+                        writer.writerow(fields)
+                    writer.writerow(values)
+                else:
+                    text.write(json.dumps(row if isinstance(row, dict) else row._asdict()))
+                    text.write("\n")
+
+                count += 1
+                if count % self.db.fetch_size == 0:
+                    file.write(text.getvalue().encode())
+                    text.seek(0)
+                    text.truncate()
+
+            file.write(text.getvalue().encode())
+        finally:
+            # releases the reader of rows from get_all if writing stopped part way through
+            if hasattr(rows, "close"):
+                rows.close()
+
+            if file is sys.stdout.buffer:
+                file.flush()
+            else:
+                file.close()
+
+        return count
\ No newline at end of file
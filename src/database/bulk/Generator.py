@@ -0,0 +1,224 @@
+import datetime
+import random
+from itertools import accumulate
+
+# the sizes of dataset that can be generated by name. each is (x, y) where x is the number of flights
+# and y is the fraction of them that have passengers. every flight has pilots
+# only some flights of the larger sizes have passengers as each one has about 130 so 10m fully booked flights would be over a billion rows
+scales = {
+    "10k": (10000, 1.0),
+    "1m": (1000000, 0.1),
+    "10m": (10000000, 0.01)
+}
+
+first_names = [
+    "Oliver", "Amelia", "George", "Isla", "Harry", "Ava", "Noah", "Mia", "Jack", "Ivy", "Leo", "Lily", "Arthur", "Isabella",
+    "Muhammad", "Rosie", "Oscar", "Sophia", "Charlie", "Grace", "Jacob", "Freya", "Thomas", "Emily", "Henry", "Ella",
+    "William", "Evie", "James", "Poppy", "Mohammed", "Aisha", "Wei", "Priya", "Luca", "Chloe", "Daniel", "Zara"
+]
+
+last_names = [
+    "Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Patel", "Robinson", "Wright",
+    "Thompson", "Evans", "Walker", "White", "Roberts", "Green", "Hall", "Wood", "Jackson", "Clarke", "Khan", "Ahmed",
+    "Singh", "Lewis", "Harris", "Martin", "Cooper", "King", "Lee", "Chen", "Kowalski", "Murphy", "O'Brien", "Nguyen"
+]
+
+streets = ["High", "Station", "Main", "Park", "Church", "Victoria", "Green", "Manor", "Kings", "Queens", "Mill", "New"]
+street_suffixes = ["Street", "Road", "Lane", "Avenue", "Close", "Way", "Drive", "Gardens"]
+
+# the cities of the airports in the order of how busy they are. the first ones are hubs with many terminals
+# airports after these are named after the city with a number. e.g. Leeds 2
+cities = [
+    "London", "Paris", "Amsterdam", "Frankfurt", "Madrid", "Istanbul", "Dubai", "New York", "Singapore", "Tokyo",
+    "Manchester", "Dublin", "Rome", "Barcelona", "Munich", "Lisbon", "Zurich", "Vienna", "Copenhagen", "Oslo",
+    "Edinburgh", "Birmingham", "Glasgow", "Bristol", "Leeds", "Belfast", "Newcastle", "Liverpool", "Cardiff", "Aberdeen"
+]
+
+# the destinations of flights from the most to the least popular and how long it takes to fly there in minutes
+# a destination is picked with a weight of 1 / its position so the first few are much more popular than the rest (Zipf's law)
+destinations = [
+    ("Malaga", 165), ("Palma", 140), ("Alicante", 150), ("Faro", 165), ("Tenerife", 255), ("Dublin", 75), ("Amsterdam", 80),
+    ("Paris", 75), ("Barcelona", 125), ("Rome", 150), ("New York", 470), ("Dubai", 420), ("Lisbon", 160), ("Geneva", 105),
+    ("Nice", 115), ("Edinburgh", 80), ("Berlin", 110), ("Prague", 120), ("Budapest", 145), ("Athens", 225),
+    ("Istanbul", 240), ("Reykjavik", 190), ("Krakow", 140), ("Copenhagen", 110), ("Vienna", 130), ("Milan", 120),
+    ("Orlando", 570), ("Toronto", 455), ("Singapore", 800), ("Cape Town", 700), ("Bangkok", 690), ("Sydney", 1320)
+]
+
+# the kinds of aircraft, each is (x, y, z, w) where x is its name, y is its type (1 for plane or 2 for helicopter),
+# z is its maximum number of passengers and w is how many of the fleet are this kind
+aircraft_models = [
+    ("Airbus A320", 1, 180, 30), ("Boeing 737-800", 1, 189, 30), ("Airbus A321neo", 1, 220, 12), ("Embraer E190", 1, 100, 10),
+    ("ATR 72", 1, 70, 8), ("Boeing 787-9", 1, 290, 5), ("Airbus A350-900", 1, 325, 4), ("Boeing 777-300ER", 1, 396, 3),
+    ("Airbus A380", 1, 555, 1), ("Sikorsky S-92", 2, 19, 2), ("Leonardo AW139", 2, 15, 2)
+]
+
+# fills every table with a realistic dataset. the same seed always makes the same dataset
+# rows are inserted with the insert_many functions of the tables (see Table.insert_rows) so nothing is validated or
+# made one row at a time. use the bulk-load profile (see Database.py) to make larger datasets quickly
+#
+# the flights are made db.chunk_size at a time in their own transaction along with their passengers and pilots
+# so only one chunk of flights is ever in memory
+class Generator:
+    def __init__(self, database: 'Database', seed: int = 0, start_year: int = 2025, num_of_years: int = 3, show_progress: bool = False):
+        self.db = database
+        self.random = random.Random(seed)
+        self.show_progress = show_progress # whether to print how many of the flights have been made. see Database.report_progress
+
+        # flights depart on a day between the start of start_year and the end of num_of_years years later
+        self.start_date = datetime.date(start_year, 1, 1)
+        self.num_of_days = (datetime.date(start_year + num_of_years, 1, 1) - self.start_date).days
+
+    # makes num_of_flights flights and every row they need. booked_fraction of the flights have passengers on them
+    # returns the number of rows inserted into each table
+    def generate(self, num_of_flights: int, booked_fraction: float = 1.0) -> dict[str, int]:
+        counts = {}
+
+        # the number of rows in the other tables grows with the number of flights
+        # e.g. an aircraft flies about 1 flight a day and a pilot about 1 every other day
+        num_of_airports = max(len(cities) // 3, min(1000, num_of_flights // 2000))
+        num_of_aircrafts = max(20, num_of_flights // 1000)
+        num_of_pilots = max(4 * num_of_airports, num_of_flights // 250)
+        # a customer flies about 4 times and a booked flight has about 130 passengers
+        num_of_customers = max(1000, int(num_of_flights * booked_fraction * 130 / 4))
+
+        (airport_ids, airport_weights, terminal_ids, terminal_airports, terminal_weights) = self.generate_airports(num_of_airports, counts)
+        aircrafts = self.generate_aircrafts(num_of_aircrafts, counts)
+        pilot_ids_by_airport = self.generate_pilots(num_of_pilots, airport_ids, airport_weights, counts)
+        customer_ids = self.generate_customers(num_of_customers, counts)
+
+        counts["flights"] = counts["flight_passengers"] = counts["flight_pilots"] = 0
+        terminal_cum_weights = list(accumulate(terminal_weights))
+        destination_cum_weights = list(accumulate(1 / rank for rank in range(1, len(destinations) + 1)))
+
+        for start in range(0, num_of_flights, self.db.chunk_size):
+            chunk_size = min(self.db.chunk_size, num_of_flights - start)
+            chunk_terminals = self.random.choices(range(len(terminal_ids)), cum_weights=terminal_cum_weights, k=chunk_size)
+            chunk_destinations = self.random.choices(destinations, cum_weights=destination_cum_weights, k=chunk_size)
+            chunk_aircrafts = [self.random.choice(aircrafts) for _ in range(chunk_size)]
+
+            flights = [
+                self.get_flight(aircraft_id, terminal_ids[terminal], destination)
+                for ((aircraft_id, _), terminal, destination) in zip(chunk_aircrafts, chunk_terminals, chunk_destinations)
+            ]
+
+            with self.db.transaction():
+                flight_ids = self.db.flights.insert_many(flights).get_ids()
+
+                passengers = []
+                pilots = []
+                for (flight_id, (_, max_passengers), terminal) in zip(flight_ids, chunk_aircrafts, chunk_terminals):
+                    if self.random.random() < booked_fraction:
+                        passengers.extend(self.get_passengers(flight_id, max_passengers, customer_ids))
+
+                    # a captain and a first officer based at the airport the flight leaves from
+                    pilots.extend((flight_id, pilot_id) for pilot_id in self.random.sample(pilot_ids_by_airport[terminal_airports[terminal]], 2))
+
+                counts["flight_passengers"] += self.db.flight_passengers.insert_many(passengers).count
+                counts["flight_pilots"] += self.db.flight_pilots.insert_many(pilots).count
+
+            counts["flights"] += len(flight_ids)
+            if self.show_progress:
+                self.db.report_progress("Generating flights", counts["flights"] / num_of_flights)
+
+        return counts
+
+    # returns a random date between the start of start_year and end of year as a string
+    def get_date(self, start_year: int, end_year: int) -> str:
+        start = datetime.date(start_year, 1, 1).toordinal()
+        return datetime.date.fromordinal(self.random.randrange(start, datetime.date(end_year, 12, 31).toordinal())).isoformat()
+
+    # returns a time the number of minutes after the start of start_date in the format YYYY-MM-DD HH:MM:SS
+    def get_date_time(self, minutes: int) -> str:
+        (days, minutes) = divmod(minutes, 24 * 60)
+        return f"{(self.start_date + datetime.timedelta(days)).isoformat()} {minutes // 60:02d}:{minutes % 60:02d}:00"
+
+    # returns the values of a flight to insert with FlightsTable.insert_many
+    # flights depart every 5 minutes from 6am to 10pm and boarding starts 40 minutes before
+    def get_flight(self, aircraft_id: int, terminal_id: int, destination: tuple[str, int]) -> tuple:
+        (destination_name, flight_minutes) = destination
+        departure = self.random.randrange(self.num_of_days) * 24 * 60 + self.random.randrange(6 * 60, 22 * 60, 5)
+        return (aircraft_id, terminal_id, destination_name, self.get_date_time(departure - 40), self.get_date_time(departure), self.get_date_time(departure + flight_minutes))
+
+    # returns the rows of flight_passengers of a flight that is nearly full. most flights are over 80% full
+    # each passenger is a different customer in a random seat
+    def get_passengers(self, flight_id: int, max_passengers: int, customer_ids: range) -> list[tuple]:
+        num_of_passengers = min(max_passengers, len(customer_ids), round(max_passengers * self.random.betavariate(8, 1.2)))
+        customers = self.random.sample(customer_ids, num_of_passengers)
+        seats = self.random.sample(range(1, max_passengers + 1), num_of_passengers)
+        return list(zip([flight_id] * num_of_passengers, customers, seats))
+
+    # inserts the airports and their terminals. the first few airports are hubs with 4 to 9 terminals and the rest have 1 or 2
+    # returns (a, b, c, d, e) where a is the ids of the airports, b is how busy each airport is, c is the ids of the
+    # terminals, d is the index in a of the airport of each terminal and e is how busy each terminal is
+    def generate_airports(self, num_of_airports: int, counts: dict[str, int]) -> tuple:
+        num_of_hubs = max(2, num_of_airports // 10)
+
+        airports = []
+        for i in range(num_of_airports):
+            city = cities[i % len(cities)]
+            name = f"{city} International" if i < len(cities) else f"{city} {i // len(cities) + 1}"
+            airports.append((name, f"{self.random.randrange(1, 200)} Airport Way, {city}"))
+
+        airport_ids = list(self.db.airports.insert_many(airports).get_ids())
+        counts["airports"] = len(airport_ids)
+
+        # a hub is much busier than a regional airport and the busiest hubs come first
+        airport_weights = [20 / (i + 1) if i < num_of_hubs else 1 for i in range(num_of_airports)]
+
+        terminals = []
+        terminal_airports = []
+        terminal_weights = []
+        for (i, airport_id) in enumerate(airport_ids):
+            num_of_terminals = self.random.randint(4, 9) if i < num_of_hubs else self.random.randint(1, 2)
+            for terminal in range(1, num_of_terminals + 1):
+                terminals.append((airport_id, f"Terminal {terminal}"))
+                terminal_airports.append(i)
+                terminal_weights.append(airport_weights[i] / num_of_terminals)
+
+        terminal_ids = list(self.db.terminals.insert_many(terminals).get_ids())
+        counts["terminals"] = len(terminal_ids)
+
+        return (airport_ids, airport_weights, terminal_ids, terminal_airports, terminal_weights)
+
+    # inserts the aircrafts and returns (x, y) for each one where x is its id and y is its maximum number of passengers
+    def generate_aircrafts(self, num_of_aircrafts: int, counts: dict[str, int]) -> list[tuple[int, int]]:
+        models = self.random.choices(aircraft_models, weights=[model[3] for model in aircraft_models], k=num_of_aircrafts)
+        aircrafts = [(f"{name} {self.random.randrange(100, 1000)}", aircraft_type, max_passengers) for (name, aircraft_type, max_passengers, _) in models]
+
+        aircraft_ids = self.db.aircrafts.insert_many(aircrafts).get_ids()
+        counts["aircrafts"] = len(aircraft_ids)
+
+        return [(aircraft_id, max_passengers) for (aircraft_id, (_, _, max_passengers, _)) in zip(aircraft_ids, models)]
+
+    # inserts the pilots and returns the ids of the pilots based at each airport (by its index in airport_ids)
+    # busier airports have more pilots and every airport has at least 2 so each flight can have a captain and a first officer
+    def generate_pilots(self, num_of_pilots: int, airport_ids: list[int], airport_weights: list[float], counts: dict[str, int]) -> list[list[int]]:
+        pilots = [(self.random.choice(first_names), self.random.choice(last_names), self.get_date(1960, 1998)) for _ in range(num_of_pilots)]
+        pilot_ids = self.db.pilots.insert_many(pilots).get_ids()
+        counts["pilots"] = len(pilot_ids)
+
+        bases = [i % len(airport_ids) for i in range(2 * len(airport_ids))]
+        bases += self.random.choices(range(len(airport_ids)), weights=airport_weights, k=num_of_pilots - len(bases))
+
+        pilot_ids_by_airport = [[] for _ in airport_ids]
+        for (pilot_id, base) in zip(pilot_ids, bases):
+            pilot_ids_by_airport[base].append(pilot_id)
+
+        return pilot_ids_by_airport
+
+    # inserts the customers and returns their ids
+    def generate_customers(self, num_of_customers: int, counts: dict[str, int]) -> range:
+        def get_customers():
+            for _ in range(num_of_customers):
+                yield (
+                    self.random.choice(first_names),
+                    self.random.choice(last_names),
+                    self.get_date(1940, 2010),
+                    f"{self.random.randrange(1, 300)} {self.random.choice(streets)} {self.random.choice(street_suffixes)}",
+                    f"07{self.random.randrange(10 ** 9):09d}"
+                )
+
+        customer_ids = self.db.customers.insert_many(get_customers()).get_ids()
+        counts["customers"] = len(customer_ids)
+
+        return customer_ids
\ No newline at end of file
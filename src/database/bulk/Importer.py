@@ -0,0 +1,261 @@
+import csv
+import json
+from itertools import islice
+from typing import Iterator
+from database.flight_passenger.SeatMap import SeatMap
+from database.bulk.Exporter import compressions, strip_compression
+from database.validation import validate_many
+
+# determine if value is a valid id. ids are non negative integers
+def is_id(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+# loads rows from .csv files (with the names of the columns in their first line) or JSON lines files into the tables
+# the files are read batch_size rows at a time and each batch is checked and inserted with one executemany in its own transaction
+# so a file of any size can be imported without it all being in memory
+#
+# the rows are checked with the Columns of their table like the menus do, except for foreign keys and ids.
+# instead of is_valid checking that each foreign key exists with its own query, the keys of a whole batch are checked with
+# one query per column (see Table.exists_many). a row that fails a check is written to the rejects file with the reason
+# and the rest of its batch is still inserted
+#
+# ids in the files are kept so the foreign keys in the other files still point to the right rows. rows without an id
+# are given a new one. the files should be imported in the order of Database.tables (import_files does this) so the rows
+# a foreign key points to are imported before it
+class Importer:
+    def __init__(self, database: 'Database', rejects_file_name: str, batch_size: int | None = None):
+        self.db = database
+        self.rejects_file_name = rejects_file_name # rejected rows are written here as JSON lines. the file is only made if a row is rejected
+        self.rejects_file = None
+        self.batch_size = database.chunk_size if batch_size is None else batch_size
+
+    # imports every file in files, which maps the name of a table in Database (e.g. "flights") to the name of its file
+    # the tables are imported in the order that they are created in so foreign keys point to rows that have been imported
+    # returns an ImportSummary for each table
+    def import_files(self, files: dict[str, str]) -> dict[str, 'ImportSummary']:
+        summaries = {}
+        try:
+            for table in self.db.tables:
+                if table.name in files:
+                    summaries[table.name] = self.import_file(table, files[table.name])
+        finally:
+            self.close()
+
+        return summaries
+
+    def close(self) -> None:
+        if self.rejects_file is not None:
+            self.rejects_file.close()
+            self.rejects_file = None
+
+    def import_file(self, table: 'Table', file_name: str) -> 'ImportSummary':
+        # every column of the table. a table with an id has it first (e.g. "flights.flight_id")
+        columns = list(table.columns.values())
+        summary = ImportSummary()
+
+        # the id column is always given so rows with and without ids can be in the same batch. NULL gives a row a new id
+        column_names = ", ".join(column.name.split(".")[-1] for column in columns)
+        placeholders = ", ".join(column.placeholder for column in columns)
+        sql = f"INSERT INTO {table.name} ({column_names}) VALUES ({placeholders});"
+
+        rows = enumerate(self.read_rows(file_name), start=1)
+        batch = list(islice(rows, self.batch_size))
+        while len(batch) > 0:
+            values = self.check_batch(table, columns, batch, file_name)
+            summary.rejected += len(batch) - len(values)
+
+            # flight_passengers and flight_pilots have no ids so their rows are the same as the rows of their insert_many
+            # which is used instead as it is faster for flight_passengers (see FlightPassengersTable.insert_many)
+            if len(values) > 0 and table.key is None:
+                summary.count += table.insert_many(values).count
+            elif len(values) > 0:
+                summary.count += table.insert_rows(sql, values, f"Unable to import rows into {table.name} table", has_ids=False).count
+
+            batch = list(islice(rows, self.batch_size))
+
+        # the rows were inserted without the table classes so their caches (e.g. seat maps) don't know about them
+        self.db.clear_caches()
+        return summary
+
+    # returns each row in a .csv file or a JSON lines file as a dictionary
+    # files compressed by the export command (e.g. flights.csv.gz) are decompressed as they are read
+    def read_rows(self, file_name: str) -> Iterator[dict]:
+        open_file = compressions.get(file_name[len(strip_compression(file_name)):], open)
+        with open_file(file_name, "rt", newline="") as file:
+            if strip_compression(file_name).endswith(".csv"):
+                yield from csv.DictReader(file)
+            else:
+                for line in file:
+                    if line.strip() == "":
+                        continue
+
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield line.strip() # rejected as it is not a JSON object
+
+    # writes a row that can't be imported to the rejects file
+    def reject(self, table: 'Table', file_name: str, row_number: int, row: dict, reason: str) -> None:
+        if self.rejects_file is None:
+            self.rejects_file = open(self.rejects_file_name, "a")
+
+        self.rejects_file.write(json.dumps({"table": table.name, "file": file_name, "row_number": row_number, "reason": reason, "row": row}) + "\n")
+
+    # returns the values of each row in batch (which is a list of (row_number, row)) that passes every check
+    # in the order of columns. the other rows are rejected
+    def check_batch(self, table: 'Table', columns: list['Column'], batch: list[tuple[int, dict]], file_name: str) -> list[tuple]:
+        id_column = None if table.key is None else columns[0]
+
+        # what is checked for each column is worked out once for the batch instead of for every value
+        # files made by the export command have the rows of get_all which can prefix a column with its table
+        # e.g. terminals have a terminal_name instead of a name
+        fields = [] # (column, name in the file, prefixed name, is an id or a foreign key, can be missing)
+        for column in columns:
+            column_name = column.name.split(".")[-1]
+            can_be_missing = column is id_column or (table is self.db.flight_passengers and column_name == "seat_number")
+            fields.append((column, column_name, f"{table.name[:-1]}_{column_name}", column is id_column or column.references is not None, can_be_missing))
+
+        # the values of each row as strings (like the menus input them) or None if they are missing
+        rows = [] # (row_number, row, values)
+        for (row_number, row) in batch:
+            if not isinstance(row, dict):
+                self.reject(table, file_name, row_number, row, "A row must be a JSON object")
+                continue
+
+            values = []
+            for (column, column_name, prefixed_name, is_key, can_be_missing) in fields:
+                value = row.get(column_name)
+                if value is None:
+                    value = row.get(prefixed_name)
+                values.append(None if value is None or value == "" else str(value))
+            rows.append((row_number, row, values))
+
+        # each column is validated for the whole batch at once so a value that is in many rows (e.g. a departure date)
+        # is only checked once. ids and foreign keys are checked against the database afterwards
+        is_valid = []
+        for (index, (column, _, _, is_key, _)) in enumerate(fields):
+            column_values = [values[index] for (_, _, values) in rows if values[index] is not None]
+            is_valid.append(dict(zip(column_values, validate_many(column_values, is_id if is_key else column.is_valid))))
+
+        checked = []
+        for (row_number, row, values) in rows:
+            reason = None
+            for (index, (column, column_name, _, is_key, can_be_missing)) in enumerate(fields):
+                value = values[index]
+                if value is None:
+                    if not can_be_missing:
+                        reason = f"Missing {column_name}"
+                        break
+                elif not is_valid[index][value]:
+                    reason = f"{column_name} must be a non negative integer" if is_key else f"Invalid {column_name}. {column.validation_prompt}"
+                    break
+
+            if reason is None:
+                checked.append((row_number, row, values))
+            else:
+                self.reject(table, file_name, row_number, row, reason)
+
+        # the checks against the rows already in the database. each is one query for the whole batch
+        for (index, column) in enumerate(columns):
+            if column is id_column:
+                # an id also can't be used twice in the same batch so each id is added to used_ids when its row is kept
+                used_ids = table.exists_many([values[index] for (_, _, values) in checked if values[index] is not None])
+                checked = self.filter_batch(table, file_name, checked, lambda values : self.is_used(used_ids, values[index]), f"{table.name} already has a row with that id")
+            elif column.references is not None:
+                referenced_table = getattr(self.db, column.references)
+                existing_keys = referenced_table.exists_many([values[index] for (_, _, values) in checked])
+                checked = self.filter_batch(table, file_name, checked, lambda values : int(values[index]) not in existing_keys, f"No row in {referenced_table.name} has that {column.name.split('.')[-1]}")
+
+        # the rows of flight_passengers and flight_pilots are a pair of foreign keys that must not already be in the table
+        if table.key is None:
+            checked = self.check_pairs(table, file_name, checked)
+
+        return [tuple(values) for (_, _, values) in checked]
+
+    # rejects the rows in checked where is_rejected(values) is True with reason and returns the rest
+    def filter_batch(self, table: 'Table', file_name: str, checked: list[tuple], is_rejected, reason: str) -> list[tuple]:
+        kept = []
+        for (row_number, row, values) in checked:
+            if is_rejected(values):
+                self.reject(table, file_name, row_number, row, reason)
+            else:
+                kept.append((row_number, row, values))
+
+        return kept
+
+    # returns True if id is in used_ids. otherwise it is added to them so the next row with it is rejected
+    def is_used(self, used_ids: set[int], id: str | None) -> bool:
+        if id is None:
+            return False
+        if int(id) in used_ids:
+            return True
+
+        used_ids.add(int(id))
+        return False
+
+    # rejects the rows of flight_passengers or flight_pilots that are already in the table or are in the batch twice
+    # a passenger's seat must also be free. a passenger without a seat number is given the next available seat
+    def check_pairs(self, table: 'Table', file_name: str, checked: list[tuple]) -> list[tuple]:
+        is_passengers = table is self.db.flight_passengers
+        flight_ids = json.dumps(sorted({int(values[0]) for (_, _, values) in checked}))
+
+        try:
+            with self.db.reader() as cursor:
+                # the flight_id is first in the primary key of both tables so this is a range search for each flight
+                cursor.execute(f"SELECT * FROM {table.name} WHERE flight_id IN (SELECT value FROM json_each(?));", (flight_ids,))
+                existing_rows = cursor.fetchall()
+
+                if is_passengers:
+                    cursor.execute(
+                        """
+                            SELECT flight_id, max_passengers
+                            FROM flights
+                            JOIN aircrafts ON aircrafts.aircraft_id = flights.aircraft_id
+                            WHERE flight_id IN (SELECT value FROM json_each(?));
+                        """,
+                        (flight_ids,)
+                    )
+                    max_passengers = dict(cursor.fetchall())
+        except:
+            self.db.handle_error(f"Unable to check the rows of {table.name} table")
+
+        pairs = {(row[0], row[1]) for row in existing_rows}
+        seat_maps = {}
+        if is_passengers:
+            seat_maps = {flight_id: SeatMap(num_of_seats) for (flight_id, num_of_seats) in max_passengers.items()}
+            for (flight_id, _, seat_number) in existing_rows:
+                seat_maps[flight_id].take(seat_number)
+
+        kept = []
+        for (row_number, row, values) in checked:
+            pair = (int(values[0]), int(values[1]))
+            reason = None
+
+            if pair in pairs:
+                reason = f"That row is already in {table.name}"
+            elif is_passengers:
+                seat_map = seat_maps[pair[0]]
+                if values[2] is None:
+                    values[2] = seat_map.get_next_available()
+                    if values[2] is None:
+                        reason = "There are no more available seats on this flight"
+                elif not seat_map.is_seat(int(values[2])):
+                    reason = f"seat_number must be between 1 and {seat_map.num_of_seats} inclusive"
+                elif not seat_map.is_available(int(values[2])):
+                    reason = "That seat is taken"
+
+            if reason is None:
+                pairs.add(pair)
+                if is_passengers:
+                    seat_maps[pair[0]].take(int(values[2]))
+                kept.append((row_number, row, values))
+            else:
+                self.reject(table, file_name, row_number, row, reason)
+
+        return kept
+
+# the number of rows of a file that were imported and rejected. see Importer.import_file
+class ImportSummary:
+    def __init__(self):
+        self.count = 0
+        self.rejected = 0
\ No newline at end of file
@@ -1,12 +1,21 @@
-from typing import Iterator
+from typing import Iterator, Iterable
 from database.customer.Customer import Customer 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from database.validation import validate_date
 from cli.TextTable import TextTable
 
 class CustomersTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        # used by get_page to page through the customers. see Table
+        self.name = "customers"
+        self.key = "customers.customer_id"
+        self.select = "SELECT * FROM customers"
+        self.row_type = Customer
+
+        # the tables that ON DELETE CASCADE deletes from when customers are deleted
+        self.cascades = [("flight_passengers", "customer_id")]
         
         self.columns = {
             "Customer ID": Column(
@@ -71,63 +80,67 @@ class CustomersTable(Table):
                     );
                 """
             )
-            
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create customers table")
 
     # values = (first_name, last_name, date_of_birth, home_address, phone_number)
     def insert(self, values: tuple[str]) -> Customer:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO customers 
-                    VALUES (NULL, ?, ?, ?, ?, ?)
-                    RETURNING customer_id;
-                """,
-                values
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO customers 
+                        VALUES (NULL, ?, ?, ?, ?, ?)
+                        RETURNING *;
+                    """,
+                    values
+                )
 
-            customer = Customer(self.db.cursor.fetchone()[0], *values)  
-
-            self.db.connection.commit()
+                customer = Customer(*self.db.cursor.fetchone())  
+                self.ids.add_existing([customer.customer_id])
         except:
             self.db.handle_error("Unable to insert into customers table")
         else:
             return customer
 
+    # inserts many customers at once. each row is (first_name, last_name, date_of_birth, home_address, phone_number)
+    # returns an InsertSummary with the number of inserted customers and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO customers VALUES (NULL, ?, ?, ?, ?, ?);", rows, "Unable to insert into customers table")
+
     def update(self, customer_id: int, column_name: str, new_value: str) -> Customer:
         try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE customers 
-                    SET {column_name} = ?
-                    WHERE customer_id = ?
-                    RETURNING *;
-                """,
-                (new_value, customer_id)
-            )
-
-            customer = Customer(*self.db.cursor.fetchone())  
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE customers 
+                        SET {column_name} = ?
+                        WHERE customer_id = ?
+                        RETURNING *;
+                    """,
+                    (new_value, customer_id)
+                )
 
-            self.db.connection.commit()
+                customer = Customer(*self.db.cursor.fetchone())  
         except:
             self.db.handle_error("Unable to update customers table")
         else:
             return customer
 
     def get_all(self) -> Iterator[Customer]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute("SELECT * FROM customers;")
-            rows = self.db.cursor.fetchall()
+            cursor.execute("SELECT * FROM customers;")
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all rows from customers table")
         else:
-            return map(lambda row : Customer(*row), rows) 
+            return self.fetch_rows(cursor, Customer) 
 
     def get(self, column_name: str, value: str) -> Iterator[Customer]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 f"""
                     SELECT *
                     FROM customers
@@ -135,41 +148,37 @@ class CustomersTable(Table):
                 """,
                 (value,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in customers table")
         else:
-            return map(lambda row : Customer(*row), rows) 
+            return self.fetch_rows(cursor, Customer) 
 
-    def delete_and_return(self, column_name: str, value: str) -> Iterator[Customer]:
+    # deletes all customers from the table whose column_name value equals value
+    # returns the deleted customers and the number of flight passengers deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM customers
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
+
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM customers
+                        WHERE {column_name} = ?
+                        RETURNING *;
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Customer._make(row) for row in self.db.cursor.fetchall()]
+
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete from customers table")
         else:
-            return self.get_all()
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     def exists(self, customer_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM customers 
-                        WHERE customer_id = ?
-                    );
-                """,
-                (customer_id,)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if customer exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([customer_id])) > 0
\ No newline at end of file
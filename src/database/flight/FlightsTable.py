@@ -1,12 +1,28 @@
-from typing import Iterator
+from typing import Iterator, Iterable
 from database.flight.Flight import Flight, ExtendedFlight
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from database.validation import validate_date_time
 from cli.TextTable import TextTable
 
 class FlightsTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        # used by get_page to page through the flights. see Table
+        self.name = "flights"
+        self.key = "flights.flight_id"
+        self.select = """
+            SELECT flights.flight_id, flights.aircraft_id, aircrafts.name, flights.terminal_id, airports.name, terminals.name, destination,
+                datetime(boarding_time, 'unixepoch'), datetime(departure_time, 'unixepoch'), datetime(arrival_time, 'unixepoch')
+            FROM flights
+            JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
+            JOIN terminals ON flights.terminal_id = terminals.terminal_id
+            JOIN airports ON terminals.airport_id = airports.airport_id
+        """
+        self.row_type = ExtendedFlight
+
+        # the tables that ON DELETE CASCADE deletes from when flights are deleted
+        self.cascades = [("flight_passengers", "flight_id"), ("flight_pilots", "flight_id")]
         
         self.columns = {
             "Flight ID": Column(
@@ -21,6 +37,7 @@ class FlightsTable(Table):
                 insert_prompt="What's the ID of the aircraft for this flight?", 
                 update_prompt="What's the ID of the new aircraft for this flight?", 
                 is_valid=lambda x : x.isdigit() and self.db.aircrafts.exists(x),
+                references="aircrafts",
                 validation_prompt="An aircraft's ID must be a non negative integer and must exist in the database"
             ),
             "Terminal ID": Column(
@@ -29,6 +46,7 @@ class FlightsTable(Table):
                 insert_prompt="What's the ID of the terminal for this flight?",
                 update_prompt="What's the ID of the new terminal for this flight?",
                 is_valid=lambda x : x.isdigit() and self.db.terminals.exists(x),
+                references="terminals",
                 validation_prompt="An terminals's ID must be a non negative integer and must exist in the database"
             ),
             "Destination": Column(
@@ -44,16 +62,18 @@ class FlightsTable(Table):
                 settable=True,
                 insert_prompt="What's the boarding time of this flight in YYYY-MM-DD HH:MM:SS format?",
                 update_prompt="What's the new boarding time of this flight in YYYY-MM-DD HH:MM:SS format?",
-                is_valid=validate_date_time, 
-                validation_prompt="A flight's boarding time must be in the format YYYY-MM-DD HH:MM:SS"
+                is_valid=validate_date_time,
+                validation_prompt="A flight's boarding time must be in the format YYYY-MM-DD HH:MM:SS",
+                placeholder="unixepoch(?)"
             ),
             "Departure Time": Column(
                 name="departure_time", 
                 settable=True,
                 insert_prompt="What's the departure time of this flight in YYYY-MM-DD HH:MM:SS format?",
                 update_prompt="What's the new departure time of this flight in YYYY-MM-DD HH:MM:SS format?",
-                is_valid=validate_date_time, 
-                validation_prompt="A flight's departure time must be in the format YYYY-MM-DD HH:MM:SS"
+                is_valid=validate_date_time,
+                validation_prompt="A flight's departure time must be in the format YYYY-MM-DD HH:MM:SS",
+                placeholder="unixepoch(?)"
             ),
             "Arrival Time": Column(
                 name="arrival_time", 
@@ -61,140 +81,244 @@ class FlightsTable(Table):
                 insert_prompt="What's the arrival time of this flight in YYYY-MM-DD HH:MM:SS format?",
                 update_prompt="What's the new arrival time of this flight in YYYY-MM-DD HH:MM:SS format?",
                 is_valid=validate_date_time,
-                validation_prompt="A flight's arrival time must be in the format YYYY-MM-DD HH:MM:SS"
+                validation_prompt="A flight's arrival time must be in the format YYYY-MM-DD HH:MM:SS",
+                placeholder="unixepoch(?)"
             )
         }
 
+        # every column can be searched on and the statistics filter or group by these columns
+        # so each one needs an index to avoid scanning the whole table
+        self.indexes = {
+            "flights_aircraft_id": "flights (aircraft_id)", # also used by ON DELETE CASCADE from aircrafts
+            "flights_terminal_id": "flights (terminal_id)", # also used by ON DELETE CASCADE from terminals
+            "flights_destination_arrival_time": "flights (destination, arrival_time)",
+            "flights_boarding_time": "flights (boarding_time)",
+            "flights_departure_time": "flights (departure_time)",
+            "flights_arrival_time": "flights (arrival_time)",
+            # the fullest flights are found by reading this index backwards. see Statistics.get_upcoming_flights_by_used_seats
+            "flights_load_factor": "flights (load_factor, boarding_time)",
+            # the calendar columns are grouped by to count flights and customers per week, month and day of the week
+            "flights_arrival_iso_year_iso_week": "flights (arrival_iso_year, arrival_iso_week)",
+            "flights_destination_arrival_year_month": "flights (destination, arrival_year, arrival_month)",
+            "flights_boarding_weekday": "flights (boarding_weekday, passenger_count)"
+        }
+
+        self.migrations = {1: self.convert_times_to_epochs}
+        self.backfills = {1: self.count_passengers}
+
+    # returns the CREATE TABLE statement of the flights table with the name table_name
+    def get_create_sql(self, table_name: str) -> str:
+        # the times are stored as the number of seconds since 1970-01-01 00:00:00 (unix epochs) so comparing and
+        # subtracting them is integer arithmetic. they are converted to and from YYYY-MM-DD HH:MM:SS at the queries
+        # the calendar columns are worked out once from the times when a flight is inserted or updated and stored
+        # so they can be indexed instead of calling strftime on every flight in every query
+        # an ISO week starts on a monday and belongs to the year that its thursday is in. 1970-01-01 was a thursday
+        # so (days + 3) % 7 is the number of days since monday and the thursday of the week is 3 days after that monday
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                flight_id INTEGER PRIMARY KEY,
+                aircraft_id INTEGER NOT NULL,
+                terminal_id INTEGER NOT NULL,
+                destination VARCHAR(100) NOT NULL,
+                boarding_time INTEGER NOT NULL,
+                departure_time INTEGER NOT NULL,
+                arrival_time INTEGER NOT NULL,
+
+                -- the number of customers on the flight and the fraction of the aircraft's seats they take up
+                -- these are kept up to date by triggers instead of being counted from flight_passengers each time
+                passenger_count INTEGER NOT NULL DEFAULT 0,
+                load_factor REAL NOT NULL DEFAULT 0,
+
+                arrival_year INTEGER GENERATED ALWAYS AS (CAST(strftime('%Y', arrival_time, 'unixepoch') AS INTEGER)) STORED,
+                arrival_month INTEGER GENERATED ALWAYS AS (CAST(strftime('%m', arrival_time, 'unixepoch') AS INTEGER)) STORED,
+                arrival_iso_year INTEGER GENERATED ALWAYS AS (
+                    CAST(strftime('%Y', (arrival_time / 86400 - (arrival_time / 86400 + 3) % 7 + 3) * 86400, 'unixepoch') AS INTEGER)
+                ) STORED,
+                arrival_iso_week INTEGER GENERATED ALWAYS AS (
+                    (CAST(strftime('%j', (arrival_time / 86400 - (arrival_time / 86400 + 3) % 7 + 3) * 86400, 'unixepoch') AS INTEGER) - 1) / 7 + 1
+                ) STORED,
+                boarding_weekday INTEGER GENERATED ALWAYS AS ((boarding_time / 86400 + 4) % 7) STORED, -- 0 is sunday, 1 is monday, etc...
+
+                FOREIGN KEY (aircraft_id) REFERENCES aircrafts ON DELETE CASCADE,
+                FOREIGN KEY (terminal_id) REFERENCES terminals ON DELETE CASCADE
+            );
+        """
+
     def create_table(self) -> None:
         try:
+            self.db.cursor.execute(self.get_create_sql("flights"))
+
+            # the passenger count is changed by the triggers on flight_passengers (see FlightPassengersTable.py)
+            # the load factor changes when the passenger count, the flight's aircraft or the aircraft's number of seats changes
+            # dividing by 0 seats is NULL in sqlite so IFNULL makes the load factor of an aircraft with no seats 0
             self.db.cursor.execute(
                 """
-                    CREATE TABLE IF NOT EXISTS flights (
-                        flight_id INTEGER PRIMARY KEY,
-                        aircraft_id INTEGER NOT NULL,
-                        terminal_id INTEGER NOT NULL,
-                        destination VARCHAR(100) NOT NULL,
-                        boarding_time VARCHAR(19) NOT NULL,
-                        departure_time VARCHAR(19) NOT NULL,
-                        arrival_time VARCHAR(19) NOT NULL,
-
-                        FOREIGN KEY (aircraft_id) REFERENCES aircrafts ON DELETE CASCADE,
-                        FOREIGN KEY (terminal_id) REFERENCES terminals ON DELETE CASCADE
-                    );
+                    CREATE TRIGGER IF NOT EXISTS flights_update_load_factor
+                    AFTER UPDATE OF passenger_count, aircraft_id ON flights
+                    BEGIN
+                        UPDATE flights
+                        SET load_factor = IFNULL(CAST(NEW.passenger_count AS REAL) / (
+                            SELECT max_passengers
+                            FROM aircrafts
+                            WHERE aircraft_id = NEW.aircraft_id
+                        ), 0)
+                        WHERE flight_id = NEW.flight_id;
+                    END;
+                """
+            )
+            self.db.cursor.execute(
+                """
+                    CREATE TRIGGER IF NOT EXISTS aircrafts_update_load_factor
+                    AFTER UPDATE OF max_passengers ON aircrafts
+                    BEGIN
+                        UPDATE flights
+                        SET load_factor = IFNULL(CAST(passenger_count AS REAL) / NEW.max_passengers, 0)
+                        WHERE aircraft_id = NEW.aircraft_id;
+                    END;
                 """
             )
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create flights table")
 
+    # flights tables made before version 1 of the schema stored the times as strings
+    # sqlite can't change the type of a column or add a stored column so the flights are copied into a new table
+    def convert_times_to_epochs(self) -> None:
+        try:
+            # the times have already been converted if the upgrade was stopped after this
+            self.db.cursor.execute("SELECT EXISTS(SELECT 1 FROM pragma_table_xinfo('flights') WHERE name = 'arrival_iso_week');")
+            is_converted = self.db.cursor.fetchone()[0] == 1
+        except:
+            self.db.handle_error("Unable to get the columns of flights table")
+
+        if not is_converted:
+            columns = ["flight_id", "aircraft_id", "terminal_id", "destination", "boarding_time", "departure_time", "arrival_time"]
+            select = ["flight_id", "aircraft_id", "terminal_id", "destination", "unixepoch(boarding_time)", "unixepoch(departure_time)", "unixepoch(arrival_time)"]
+            self.rebuild(self.get_create_sql, columns, select, ["flight_id"])
+
+    # counts the passengers on every flight. this sets their load factors as well (see create_table)
+    # flights from before version 1 of the schema either don't have their passengers counted or have been copied without them
+    def count_passengers(self) -> None:
+        def count(start: int, end: int) -> None:
+            try:
+                self.db.cursor.execute(
+                    """
+                        UPDATE flights
+                        SET passenger_count = (
+                            SELECT COUNT(*)
+                            FROM flight_passengers
+                            WHERE flight_passengers.flight_id = flights.flight_id
+                        )
+                        WHERE flight_id > ? AND flight_id <= ?;
+                    """,
+                    (start, end)
+                )
+            except:
+                self.db.handle_error("Unable to count the passengers on flights")
+
+        self.run_in_chunks("flight_id", count, "Counting passengers")
+
     # values = (aircraft_id, terminal_id, destination, boarding_time, departure_time, arrival_time)
     def insert(self, values: tuple[str]) -> Flight:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO flights 
-                    VALUES (NULL, ?, ?, ?, ?, ?, ?)
-                    RETURNING flight_id;
-                """,
-                values
-            )
-
-            flight = Flight(self.db.cursor.fetchone()[0], *values)  
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO flights (aircraft_id, terminal_id, destination, boarding_time, departure_time, arrival_time)
+                        VALUES (?, ?, ?, unixepoch(?), unixepoch(?), unixepoch(?))
+                        RETURNING flight_id, aircraft_id, terminal_id, destination,
+                            datetime(boarding_time, 'unixepoch'), datetime(departure_time, 'unixepoch'), datetime(arrival_time, 'unixepoch');
+                    """,
+                    values
+                )
 
-            self.db.connection.commit()
+                flight = Flight(*self.db.cursor.fetchone())  
+                self.ids.add_existing([flight.flight_id])
         except:
             self.db.handle_error("Unable to insert into flights table")
         else:
             return flight
 
+    # inserts many flights at once. each row is (aircraft_id, terminal_id, destination, boarding_time, departure_time, arrival_time)
+    # returns an InsertSummary with the number of inserted flights and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows(
+            "INSERT INTO flights (aircraft_id, terminal_id, destination, boarding_time, departure_time, arrival_time) VALUES (?, ?, ?, unixepoch(?), unixepoch(?), unixepoch(?));",
+            rows,
+            "Unable to insert into flights table"
+        )
+
     def update(self, flight_id: int, column_name: str, new_value: str) -> Flight:
+        placeholder = self.get_placeholder(column_name)
+        column_name = column_name.split(".")[-1] # the column can't have the table's name in front of it in SET. e.g. flights.aircraft_id
+
         try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE flights 
-                    SET {column_name} = ?
-                    WHERE flight_id = ?
-                    RETURNING *;
-                """,
-                (new_value, flight_id)
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE flights 
+                        SET {column_name} = {placeholder}
+                        WHERE flight_id = ?
+                        RETURNING flight_id, aircraft_id, terminal_id, destination,
+                            datetime(boarding_time, 'unixepoch'), datetime(departure_time, 'unixepoch'), datetime(arrival_time, 'unixepoch');
+                    """,
+                    (new_value, flight_id)
+                )
 
-            flight = Flight(*self.db.cursor.fetchone())  
+                flight = Flight(*self.db.cursor.fetchone())  
 
-            self.db.connection.commit()
+                if column_name == "aircraft_id": # the flight's seat map has the number of seats of the old aircraft
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to update flights table")
         else:
             return flight
     
     def get_all(self) -> Iterator[ExtendedFlight]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
-                """
-                    SELECT flight_id, flights.aircraft_id, aircrafts.name, flights.terminal_id, airports.name, terminals.name, destination, boarding_time, departure_time, arrival_time
-                    FROM flights
-                    JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
-                    JOIN terminals ON flights.terminal_id = terminals.terminal_id
-                    JOIN airports ON terminals.airport_id = airports.airport_id;
-                """
-            )
-            rows = self.db.cursor.fetchall()
+            cursor.execute(f"{self.select};")
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all rows from flights table")
         else:
-            return map(lambda row : ExtendedFlight(*row), rows) 
+            return self.fetch_rows(cursor, ExtendedFlight) 
 
     def get(self, column_name: str, value: str) -> Iterator[ExtendedFlight]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
-                f"""
-                    SELECT flights.flight_id, flights.aircraft_id, aircrafts.name, flights.terminal_id, airports.name, terminals.name, destination, boarding_time, departure_time, arrival_time
-                    FROM flights
-                    JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
-                    JOIN terminals ON flights.terminal_id = terminals.terminal_id
-                    JOIN airports ON terminals.airport_id = airports.airport_id
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            rows = self.db.cursor.fetchall()
+            cursor.execute(f"{self.select} WHERE {column_name} = {self.get_placeholder(column_name)};", (value,))
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in flights table")
         else:
-            return map(lambda row : ExtendedFlight(*row), rows)  
+            return self.fetch_rows(cursor, ExtendedFlight)  
 
-    def delete_and_return(self, column_name: str, value: str) -> Iterator[Flight]:
+    # deletes all flights from the table whose column_name value equals value
+    # returns the deleted flights and the number of flight passengers and flight pilots deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM flights
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
 
-            self.db.cursor.execute("SELECT * FROM flights;")
-            remaining_rows = self.db.cursor.fetchall()
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM flights
+                        WHERE {column_name} = {self.get_placeholder(column_name)}
+                        RETURNING flight_id, aircraft_id, terminal_id, destination,
+                            datetime(boarding_time, 'unixepoch'), datetime(departure_time, 'unixepoch'), datetime(arrival_time, 'unixepoch');
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Flight._make(row) for row in self.db.cursor.fetchall()]
+
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete from flights table")
         else:
-            return map(lambda row : Flight(*row), remaining_rows) 
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     def exists(self, flight_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM flights 
-                        WHERE flight_id = ?
-                    );
-                """,
-                (flight_id,)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if flight exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([flight_id])) > 0
\ No newline at end of file
@@ -1,16 +1,14 @@
-class FlightPassenger:
-    def __init__(
-        self, 
-        flight_id: int, 
-        customer_id: int,
-        seat_number: int,
-    ) -> None:
-        self.flight_id = flight_id
-        self.customer_id = customer_id
-        self.seat_number = seat_number
-    
-    def get_column_names(self) -> list[str]:
-        return ["Flight ID", "Customer ID", "Seat Number"]
+from typing import NamedTuple
+
+class FlightPassenger(NamedTuple):
+    flight_id: int
+    customer_id: int
+    seat_number: int
+
+    column_names = ("Flight ID", "Customer ID", "Seat Number")
+
+    def get_column_names(self) -> tuple[str, ...]:
+        return self.column_names
 
     def to_row(self) -> list[str]:
         return [str(self.flight_id), str(self.customer_id), str(self.seat_number)]
\ No newline at end of file
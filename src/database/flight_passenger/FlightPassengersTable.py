@@ -1,24 +1,39 @@
-from typing import Iterator
+import json
+from typing import Iterator, Iterable
 from database.flight_passenger.FlightPassenger import FlightPassenger 
+from database.flight_passenger.SeatMap import SeatMap
 from database.customer.Customer import Customer 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from cli.TextTable import TextTable
 
+# adds one to the passenger count of a flight whenever a customer is added to it. see FlightPassengersTable.insert_many
+insert_count_trigger = """
+    CREATE TRIGGER IF NOT EXISTS flight_passengers_insert_count
+    AFTER INSERT ON flight_passengers
+    BEGIN
+        UPDATE flights SET passenger_count = passenger_count + 1 WHERE flight_id = NEW.flight_id;
+    END;
+"""
+
 class FlightPassengersTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        self.name = "flight_passengers"
         
         self.columns = { 
             "Flight ID": Column(
                 name="flight_passengers.flight_id", 
                 settable=False,
                 is_valid=lambda x : x.isdigit() and self.db.flights.exists(x),
+                references="flights",
                 validation_prompt="A flight's ID must be a non negative integer and must exist in the database"
             ),
             "Customer ID": Column(
                 name="flight_passengers.customer_id", 
                 settable=False,
                 is_valid=lambda x : x.isdigit() and self.db.customers.exists(x),
+                references="customers",
                 validation_prompt="A customer's ID must be a non negative integer and must exist in the database"
             ),
             "Seat Number": Column(
@@ -31,66 +46,195 @@ class FlightPassengersTable(Table):
             ),
         }
 
+        # the table is stored in (flight_id, customer_id) order so getting the passengers on a flight is a range search
+        # this index covers the bookings of a customer in the same way and is used by ON DELETE CASCADE when a customer is deleted
+        self.indexes = {
+            "flight_passengers_customer_id": "flight_passengers (customer_id, flight_id, seat_number)"
+        }
+
+        self.migrations = {1: self.remove_rowids}
+
+        # maps a flight's id to a SeatMap of its taken seats. a flight's seat map is made the first time it is needed
+        # and is kept up to date by insert, update_seat_number and delete_and_return so finding a seat doesn't query the database
+        # only changes made through this Database are seen so another program writing to the same file makes these out of date
+        # they are only changed and filled while db.lock is held and are read through the writer so they can't miss a change
+        self.seat_maps = {}
+
+    def clear_cache(self) -> None:
+        super().clear_cache()
+        self.seat_maps = {}
+
+    # returns the CREATE TABLE statement of the flight passengers table with the name table_name
+    def get_create_sql(self, table_name: str) -> str:
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                flight_id INTEGER,
+                customer_id INTEGER,
+                seat_number INTEGER NOT NULL,
+
+                PRIMARY KEY (flight_id, customer_id),
+                FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
+                FOREIGN KEY (customer_id) REFERENCES customers ON DELETE CASCADE
+            ) WITHOUT ROWID;
+        """
+
     def create_table(self) -> None:
         try:
+            self.db.cursor.execute(self.get_create_sql("flight_passengers"))
+
+            # keeps the passenger count of each flight up to date. ON DELETE CASCADE also runs the delete trigger
+            self.db.cursor.execute(insert_count_trigger)
             self.db.cursor.execute(
-              """
-                  CREATE TABLE IF NOT EXISTS flight_passengers (
-                      flight_id INTEGER,
-                      customer_id INTEGER,
-                      seat_number INTEGER NOT NULL,
-    
-                      PRIMARY KEY (flight_id, customer_id),
-                      FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
-                      FOREIGN KEY (customer_id) REFERENCES customers ON DELETE CASCADE
-                  );
-              """
+                """
+                    CREATE TRIGGER IF NOT EXISTS flight_passengers_delete_count
+                    AFTER DELETE ON flight_passengers
+                    BEGIN
+                        UPDATE flights SET passenger_count = passenger_count - 1 WHERE flight_id = OLD.flight_id;
+                    END;
+                """
             )
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create flight passengers table")
 
+    # version 1 of the schema stores the table without rowids (see get_create_sql) so tables made before then are copied into a new one
+    def remove_rowids(self) -> None:
+        columns = ["flight_id", "customer_id", "seat_number"]
+        self.rebuild(self.get_create_sql, columns, columns, ["flight_id", "customer_id"])
+
     # adds the customer to the flight and assigns them to seat_number
     def insert(self, flight_id: int, customer_id: int, seat_number: int) -> FlightPassenger:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO flight_passengers 
-                    VALUES (?, ?, ?);
-                """,
-                (flight_id, customer_id, seat_number)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO flight_passengers 
+                        VALUES (?, ?, ?);
+                    """,
+                    (flight_id, customer_id, seat_number)
+                )
+
+                seat_map = self.seat_maps.get(int(flight_id))
+                if seat_map is not None:
+                    seat_map.take(int(seat_number))
         except:
             self.db.handle_error("Unable to insert into flight passengers table")
         else:
             return FlightPassenger(flight_id, customer_id, seat_number)  
 
+    # adds many customers to flights at once. each row is (flight_id, customer_id, seat_number)
+    # returns an InsertSummary with the number of customers added
+    #
+    # the insert trigger would update a flight (and work out its generated columns and load factor again) for every passenger
+    # so it is dropped while the rows are inserted and each flight's passengers are counted once afterwards instead
+    # this all happens in one transaction so no other connection ever sees the table without the trigger
+    # and the trigger is back if the transaction is rolled back
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        flight_ids = set()
+        def get_rows() -> Iterator[tuple]:
+            for row in rows:
+                flight_ids.add(int(row[0]))
+                yield row
+
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute("DROP TRIGGER IF EXISTS flight_passengers_insert_count;")
+                self.db.cursor.executemany("INSERT INTO flight_passengers VALUES (?, ?, ?);", get_rows())
+                count = self.db.cursor.rowcount
+
+                self.db.cursor.execute(
+                    """
+                        UPDATE flights
+                        SET passenger_count = (SELECT COUNT(*) FROM flight_passengers WHERE flight_passengers.flight_id = flights.flight_id)
+                        WHERE flight_id IN (SELECT value FROM json_each(?));
+                    """,
+                    (json.dumps(sorted(flight_ids)),)
+                )
+                self.db.cursor.execute(insert_count_trigger)
+        except:
+            self.db.handle_error("Unable to insert into flight passengers table")
+        else:
+            # rows may be an iterator that has been used up so the seat maps are made again when they are next needed
+            self.clear_cache()
+            return InsertSummary(count)
+
+    # adds the customer to the flight in seat_number or the next available seat if seat_number is None
+    # returns None instead if that seat is taken or there are no available seats
+    # the seat is checked and taken in one transaction so another booking cannot take the same seat in between
+    def assign_seat(self, flight_id: int, customer_id: int, seat_number: int | None = None) -> FlightPassenger | None:
+        with self.db.transaction():
+            if seat_number is None:
+                seat_number = self.get_next_available_seat(flight_id)
+
+            # seat_number is None if there are no more available seats
+            if seat_number is not None and self.is_seat_available(flight_id, seat_number):
+                return self.insert(flight_id, customer_id, seat_number)
+
+        return None
+
+    # moves the customer on the flight to seat_number or the next available seat if seat_number is None
+    # returns None instead if that seat is taken or there are no available seats. see assign_seat
+    def change_seat(self, flight_id: int, customer_id: int, seat_number: int | None = None) -> FlightPassenger | None:
+        with self.db.transaction():
+            if seat_number is None:
+                seat_number = self.get_next_available_seat(flight_id)
+
+            if seat_number is not None and self.is_seat_available(flight_id, seat_number):
+                return self.update_seat_number(flight_id, customer_id, seat_number)
+
+        return None
+
     # modify a customer's seat number on a flight
     def update_seat_number(self, flight_id: int, customer_id: int, seat_number: int) -> FlightPassenger:
         try:
-            self.db.cursor.execute(
-                """
-                    UPDATE flight_passengers 
-                    SET seat_number = ?
-                    WHERE flight_id = ? AND customer_id = ?
-                    RETURNING *;
-                """,
-                (seat_number, flight_id, customer_id)
-            )
+            with self.db.transaction():
+                seat_map = self.seat_maps.get(int(flight_id))
+                if seat_map is not None:
+                    # RETURNING only returns the new seat number so the old one is got first to free it in the seat map
+                    self.db.cursor.execute(
+                        """
+                            SELECT seat_number
+                            FROM flight_passengers
+                            WHERE flight_id = ? AND customer_id = ?;
+                        """,
+                        (flight_id, customer_id)
+                    )
+                    seat_map.free(self.db.cursor.fetchone()[0])
+
+                self.db.cursor.execute(
+                    """
+                        UPDATE flight_passengers 
+                        SET seat_number = ?
+                        WHERE flight_id = ? AND customer_id = ?
+                        RETURNING *;
+                    """,
+                    (seat_number, flight_id, customer_id)
+                )
 
-            flight_passenger = FlightPassenger(*self.db.cursor.fetchone()) 
+                flight_passenger = FlightPassenger(*self.db.cursor.fetchone()) 
 
-            self.db.connection.commit()
+                if seat_map is not None:
+                    seat_map.take(flight_passenger.seat_number)
         except:
             self.db.handle_error("Unable to update seat number in flight passengers table")
         else:
             return flight_passenger
 
+    # returns every row in the table ordered by flight
+    def get_all(self) -> Iterator[FlightPassenger]:
+        cursor = self.db.get_read_cursor()
+        try:
+            cursor.execute("SELECT flight_id, customer_id, seat_number FROM flight_passengers ORDER BY flight_id, customer_id;")
+        except:
+            self.db.release_cursor(cursor)
+            self.db.handle_error("Unable to get all rows from flight passengers table")
+        else:
+            return self.fetch_rows(cursor, FlightPassenger)
+
     # returns all customers on a flight
     def get(self, flight_id: str) -> Iterator[Customer]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 """
                     SELECT customers.customer_id, first_name, last_name, date_of_birth, home_address, phone_number
                     FROM flight_passengers
@@ -99,43 +243,51 @@ class FlightPassengersTable(Table):
                 """, 
                 (flight_id,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get customers from flight passengers table")
         else:
-            return map(lambda row : Customer(*row), rows) 
+            return self.fetch_rows(cursor, Customer) 
 
-    # removes a customer from a flight and returns the remaining customers on the flight
-    def delete_and_return(self, flight_id: int, customer_id: int) -> Iterator[Customer]:
+    # removes the customer with id customer_id from the flight with id flight_id
+    # returns the removed row. nothing else is deleted by ON DELETE CASCADE
+    def delete_and_return(self, flight_id: int, customer_id: int) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                """
-                    DELETE FROM flight_passengers
-                    WHERE flight_id = ? AND customer_id = ?;
-                """,
-                (flight_id, customer_id)
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        DELETE FROM flight_passengers
+                        WHERE flight_id = ? AND customer_id = ?
+                        RETURNING *;
+                    """,
+                    (flight_id, customer_id)
+                )
+                deleted_rows = [FlightPassenger._make(row) for row in self.db.cursor.fetchall()]
 
-            self.db.connection.commit()
+                for flight_passenger in deleted_rows:
+                    seat_map = self.seat_maps.get(flight_passenger.flight_id)
+                    if seat_map is not None:
+                        seat_map.free(flight_passenger.seat_number)
         except:
             self.db.handle_error("Unable to delete from flight passengers table")
         else:
-            return self.get(flight_id) 
+            return DeleteResult(deleted_rows, {})
 
     # determines if a customer is on a flight
     def exists(self, flight_id: int, customer_id: int) -> bool:
         try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM flight_passengers 
-                        WHERE flight_id = ? AND customer_id = ?
-                    );
-                """,
-                (flight_id, customer_id)
-            )
-            exists = self.db.cursor.fetchone()[0]
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT EXISTS(
+                            SELECT 1 
+                            FROM flight_passengers 
+                            WHERE flight_id = ? AND customer_id = ?
+                        );
+                    """,
+                    (flight_id, customer_id)
+                )
+                exists = cursor.fetchone()[0]
         except:
             self.db.handle_error("Unable to determine if flight passenger exist")
         else:
@@ -144,61 +296,69 @@ class FlightPassengersTable(Table):
     # finds the maximum number of passengers on a flight (based on the aircraft)
     def get_max_passengers(self, flight_id: int) -> int:
         try:
-            self.db.cursor.execute(
-                """
-                    SELECT max_passengers
-                    FROM flights
-                    JOIN aircrafts ON flights.aircraft_id = flights.aircraft_id
-                    WHERE flight_id = ?;
-                """,
-                (flight_id,)
-            )
-            max_passengers = self.db.cursor.fetchone()[0]
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT max_passengers
+                        FROM flights
+                        JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
+                        WHERE flight_id = ?;
+                    """,
+                    (flight_id,)
+                )
+                max_passengers = cursor.fetchone()[0]
         except:
             self.db.handle_error("Unable to get max passengers")
         else:
             return max_passengers
 
+    # returns the SeatMap of the taken seats on the flight with id flight_id
+    # the taken seats are only read from the database the first time this is called for a flight
+    def get_seat_map(self, flight_id: int) -> SeatMap:
+        flight_id = int(flight_id) # ids from the menus are strings
+
+        # the dictionary is only read once as clear_cache can replace it from another thread in between two reads
+        seat_map = self.seat_maps.get(flight_id)
+        if seat_map is not None:
+            return seat_map
+
+        # a seat can't be taken or freed by another thread between reading the taken seats and caching them
+        with self.db.lock:
+            seat_map = self.seat_maps.get(flight_id)
+            if seat_map is not None: # another thread filled it while this one was waiting
+                return seat_map
+
+            try:
+                self.db.cursor.execute(
+                    """
+                        SELECT seat_number
+                        FROM flight_passengers
+                        WHERE flight_id = ?;
+                    """,
+                    (flight_id,)
+                )
+                seat_numbers = [seat_number for (seat_number,) in self.db.cursor.fetchall()]
+            except:
+                self.db.handle_error("Unable to get taken seats from database")
+            else:
+                seat_map = SeatMap(self.get_max_passengers(flight_id), seat_numbers)
+                self.seat_maps[flight_id] = seat_map
+                return seat_map
+
     # determines if seat_number is available on the flight with id flight_id
     def is_seat_available(self, flight_id: int, seat_number: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM flight_passengers 
-                        WHERE flight_id = ? AND seat_number = ?
-                    );
-                """,
-                (flight_id, seat_number)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if seat is available")
-        else:
-            return True if exists == 0 else False
+        return self.get_seat_map(flight_id).is_available(int(seat_number))
 
     # returns the next available seat on flight with id flight_id
     # returns None if there are no more available seats
     def get_next_available_seat(self, flight_id: int) -> int | None: 
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT seat_number
-                    FROM flight_passengers
-                    WHERE flight_id = ?
-                    ORDER BY seat_number;
-                """,
-                (flight_id,)
-            )
-            seat_numbers = self.db.cursor.fetchall()
-        except:
-            self.db.handle_error("Unable to get taken seats from database")
-        else: 
-            last = 0 
-            for (seat_number) in seat_numbers:
-                if last+1 != seat_number:
-                    return last+1
-                last = seat_number
-
-            return last+1 if last+1 <= self.get_max_passengers(flight_id) else None
\ No newline at end of file
+        return self.get_seat_map(flight_id).get_next_available()
+
+    # returns the number of seats that are not taken on the flight with id flight_id
+    def get_num_of_free_seats(self, flight_id: int) -> int:
+        return self.get_seat_map(flight_id).get_num_of_free_seats()
+
+    # returns the lowest seat number of num_of_seats available seats next to each other on the flight with id flight_id
+    # e.g. for a family that wants to sit together. returns None if there aren't enough available seats next to each other
+    def get_adjacent_available_seats(self, flight_id: int, num_of_seats: int) -> int | None:
+        return self.get_seat_map(flight_id).get_adjacent_available(num_of_seats)
\ No newline at end of file
@@ -0,0 +1,73 @@
+from typing import Iterable
+
+# the seats taken on one flight stored as the bits of an int. bit n is set if seat n is taken
+# python ints can be any size so a flight with 600 seats is just a 600 bit int
+# checking a seat is one bit test and finding free seats uses bitwise operations on the whole int at once
+# instead of looping over every seat number
+class SeatMap:
+    def __init__(self, num_of_seats: int, taken_seats: Iterable[int] = ()):
+        self.num_of_seats = num_of_seats # seats are numbered from 1 to num_of_seats (inclusive)
+
+        self.taken = 0
+        for seat_number in taken_seats:
+            self.take(seat_number)
+
+        # the bits of every seat on the flight. e.g. 0b1110 for 3 seats (there is no seat 0)
+        self.seats = ((1 << num_of_seats) - 1) << 1
+
+    # determines if seat_number is one of the seats on the flight
+    def is_seat(self, seat_number: int) -> bool:
+        return 1 <= seat_number <= self.num_of_seats
+
+    # a seat that isn't on the flight (e.g. seat 0 or seat 99 on a 4 seat aircraft) is never available
+    def is_available(self, seat_number: int) -> bool:
+        return self.is_seat(seat_number) and self.taken >> seat_number & 1 == 0
+
+    # marks seat_number as taken. returns False without changing anything if it isn't a seat on the flight
+    # e.g. a seat from before the aircraft's number of seats was lowered
+    def take(self, seat_number: int) -> bool:
+        if not self.is_seat(seat_number):
+            return False
+
+        self.taken |= 1 << seat_number
+        return True
+
+    def free(self, seat_number: int) -> None:
+        if self.is_seat(seat_number):
+            self.taken &= ~(1 << seat_number)
+
+    # the bits of the seats on the flight that are not taken
+    def get_free_bits(self) -> int:
+        return self.seats & ~self.taken
+
+    def get_num_of_free_seats(self) -> int:
+        return self.get_free_bits().bit_count()
+
+    # returns the lowest free seat number or None if every seat is taken
+    def get_next_available(self) -> int | None:
+        free = self.get_free_bits()
+        if free == 0:
+            return None
+
+        # free & -free keeps only the lowest set bit so its position is the seat number
+        return (free & -free).bit_length() - 1
+
+    # returns the lowest seat number of num_of_seats free seats next to each other or None if there aren't any
+    # e.g. get_adjacent_available(3) is 4 when seats 4, 5 and 6 are free
+    def get_adjacent_available(self, num_of_seats: int) -> int | None:
+        if num_of_seats < 1:
+            return None
+
+        # after this, bit n of runs is set if the `length` seats starting from seat n are all free
+        # the length is doubled each time so this takes log(num_of_seats) steps
+        runs = self.get_free_bits()
+        length = 1
+        while length < num_of_seats and runs != 0:
+            shift = min(length, num_of_seats - length)
+            runs &= runs >> shift
+            length += shift
+
+        if runs == 0:
+            return None
+
+        return (runs & -runs).bit_length() - 1
\ No newline at end of file
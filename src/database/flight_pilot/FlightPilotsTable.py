@@ -1,69 +1,104 @@
-from typing import Iterator
+from typing import Iterator, Iterable
 from database.flight_pilot.FlightPilot import FlightPilot 
 from database.pilot.Pilot import Pilot 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from cli.TextTable import TextTable
 
 class FlightPilotsTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        self.name = "flight_pilots"
         
         self.columns = { 
             "Flight ID": Column(
                 name="flight_pilots.flight_id", 
                 settable=False,
                 is_valid=lambda x : x.isdigit() and self.db.flights.exists(x),
+                references="flights",
                 validation_prompt="A flight's ID must be a non negative integer"
             ), 
             "Pilot ID": Column(
                 name="flight_pilots.pilot_id", 
                 settable=False,
                 is_valid=lambda x : x.isdigit() and self.db.pilots.exists(x),
+                references="pilots",
                 validation_prompt="A pilot's ID must be a non negative integer"
             ),
         }
 
+        # the table is stored in (flight_id, pilot_id) order so getting the pilots on a flight is a range search
+        # this index stores the same rows in (pilot_id, flight_id) order so getting the flights of a pilot is too
+        # it is also used by ON DELETE CASCADE when a pilot is deleted
+        self.indexes = {
+            "flight_pilots_pilot_id": "flight_pilots (pilot_id, flight_id)"
+        }
+
+        self.migrations = {1: self.remove_rowids}
+
+    # returns the CREATE TABLE statement of the flight pilots table with the name table_name
+    def get_create_sql(self, table_name: str) -> str:
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                flight_id INTEGER,
+                pilot_id INTEGER,
+
+                PRIMARY KEY (flight_id, pilot_id),
+                FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
+                FOREIGN KEY (pilot_id) REFERENCES pilots ON DELETE CASCADE
+            ) WITHOUT ROWID;
+        """
+
     def create_table(self) -> None:
         try:
-            self.db.cursor.execute(
-                """
-                    CREATE TABLE IF NOT EXISTS flight_pilots (
-                        flight_id INTEGER,
-                        pilot_id INTEGER,
-
-                        PRIMARY KEY (flight_id, pilot_id),
-                        FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
-                        FOREIGN KEY (pilot_id) REFERENCES pilots ON DELETE CASCADE
-                    );
-                """
-            )
-            self.db.connection.commit()
+            self.db.cursor.execute(self.get_create_sql("flight_pilots"))
         except:
             self.db.handle_error("Unable to create flight pilots table")
 
+    # version 1 of the schema stores the table without rowids (see get_create_sql) so tables made before then are copied into a new one
+    def remove_rowids(self) -> None:
+        columns = ["flight_id", "pilot_id"]
+        self.rebuild(self.get_create_sql, columns, columns, ["flight_id", "pilot_id"])
+
     # add the pilot with id pilot_id to flight with id flight_id
     def insert(self, flight_id: int, pilot_id: int) -> FlightPilot:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO flight_pilots 
-                    VALUES (?, ?);
-                """,
-                (flight_id, pilot_id)
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO flight_pilots 
+                        VALUES (?, ?);
+                    """,
+                    (flight_id, pilot_id)
+                )
 
-            flight_pilot = FlightPilot(flight_id, pilot_id)
-
-            self.db.connection.commit()
+                flight_pilot = FlightPilot(flight_id, pilot_id)
         except:
             self.db.handle_error("Unable to insert into flight pilots table")
         else:
             return flight_pilot
 
+    # adds many pilots to flights at once. each row is (flight_id, pilot_id)
+    # returns an InsertSummary with the number of pilots added
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO flight_pilots VALUES (?, ?);", rows, "Unable to insert into flight pilots table", has_ids=False)
+
+    # returns every row in the table ordered by flight
+    def get_all(self) -> Iterator[FlightPilot]:
+        cursor = self.db.get_read_cursor()
+        try:
+            cursor.execute("SELECT flight_id, pilot_id FROM flight_pilots ORDER BY flight_id, pilot_id;")
+        except:
+            self.db.release_cursor(cursor)
+            self.db.handle_error("Unable to get all rows from flight pilots table")
+        else:
+            return self.fetch_rows(cursor, FlightPilot)
+
     # returns all Pilots that are on the flight with id flight_id
     def get(self, flight_id: str) -> Iterator[Pilot]: 
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 """
                     SELECT pilots.pilot_id, first_name, last_name, date_of_birth
                     FROM flight_pilots
@@ -72,43 +107,46 @@ class FlightPilotsTable(Table):
                 """, 
                 (flight_id,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all pilots on flight")
         else:
-            return map(lambda row : Pilot(*row), rows) 
+            return self.fetch_rows(cursor, Pilot) 
 
-    # removes pilot with id pilot_id from flight with id flight_id
-    # returns the remainign Pilots on the flight
-    def delete_and_return(self, flight_id: int, pilot_id: int) -> Iterator[Pilot]:
+    # removes the pilot with id pilot_id from the flight with id flight_id
+    # returns the removed row. nothing else is deleted by ON DELETE CASCADE
+    def delete_and_return(self, flight_id: int, pilot_id: int) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                """
-                    DELETE FROM flight_pilots
-                    WHERE flight_id = ? AND pilot_id = ?;
-                """,
-                (flight_id, pilot_id)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        DELETE FROM flight_pilots
+                        WHERE flight_id = ? AND pilot_id = ?
+                        RETURNING *;
+                    """,
+                    (flight_id, pilot_id)
+                )
+                deleted_rows = [FlightPilot._make(row) for row in self.db.cursor.fetchall()]
         except:
             self.db.handle_error("Unable to delete from flight pilots table")
         else:
-            return self.get(flight_id)
-    
+            return DeleteResult(deleted_rows, {})
+
     # determines if the pilot is on the flight
     def exists(self, flight_id: int, pilot_id: int) -> bool:
         try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM flight_pilots 
-                        WHERE flight_id = ? AND pilot_id = ?
-                    );
-                """,
-                (flight_id, pilot_id)
-            )
-            exists = self.db.cursor.fetchone()[0]
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT EXISTS(
+                            SELECT 1 
+                            FROM flight_pilots 
+                            WHERE flight_id = ? AND pilot_id = ?
+                        );
+                    """,
+                    (flight_id, pilot_id)
+                )
+                exists = cursor.fetchone()[0]
         except:
             self.db.handle_error("Unable to determine if pilot is on flight")
         else:
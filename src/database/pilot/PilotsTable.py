@@ -1,12 +1,21 @@
 from typing import Iterable
 from database.pilot.Pilot import Pilot 
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from database.validation import validate_date
 from cli.TextTable import TextTable
 
 class PilotsTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        # used by get_page to page through the pilots. see Table
+        self.name = "pilots"
+        self.key = "pilots.pilot_id"
+        self.select = "SELECT * FROM pilots"
+        self.row_type = Pilot
+
+        # the tables that ON DELETE CASCADE deletes from when pilots are deleted
+        self.cascades = [("flight_pilots", "pilot_id")]
         
         self.columns = { 
             "Pilot ID": Column(
@@ -53,62 +62,67 @@ class PilotsTable(Table):
                     );
                 """
             )
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create pilots table")
 
     # values = (first_name, last_name, date_of_birth)
     def insert(self, values: tuple[str]) -> Pilot:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO pilots 
-                    VALUES (NULL, ?, ?, ?)
-                    RETURNING pilot_id;
-                """,
-                values
-            )
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO pilots 
+                        VALUES (NULL, ?, ?, ?)
+                        RETURNING *;
+                    """,
+                    values
+                )
 
-            pilot = Pilot(self.db.cursor.fetchone()[0], *values) 
-
-            self.db.connection.commit()
+                pilot = Pilot(*self.db.cursor.fetchone()) 
+                self.ids.add_existing([pilot.pilot_id])
         except:
             self.db.handle_error("Unable to insert into pilots table")
         else:
             return pilot
 
+    # inserts many pilots at once. each row is (first_name, last_name, date_of_birth)
+    # returns an InsertSummary with the number of inserted pilots and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO pilots VALUES (NULL, ?, ?, ?);", rows, "Unable to insert into pilots table")
+
     def update(self, pilot_id: int, column_name: str, new_value: str) -> Pilot:
         try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE pilots 
-                    SET {column_name} = ?
-                    WHERE pilot_id = ?
-                    RETURNING *;
-                """,
-                (new_value, pilot_id)
-            )
-
-            pilot = Pilot(*self.db.cursor.fetchone())  
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE pilots 
+                        SET {column_name} = ?
+                        WHERE pilot_id = ?
+                        RETURNING *;
+                    """,
+                    (new_value, pilot_id)
+                )
 
-            self.db.connection.commit()
+                pilot = Pilot(*self.db.cursor.fetchone())  
         except:
             self.db.handle_error("Unable to update pilots table")
         else:
             return pilot
 
     def get_all(self) -> Iterable[Pilot]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute("SELECT * FROM pilots;")
-            rows = self.db.cursor.fetchall()
+            cursor.execute("SELECT * FROM pilots;")
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all rows in pilots table")
         else:
-            return map(lambda row : Pilot(*row), rows) 
+            return self.fetch_rows(cursor, Pilot) 
 
     def get(self, column_name: str, value: str) -> Iterable[Pilot]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 f"""
                     SELECT *
                     FROM pilots
@@ -116,41 +130,37 @@ class PilotsTable(Table):
                 """,
                 (value,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in pilots table")
         else:
-            return map(lambda row : Pilot(*row), rows) 
+            return self.fetch_rows(cursor, Pilot) 
 
-    def delete_and_return(self, column_name: str, value: str) -> Iterable[Pilot]:
+    # deletes all pilots from the table whose column_name value equals value
+    # returns the deleted pilots and the number of flight pilots deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM pilots
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
-            self.db.connection.commit()
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
+
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM pilots
+                        WHERE {column_name} = ?
+                        RETURNING *;
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Pilot._make(row) for row in self.db.cursor.fetchall()]
+
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete from pilots table")
         else:
-            return self.get_all()
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     def exists(self, pilot_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM pilots 
-                        WHERE pilot_id = ?
-                    );
-                """,
-                (pilot_id,)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if pilot exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([pilot_id])) > 0
\ No newline at end of file
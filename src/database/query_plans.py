@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+from typing import Callable
+
+# checks that none of the built-in queries fall back to scanning a whole table
+# run from the src directory with: python -m database.query_plans
+# it exits with a non zero status code if any query scans a table that it is not allowed to
+
+# the tables in sqlite that are checked for full scans
+# flights_per_week is not checked as it has a row per week and its statistic is every row of it
+table_names = ["pilots", "airports", "terminals", "customers", "aircrafts", "flights", "flight_passengers", "flight_pilots", "flights_per_month"]
+
+# returns (name, run, allowed_scans) for every built-in query
+# run executes the query and allowed_scans is the set of tables the query needs to scan every row of
+# e.g. getting every row of a table or ranking every pilot has to scan that table
+def get_checks(db: 'Database') -> list[tuple[str, Callable[[], None], set[str]]]:
+    checks = []
+
+    for table_name in ["pilots", "airports", "terminals", "customers", "aircrafts", "flights"]:
+        table = getattr(db, table_name)
+
+        # list() is used to make sure lazy results are actually queried
+        checks.append((f"{table_name}.get_all", lambda table=table : list(table.get_all()), {table_name}))
+        checks.append((f"{table_name}.exists", lambda table=table : table.exists(1), set()))
+
+        # pages after the first one search for the rows after a key
+        checks.append((f"{table_name}.get_page", lambda table=table : table.get_page(1, 6), set()))
+        # jumping to a page and counting rows walk the rows in key order, up to an offset or limit
+        checks.append((f"{table_name}.get_key_at", lambda table=table : table.get_key_at(10), {table_name}))
+        checks.append((f"{table_name}.count_rows", lambda table=table : table.count_rows(limit=10000), {table_name}))
+
+        for column in table.columns.values():
+            # every column of flights is indexed. the other tables are only indexed on their id and foreign keys
+            # so searching them by any other column (e.g. a customer's name) has to scan the table
+            is_key = column.name.endswith("_id")
+            allowed_scans = set() if table_name == "flights" or is_key else {table_name}
+
+            checks.append((f"{table_name}.get({column.name})", lambda table=table, column=column : list(table.get(column.name, "1")), allowed_scans))
+            checks.append((f"{table_name}.get_page({column.name})", lambda table=table, column=column : table.get_page(1, 6, column.name, "1"), allowed_scans))
+
+    checks += [
+        ("flight_passengers.get", lambda : list(db.flight_passengers.get(1)), set()),
+        ("flight_passengers.exists", lambda : db.flight_passengers.exists(1, 1), set()),
+        ("flight_passengers.get_max_passengers", lambda : db.flight_passengers.get_max_passengers(1), set()),
+        ("flight_passengers.is_seat_available", lambda : db.flight_passengers.is_seat_available(1, 1), set()),
+        ("flight_passengers.get_next_available_seat", lambda : db.flight_passengers.get_next_available_seat(1), set()),
+        ("flight_pilots.get", lambda : list(db.flight_pilots.get(1)), set()),
+        ("flight_pilots.exists", lambda : db.flight_pilots.exists(1, 1), set()),
+
+        # these statistics summarise every flight, pilot or customer so they have to scan that table
+        ("statistics.get_flights_per_week", db.statistics.get_flights_per_week, set()),
+        ("statistics.get_flights_per_month", lambda : db.statistics.get_flights_per_month("London"), set()),
+        ("statistics.get_customers_per_day_of_week", db.statistics.get_customers_per_day_of_week, {"flights"}),
+        ("statistics.get_pilot_air_time", lambda : db.statistics.get_pilot_air_time(1), set()),
+        ("statistics.get_pilot_flights_per_day_of_week", lambda : db.statistics.get_pilot_flights_per_day_of_week(1), set()),
+        ("statistics.get_destination_popularity", db.statistics.get_destination_popularity, {"flights"}),
+        # this reads flights in load factor order from its index and stops after the limit so it is allowed to scan the index
+        ("statistics.get_upcoming_flights_by_used_seats", lambda : db.statistics.get_upcoming_flights_by_used_seats(50), {"flights"}),
+        ("statistics.get_pilots_by_flights", db.statistics.get_pilots_by_flights, {"pilots"}),
+        ("statistics.get_customers_by_flights", db.statistics.get_customers_by_flights, {"customers"}),
+        ("statistics.get_flight_passenger_count", lambda : db.statistics.get_flight_passenger_count(1), set()),
+        ("statistics.get_flight_pilot_count", lambda : db.statistics.get_flight_pilot_count(1), set())
+    ]
+
+    # the deletes are checked last as they delete the rows the other checks use
+    for table_name in ["flights", "pilots", "customers", "aircrafts", "terminals", "airports"]:
+        table = getattr(db, table_name)
+        for column in table.columns.values():
+            is_key = column.name.endswith("_id")
+            allowed_scans = set() if table_name == "flights" or is_key else {table_name}
+
+            checks.append((f"{table_name}.delete_and_return({column.name})", lambda table=table, column=column : table.delete_and_return(column.name, "1"), allowed_scans))
+
+    checks += [
+        ("flight_passengers.delete_and_return", lambda : db.flight_passengers.delete_and_return(1, 1), set()),
+        ("flight_pilots.delete_and_return", lambda : db.flight_pilots.delete_and_return(1, 1), set())
+    ]
+
+    return checks
+
+# returns the names of the tables that are fully scanned in the query plan of sql
+# a step in the plan such as "SCAN flights" or "SCAN flights USING COVERING INDEX ..." reads every row of flights
+# whereas "SEARCH flights USING INDEX ..." only reads the matching rows
+def get_scanned_tables(db: 'Database', sql: str) -> set[str]:
+    try:
+        db.cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        plan = db.cursor.fetchall()
+    except:
+        db.handle_error("Unable to get query plan")
+    else:
+        scanned_tables = set()
+        for (id, parent, notused, detail) in plan:
+            words = detail.split()
+            if words[0] == "SCAN" and words[1] in table_names:
+                scanned_tables.add(words[1])
+
+        return scanned_tables
+
+# runs every check against a new empty database
+# returns (name, sql, scanned_tables) for every query that scans a table it is not allowed to
+def find_full_scans() -> list[tuple[str, str, set[str]]]:
+    from database.Database import Database
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "airline"))
+        db.connect()
+        db.create_tables()
+
+        # some queries expect the rows they are given to exist so give every table a row with the id 1
+        db.pilots.insert(("Amelia", "Earhart", "1897-07-24"))
+        db.airports.insert(("Heathrow", "Longford, Hounslow"))
+        db.terminals.insert((1, "Terminal 1"))
+        db.customers.insert(("John", "Smith", "1990-01-01", "1 High Street", "07123456789"))
+        db.aircrafts.insert(("Boeing 747", 1, 400))
+        db.flights.insert((1, 1, "London", "2030-01-01 09:00:00", "2030-01-01 10:00:00", "2030-01-01 12:00:00"))
+        db.flight_passengers.insert(1, 1, 1)
+        db.flight_pilots.insert(1, 1)
+
+        full_scans = []
+        for (name, run, allowed_scans) in get_checks(db):
+            # record the sql of every statement the check runs
+            # the parameters are substituted into the sql so the plan can be explained afterwards
+            statements = []
+            db.connection.set_trace_callback(statements.append)
+            run()
+            db.connection.set_trace_callback(None)
+
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+                    continue
+
+                scanned_tables = get_scanned_tables(db, sql) - allowed_scans
+                if len(scanned_tables) > 0:
+                    full_scans.append((name, sql, scanned_tables))
+
+        db.cursor.close()
+        db.connection.close()
+
+    return full_scans
+
+if __name__ == "__main__":
+    full_scans = find_full_scans()
+
+    for (name, sql, scanned_tables) in full_scans:
+        print(f"{name} scans every row of {', '.join(sorted(scanned_tables))}:\n{sql.strip()}\n")
+
+    if len(full_scans) > 0:
+        print(f"{len(full_scans)} queries fall back to a full table scan")
+        sys.exit(1)
+
+    print("No queries fall back to a full table scan")
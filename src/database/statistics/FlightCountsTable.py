@@ -0,0 +1,110 @@
+from database.Table import Table
+
+# the number of flights per week and the number of flights to each destination per month
+# these are stored in their own tables instead of being counted from flights every time so the statistics menu
+# only reads a row per week or month however many flights there are
+# triggers on flights keep them up to date whenever a flight is inserted, updated or deleted
+class FlightCountsTable(Table):
+    def __init__(self, database: 'Database'):
+        super().__init__(database)
+
+        self.columns = {}
+
+        # version 1 of the schema counts ISO weeks and stores the years, weeks and months as integers so the tables are made again
+        self.migrations = {1: self.drop_table}
+        self.backfills = {1: self.count_flights}
+
+    def create_table(self) -> None:
+        try:
+            self.db.cursor.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS flights_per_week (
+                        year INTEGER,
+                        week INTEGER, -- the ISO week. year is the year that the week belongs to
+                        num_of_flights INTEGER NOT NULL,
+
+                        PRIMARY KEY (year, week)
+                    ) WITHOUT ROWID;
+                """
+            )
+            self.db.cursor.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS flights_per_month (
+                        destination TEXT,
+                        year INTEGER,
+                        month INTEGER,
+                        num_of_flights INTEGER NOT NULL,
+
+                        PRIMARY KEY (destination, year, month)
+                    ) WITHOUT ROWID;
+                """
+            )
+
+            # a flight is added to the counts of its week and month when it is inserted and taken away when it is deleted
+            # an update of its arrival time or destination is the same as deleting the old flight and inserting the new one
+            # a count is deleted when it gets to 0 so every row is a week or month that has a flight
+            add_flight = """
+                INSERT INTO flights_per_week
+                VALUES (NEW.arrival_iso_year, NEW.arrival_iso_week, 1)
+                ON CONFLICT (year, week) DO UPDATE SET num_of_flights = num_of_flights + 1;
+
+                INSERT INTO flights_per_month
+                VALUES (NEW.destination, NEW.arrival_year, NEW.arrival_month, 1)
+                ON CONFLICT (destination, year, month) DO UPDATE SET num_of_flights = num_of_flights + 1;
+            """
+            remove_flight = """
+                UPDATE flights_per_week
+                SET num_of_flights = num_of_flights - 1
+                WHERE year = OLD.arrival_iso_year AND week = OLD.arrival_iso_week;
+
+                DELETE FROM flights_per_week
+                WHERE year = OLD.arrival_iso_year AND week = OLD.arrival_iso_week AND num_of_flights = 0;
+
+                UPDATE flights_per_month
+                SET num_of_flights = num_of_flights - 1
+                WHERE destination = OLD.destination AND year = OLD.arrival_year AND month = OLD.arrival_month;
+
+                DELETE FROM flights_per_month
+                WHERE destination = OLD.destination AND year = OLD.arrival_year AND month = OLD.arrival_month AND num_of_flights = 0;
+            """
+
+            self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS flights_insert_counts AFTER INSERT ON flights BEGIN {add_flight} END;")
+            self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS flights_delete_counts AFTER DELETE ON flights BEGIN {remove_flight} END;")
+            self.db.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS flights_update_counts AFTER UPDATE OF arrival_time, destination ON flights BEGIN {remove_flight} {add_flight} END;")
+        except:
+            self.db.handle_error("Unable to create flight counts tables")
+
+    # the counts are made again from flights when create_table is next called
+    def drop_table(self) -> None:
+        try:
+            self.db.cursor.execute("DROP TABLE IF EXISTS flights_per_week;")
+            self.db.cursor.execute("DROP TABLE IF EXISTS flights_per_month;")
+        except:
+            self.db.handle_error("Unable to drop flight counts tables")
+
+    # counts every flight in flights that was inserted before these tables were made
+    # the counts are replaced instead of added to so flights already counted by the triggers aren't counted twice
+    # this is one transaction instead of chunks as the counts are grouped from the calendar indexes of flights
+    def count_flights(self) -> None:
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute("DELETE FROM flights_per_week;")
+                self.db.cursor.execute("DELETE FROM flights_per_month;")
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO flights_per_week
+                        SELECT arrival_iso_year, arrival_iso_week, COUNT(*)
+                        FROM flights
+                        GROUP BY arrival_iso_year, arrival_iso_week;
+                    """
+                )
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO flights_per_month
+                        SELECT destination, arrival_year, arrival_month, COUNT(*)
+                        FROM flights
+                        GROUP BY destination, arrival_year, arrival_month;
+                    """
+                )
+        except:
+            self.db.handle_error("Unable to count flights per week and month")
\ No newline at end of file
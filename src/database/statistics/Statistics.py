@@ -0,0 +1,328 @@
+from typing import Iterator
+
+# every query in the statistics menu by a name that programs can use instead of the menu (e.g. web/RequestHandler.py)
+# maps the name to (x, y, z) where x is the name of its function in Statistics, y is the names of the parameters
+# of the function and z is the names of the values in each row
+# the statistics in single_row_statistics return one row instead of a list of rows. the functions of the others
+# return an iterator that fetches the rows as it is iterated over (see Statistics.fetch_rows)
+named_statistics = {
+    "flights-per-week": ("iterate_flights_per_week", [], ["year", "week", "num_of_flights"]),
+    "flights-per-month": ("iterate_flights_per_month", ["destination"], ["year", "month", "num_of_flights"]),
+    "customers-per-day-of-week": ("iterate_customers_per_day_of_week", [], ["day_of_week", "num_of_customers"]),
+    "pilot-air-time": ("get_pilot_air_time", ["pilot_id"], ["seconds"]),
+    "pilot-flights-per-day-of-week": ("iterate_pilot_flights_per_day_of_week", ["pilot_id"], ["day_of_week", "num_of_flights"]),
+    "destination-popularity": ("iterate_destination_popularity", [], ["destination", "num_of_passengers"]),
+    "upcoming-flights-by-used-seats": ("iterate_upcoming_flights_by_used_seats", ["limit"], ["flight_id", "aircraft_id", "airport_name", "terminal_name", "boarding_time", "destination", "num_of_passengers", "max_passengers"]),
+    "pilots-by-flights": ("iterate_pilots_by_flights", [], ["pilot_id", "first_name", "last_name", "num_of_flights"]),
+    "customers-by-flights": ("iterate_customers_by_flights", [], ["customer_id", "first_name", "last_name", "num_of_flights"]),
+    "flight-passenger-count": ("get_flight_passenger_count", ["flight_id"], ["flight_id", "destination", "max_passengers", "num_of_passengers"]),
+    "flight-pilot-count": ("get_flight_pilot_count", ["flight_id"], ["flight_id", "destination", "num_of_pilots"])
+}
+single_row_statistics = ["pilot-air-time", "flight-passenger-count", "flight-pilot-count"]
+
+# the queries used to calculate the summary statistics shown in the statistics menu
+# they live here instead of in the menu so they can be reused and checked (see query_plans.py)
+# each function returns the rows of the query as tuples
+# the get_ functions return a list of every row (e.g. for the menu) and the iterate_ functions fetch them in batches
+# so a large statistic (e.g. customers-by-flights) can be written out without all of its rows in memory
+class Statistics:
+    def __init__(self, database: 'Database'):
+        self.db = database
+
+    # runs the statistic called statistic_name in named_statistics with the arguments named by its parameters
+    # returns its rows as dictionaries that map the names of the values to the values
+    # single row statistics return one dictionary instead or None if nothing was found. e.g. the pilot has no flights
+    # raises a ValueError if an argument is missing. limit is optional and every row is returned without it
+    # or if it is 0 in the same way as the statistics menu
+    def get_named_statistic(self, statistic_name: str, arguments: dict[str, str]) -> list[dict] | dict | None:
+        if statistic_name not in single_row_statistics:
+            return list(self.iterate_named_statistic(statistic_name, arguments))
+
+        (function_name, parameters, names) = named_statistics[statistic_name]
+        result = getattr(self, function_name)(*self.get_argument_values(parameters, arguments))
+
+        row = result if isinstance(result, tuple) else (result,) # get_pilot_air_time only returns the number of seconds
+        return None if row[0] is None else dict(zip(names, row))
+
+    # the same as get_named_statistic but returns an iterator of the rows that fetches them db.fetch_size at a time
+    # e.g. for Exporter.export_statistic. single row statistics have one row or none
+    # the arguments are checked (and a ValueError raised) straight away instead of when the rows are first fetched
+    def iterate_named_statistic(self, statistic_name: str, arguments: dict[str, str]) -> Iterator[dict]:
+        if statistic_name in single_row_statistics:
+            row = self.get_named_statistic(statistic_name, arguments)
+            return iter([] if row is None else [row])
+
+        (function_name, parameters, names) = named_statistics[statistic_name]
+        rows = getattr(self, function_name)(*self.get_argument_values(parameters, arguments))
+        return self.name_rows(rows, names)
+
+    # returns the values of the parameters of a named statistic from arguments in the order the function takes them
+    def get_argument_values(self, parameters: list[str], arguments: dict[str, str]) -> list:
+        values = []
+        for parameter in parameters:
+            if parameter == "limit":
+                values.append(self.get_limit(arguments.get("limit")))
+            elif arguments.get(parameter) is None:
+                raise ValueError(f"Missing {parameter}")
+            else:
+                values.append(arguments[parameter])
+
+        return values
+
+    # returns the limit argument of a statistic as the LIMIT of its query
+    # no limit or a limit of 0 or less is every row (-1) like 0 in the statistics menu
+    def get_limit(self, limit: str | None) -> int:
+        if limit is None or str(limit).strip() == "":
+            return -1
+
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+
+        return limit if limit > 0 else -1
+
+    # turns each row into a dictionary with names as its keys
+    # the rows are closed if this is dropped before the end so their reader is released straight away
+    def name_rows(self, rows: Iterator[tuple], names: list[str]) -> Iterator[dict]:
+        try:
+            for row in rows:
+                yield dict(zip(names, row))
+        finally:
+            rows.close()
+
+    # runs sql on a reader from db.get_read_cursor and returns an iterator of its rows
+    # the rows are fetched db.fetch_size at a time and the reader is released once every row has been fetched
+    # or the iterator is dropped in the same way as Table.fetch_rows
+    def fetch_rows(self, sql: str, parameters: tuple, error_message: str) -> Iterator[tuple]:
+        cursor = self.db.get_read_cursor()
+        try:
+            cursor.execute(sql, parameters)
+        except:
+            self.db.release_cursor(cursor)
+            self.db.handle_error(error_message)
+        else:
+            rows = self.fetch_batches(cursor, error_message)
+            next(rows) # starts it so it releases the cursor even if it is dropped without being iterated over
+            return rows
+
+    def fetch_batches(self, cursor: 'sqlite3.Cursor', error_message: str) -> Iterator[tuple]:
+        try:
+            yield # where fetch_rows stops
+
+            rows = cursor.fetchmany(self.db.fetch_size)
+            while len(rows) > 0:
+                yield from rows
+                rows = cursor.fetchmany(self.db.fetch_size)
+        except GeneratorExit: # raised when the iterator is dropped before the end which is not an error
+            raise
+        except:
+            self.db.handle_error(error_message)
+        finally:
+            self.db.release_cursor(cursor)
+
+    # returns (year, week, num_of_flights) for every week that has a flight, latest first
+    # the counts are kept up to date by triggers on flights (see FlightCountsTable.py)
+    def get_flights_per_week(self) -> list[tuple]:
+        return list(self.iterate_flights_per_week())
+
+    def iterate_flights_per_week(self) -> Iterator[tuple]:
+        return self.fetch_rows(
+            """
+                SELECT year, week, num_of_flights
+                FROM flights_per_week
+                ORDER BY year DESC, week DESC;
+            """,
+            (),
+            "Unable to get number of flights per week from database"
+        )
+
+    # returns (year, month, num_of_flights) for every month that has a flight to destination, latest first
+    def get_flights_per_month(self, destination: str) -> list[tuple]:
+        return list(self.iterate_flights_per_month(destination))
+
+    def iterate_flights_per_month(self, destination: str) -> Iterator[tuple]:
+        return self.fetch_rows(
+            """
+                SELECT year, month, num_of_flights
+                FROM flights_per_month
+                WHERE destination = ?
+                ORDER BY year DESC, month DESC;
+            """,
+            (destination,),
+            "Unable to get number of flights to a destination per month from database"
+        )
+
+    # returns (day_of_week, num_of_customers) where day_of_week is 0 for sunday, 1 for monday, etc...
+    def get_customers_per_day_of_week(self) -> list[tuple]:
+        return list(self.iterate_customers_per_day_of_week())
+
+    def iterate_customers_per_day_of_week(self) -> Iterator[tuple]:
+        # the day of the week and the passenger count are stored on each flight so this only reads the flights_boarding_weekday index
+        return self.fetch_rows(
+            """
+                SELECT boarding_weekday as day_of_week, SUM(passenger_count) as num_of_customers
+                FROM flights
+                GROUP BY day_of_week
+                ORDER BY num_of_customers DESC;
+            """,
+            (),
+            "Unable to get data to rank days of the week"
+        )
+
+    # returns the total number of seconds the pilot has spent in the air on past flights
+    # returns None if they have not been on a flight in the past
+    def get_pilot_air_time(self, pilot_id: int) -> int | None:
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT SUM(arrival_time - departure_time) as seconds
+                        FROM flights
+                        JOIN flight_pilots ON flights.flight_id = flight_pilots.flight_id
+                        WHERE pilot_id = ? AND arrival_time <= unixepoch(date('now'));
+                    """,
+                    (pilot_id,)
+                )
+                seconds = cursor.fetchone()
+        except:
+            self.db.handle_error("Unable to get pilot's total air time from database")
+        else:
+            return None if seconds is None else seconds[0]
+
+    # returns (day_of_week, num_of_flights) for the pilot
+    def get_pilot_flights_per_day_of_week(self, pilot_id: int) -> list[tuple]:
+        return list(self.iterate_pilot_flights_per_day_of_week(pilot_id))
+
+    def iterate_pilot_flights_per_day_of_week(self, pilot_id: int) -> Iterator[tuple]:
+        return self.fetch_rows(
+            """
+                SELECT boarding_weekday as day_of_week, COUNT(flight_pilots.flight_id) as num_of_flights
+                FROM flights
+                JOIN flight_pilots ON flights.flight_id = flight_pilots.flight_id
+                WHERE pilot_id = ?
+                GROUP BY day_of_week
+                ORDER BY num_of_flights DESC;
+            """,
+            (pilot_id,),
+            "Unable to get pilot's days of the week from the database"
+        )
+
+    # returns (destination, num_of_passengers) ordered by the most passengers
+    def get_destination_popularity(self) -> list[tuple]:
+        return list(self.iterate_destination_popularity())
+
+    def iterate_destination_popularity(self) -> Iterator[tuple]:
+        return self.fetch_rows(
+            """
+                SELECT destination, COUNT(customer_id) AS num_of_passengers
+                FROM flights
+                LEFT JOIN flight_passengers ON flights.flight_id = flight_passengers.flight_id
+                GROUP BY destination
+                ORDER BY num_of_passengers DESC;
+            """,
+            (),
+            "Unable to get destination popularity from database"
+        )
+
+    # returns (flight_id, aircraft_id, airport_name, terminal_name, boarding_time, destination, num_of_passengers, max_passengers)
+    # for the limit upcoming flights with the highest percentage of used up seats, fullest first. every upcoming flight is returned if limit is -1
+    def get_upcoming_flights_by_used_seats(self, limit: int = -1) -> list[tuple]:
+        return list(self.iterate_upcoming_flights_by_used_seats(limit))
+
+    def iterate_upcoming_flights_by_used_seats(self, limit: int = -1) -> Iterator[tuple]:
+        # the percentage is the load factor stored on each flight so the flights can be read in order from its index
+        # and sqlite can stop after limit flights instead of sorting every upcoming flight
+        return self.fetch_rows(
+            """
+                SELECT flights.flight_id, flights.aircraft_id, airports.name, terminals.name, datetime(flights.boarding_time, 'unixepoch'), destination, passenger_count, aircrafts.max_passengers
+                FROM flights
+                JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
+                JOIN terminals ON flights.terminal_id = terminals.terminal_id
+                JOIN airports ON terminals.airport_id = airports.airport_id
+                WHERE boarding_time >= unixepoch(date('now'))
+                ORDER BY load_factor DESC
+                LIMIT ?;
+            """,
+            (limit,),
+            "Unable to get percentage of used up seats from database"
+        )
+
+    # returns (pilot_id, first_name, last_name, num_of_flights) ordered by the most flights
+    def get_pilots_by_flights(self) -> list[tuple]:
+        return list(self.iterate_pilots_by_flights())
+
+    def iterate_pilots_by_flights(self) -> Iterator[tuple]:
+        # counting with a subquery searches the pilot_id index once per pilot instead of scanning every flight pilot
+        return self.fetch_rows(
+            """
+                SELECT pilot_id, first_name, last_name, (
+                    SELECT COUNT(flight_id)
+                    FROM flight_pilots
+                    WHERE flight_pilots.pilot_id = pilots.pilot_id
+                ) AS num_of_flights
+                FROM pilots
+                ORDER BY num_of_flights DESC;
+            """,
+            (),
+            "Unable to rank pilots based on their number of flights"
+        )
+
+    # returns (customer_id, first_name, last_name, num_of_flights) ordered by the most flights
+    def get_customers_by_flights(self) -> list[tuple]:
+        return list(self.iterate_customers_by_flights())
+
+    def iterate_customers_by_flights(self) -> Iterator[tuple]:
+        return self.fetch_rows(
+            """
+                SELECT customer_id, first_name, last_name, (
+                    SELECT COUNT(flight_id)
+                    FROM flight_passengers
+                    WHERE flight_passengers.customer_id = customers.customer_id
+                ) AS num_of_flights
+                FROM customers
+                ORDER BY num_of_flights DESC;
+            """,
+            (),
+            "Unable to rank customers based on their number of flights"
+        )
+
+    # returns (flight_id, destination, max_passengers, num_of_passengers) for the flight
+    # returns None if the flight does not exist
+    def get_flight_passenger_count(self, flight_id: int) -> tuple | None:
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT flights.flight_id, flights.destination, max_passengers, passenger_count
+                        FROM flights
+                        JOIN aircrafts ON flights.aircraft_id = aircrafts.aircraft_id
+                        WHERE flights.flight_id = ?;
+                    """,
+                    (flight_id,)
+                )
+                row = cursor.fetchone()
+        except:
+            self.db.handle_error("Unable to get number of passengers on flight")
+        else:
+            return row
+
+    # returns (flight_id, destination, num_of_pilots) for the flight
+    # flight_id and destination are None if the flight does not exist
+    def get_flight_pilot_count(self, flight_id: int) -> tuple:
+        try:
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                        SELECT flights.flight_id, flights.destination, COUNT(flight_pilots.pilot_id) AS num_of_pilots
+                        FROM flights
+                        LEFT JOIN flight_pilots ON flights.flight_id = flight_pilots.flight_id
+                        WHERE flights.flight_id = ?;
+                    """,
+                    (flight_id,)
+                )
+                row = cursor.fetchone()
+        except:
+            self.db.handle_error("Unable to get number of pilots on flight")
+        else:
+            return row
@@ -1,37 +1,29 @@
-class Terminal:
-    def __init__(
-        self, 
-        terminal_id: int,
-        airport_id: int,
-        name: str
-    ) -> None:
-        self.terminal_id = terminal_id
-        self.airport_id = airport_id
-        self.name = name
-    
-    def get_column_names(self) -> list[str]:
-        return ["Terminal ID", "Airport ID", "Name"]
-        
+from typing import NamedTuple
+
+class Terminal(NamedTuple):
+    terminal_id: int
+    airport_id: int
+    name: str
+
+    column_names = ("Terminal ID", "Airport ID", "Name")
+
+    def get_column_names(self) -> tuple[str, ...]:
+        return self.column_names
+
     def to_row(self) -> list[str]:
         return [str(self.terminal_id), str(self.airport_id), self.name]
 
-class ExtendedTerminal:
-    def __init__(
-        self, 
-        terminal_id: int,
-        terminal_name: str,
-        airport_id: int,
-        airport_name: str,
-        airport_address: str
-    ) -> None:
-        self.terminal_id = terminal_id
-        self.terminal_name = terminal_name
-        self.airport_id = airport_id
-        self.airport_name = airport_name
-        self.airport_address = airport_address
-    
-    def get_column_names(self) -> list[str]:
-        return ["Terminal ID", "Terminal Name", "Airport ID", "Airport Name", "Airport Address"]
-        
+class ExtendedTerminal(NamedTuple):
+    terminal_id: int
+    terminal_name: str
+    airport_id: int
+    airport_name: str
+    airport_address: str
+
+    column_names = ("Terminal ID", "Terminal Name", "Airport ID", "Airport Name", "Airport Address")
+
+    def get_column_names(self) -> tuple[str, ...]:
+        return self.column_names
+
     def to_row(self) -> list[str]:
-        return [str(self.terminal_id), self.terminal_name, str(self.airport_id), self.airport_name, self.airport_address]
+        return [str(self.terminal_id), self.terminal_name, str(self.airport_id), self.airport_name, self.airport_address]
\ No newline at end of file
@@ -1,11 +1,25 @@
 from typing import Iterable
 from database.terminal.Terminal import Terminal, ExtendedTerminal
-from database.Table import Table, Column
+from database.Table import Table, Column, InsertSummary, DeleteResult
 from cli.TextTable import TextTable
 
 class TerminalsTable(Table):
     def __init__(self, database):
         super().__init__(database)
+
+        # used by get_page to page through the terminals. see Table
+        self.name = "terminals"
+        self.key = "terminals.terminal_id"
+        # the airport's name is renamed so filtering by the terminal's name is not ambiguous
+        self.select = """
+            SELECT terminal_id, terminals.name, airports.airport_id, airports.airport_name, airports.address
+            FROM terminals
+            JOIN (SELECT airport_id, name AS airport_name, address FROM airports) AS airports ON terminals.airport_id = airports.airport_id
+        """
+        self.row_type = ExtendedTerminal
+
+        # the tables that ON DELETE CASCADE deletes from when terminals are deleted
+        self.cascades = [("flights", "terminal_id")]
         
         self.columns = { 
             "Terminal ID": Column(
@@ -20,6 +34,7 @@ class TerminalsTable(Table):
                 insert_prompt="What's the ID of the airport where this terminal is located?",
                 update_prompt="What's the ID of the new airport where this terminal is located?",
                 is_valid=lambda x : x.isdigit() and self.db.airports.exists(x),
+                references="airports",
                 validation_prompt="A terminal's airport ID must be a non negative integer and must exist in the database"
             ),
             "Name": Column(
@@ -32,6 +47,10 @@ class TerminalsTable(Table):
             )
         }
 
+        self.indexes = {
+            "terminals_airport_id": "terminals (airport_id)" # also used by ON DELETE CASCADE from airports
+        }
+
     def create_table(self) -> None:
         try:
             self.db.cursor.execute(
@@ -45,45 +64,50 @@ class TerminalsTable(Table):
                     );
                 """
             )
-            self.db.connection.commit()
         except:
             self.db.handle_error("Unable to create terminals table")
 
     # values = (airport_id, name)
     def insert(self, values: tuple[str]) -> Terminal:
         try:
-            self.db.cursor.execute(
-                """
-                    INSERT INTO terminals 
-                    VALUES (NULL, ?, ?)
-                    RETURNING terminal_id;
-                """,
-                values
-            )
-
-            terminal = Terminal(self.db.cursor.fetchone()[0], *values) 
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    """
+                        INSERT INTO terminals 
+                        VALUES (NULL, ?, ?)
+                        RETURNING *;
+                    """,
+                    values
+                )
 
-            self.db.connection.commit()
+                terminal = Terminal(*self.db.cursor.fetchone()) 
+                self.ids.add_existing([terminal.terminal_id])
         except:
             self.db.handle_error("Unable to insert into terminals table")
         else:
             return terminal
 
+    # inserts many terminals at once. each row is (airport_id, name)
+    # returns an InsertSummary with the number of inserted terminals and their ids instead of creating each one
+    def insert_many(self, rows: Iterable[tuple]) -> InsertSummary:
+        return self.insert_rows("INSERT INTO terminals VALUES (NULL, ?, ?);", rows, "Unable to insert into terminals table")
+
     def update(self, terminal_id: int, column_name: str, new_value: str) -> Terminal:
-        try:
-            self.db.cursor.execute(
-                f"""
-                    UPDATE terminals 
-                    SET {column_name} = ?
-                    WHERE terminal_id = ?
-                    RETURNING *;
-                """,
-                (new_value, terminal_id)
-            )
+        column_name = column_name.split(".")[-1] # the column can't have the table's name in front of it in SET. e.g. terminals.airport_id
 
-            terminal = Terminal(*self.db.cursor.fetchone())  
+        try:
+            with self.db.transaction():
+                self.db.cursor.execute(
+                    f"""
+                        UPDATE terminals 
+                        SET {column_name} = ?
+                        WHERE terminal_id = ?
+                        RETURNING *;
+                    """,
+                    (new_value, terminal_id)
+                )
 
-            self.db.connection.commit()
+                terminal = Terminal(*self.db.cursor.fetchone())  
         except:
             self.db.handle_error("Unable to update terminals table")
         else:
@@ -91,70 +115,64 @@ class TerminalsTable(Table):
 
     # returns an ExtendedTerminal which is a Terminal that also contains information about the airport
     def get_all(self) -> Iterable[ExtendedTerminal]: 
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            cursor.execute(
                 """
                     SELECT terminal_id, terminals.name, airports.airport_id, airports.name, airports.address
                     FROM terminals
                     JOIN airports ON terminals.airport_id = airports.airport_id;
                 """
             )
-            rows = self.db.cursor.fetchall()
         except: 
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get all rows in terminals table")
         else:
-            return map(lambda row : ExtendedTerminal(*row), rows) 
+            return self.fetch_rows(cursor, ExtendedTerminal) 
 
     def get(self, column_name: str, value: str) -> Iterable[ExtendedTerminal]:
+        cursor = self.db.get_read_cursor()
         try:
-            self.db.cursor.execute(
+            # the terminals are filtered before the join as column_name can be ambiguous. e.g. both tables have a name
+            cursor.execute(
                 f"""
                     SELECT terminal_id, terminals.name, airports.airport_id, airports.name, airports.address
-                    FROM terminals
-                    JOIN airports ON terminals.airport_id = airports.airport_id
-                    WHERE {column_name} = ?;
+                    FROM (SELECT * FROM terminals WHERE {column_name} = ?) AS terminals
+                    JOIN airports ON terminals.airport_id = airports.airport_id;
                 """,
                 (value,)
             )
-            rows = self.db.cursor.fetchall()
         except:
+            self.db.release_cursor(cursor)
             self.db.handle_error("Unable to get rows based on a column in terminals table")
         else:
-            return map(lambda row : ExtendedTerminal(*row), rows) 
+            return self.fetch_rows(cursor, ExtendedTerminal) 
 
-    def delete_and_return(self, column_name: str, value: str) -> Iterable[ExtendedTerminal]:
+    # deletes all terminals from the table whose column_name value equals value
+    # returns the deleted terminals and the number of flights and their bookings deleted with them by ON DELETE CASCADE
+    def delete_and_return(self, column_name: str, value: str) -> DeleteResult:
         try:
-            self.db.cursor.execute(
-                f"""
-                    DELETE FROM terminals
-                    WHERE {column_name} = ?;
-                """,
-                (value,)
-            )
+            with self.db.transaction():
+                # the cascaded rows have to be counted before they are deleted
+                cascaded_counts = self.count_cascaded_rows(column_name, value)
 
-            self.db.connection.commit()
+                self.db.cursor.execute(
+                    f"""
+                        DELETE FROM terminals
+                        WHERE {column_name} = ?
+                        RETURNING *;
+                    """,
+                    (value,)
+                )
+                deleted_rows = [Terminal._make(row) for row in self.db.cursor.fetchall()]
 
-            self.db.cursor.execute("SELECT * FROM terminals;")
-            remaining_rows = self.db.cursor.fetchall()
+                # the other table classes don't see the rows deleted by ON DELETE CASCADE so their caches are cleared
+                if len(deleted_rows) > 0:
+                    self.db.clear_caches()
         except:
             self.db.handle_error("Unable to delete from terminals table")
         else:
-            return map(lambda row : Terminal(*row), remaining_rows) 
+            return DeleteResult(deleted_rows, cascaded_counts)
 
     def exists(self, terminal_id: int) -> bool:
-        try:
-            self.db.cursor.execute(
-                """
-                    SELECT EXISTS(
-                        SELECT 1 
-                        FROM terminals 
-                        WHERE terminal_id = ?
-                    );
-                """,
-                (terminal_id,)
-            )
-            exists = self.db.cursor.fetchone()[0]
-        except:
-            self.db.handle_error("Unable to determine if terminal exists")
-        else:
-            return False if exists == 0 else True
\ No newline at end of file
+        return len(self.exists_many([terminal_id])) > 0
\ No newline at end of file
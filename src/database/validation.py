@@ -1,27 +1,61 @@
-import datetime
+from functools import lru_cache
+from typing import Callable, Iterable
 
-# determine if a date is in the format YYYY-MM-DD 
-# also checks that DD is valid for MM. e.g. DD cannot be 30 if MM is 2. 
-def validate_date(date: str) -> bool:
-    if len(date) != 10:
+# the dates and times are checked by looking at the characters in each position instead of parsing them with
+# datetime.strptime, which builds a regular expression and checks the locale for every value
+# the same dates and times are often checked many times (e.g. every flight in a bulk load departing on the same day)
+# so the results of the most recent ones are cached
+
+# the number of days in each month of a year that isn't a leap year as they are written in a date. January is index 1
+days_in_month = ("00", "31", "28", "31", "30", "31", "30", "31", "31", "30", "31", "30", "31")
+
+# determine if the first 10 characters of value are a date in the format YYYY-MM-DD that exists. e.g. 2023-02-29 does not
+# value must only have ascii characters as str.isdigit is also True for other digits e.g. superscripts
+# the parts of the date are compared as strings where they can be as two digit strings compare in the same order as their numbers
+def is_date(value: str) -> bool:
+    if value[4] != "-" or value[7] != "-":
         return False
 
-    try:
-        datetime.date.fromisoformat(date)
-    except ValueError:
+    (year, month, day) = (value[0:4], value[5:7], value[8:10])
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
         return False
-    else:
-        return True
-        
+
+    if year == "0000" or not "01" <= month <= "12" or day == "00":
+        return False
+
+    if month == "02":
+        year = int(year)
+        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            return day <= "29"
+
+    return day <= days_in_month[int(month)]
+
+# determine if a date is in the format YYYY-MM-DD
+# also checks that DD is valid for MM. e.g. DD cannot be 30 if MM is 2.
+@lru_cache(maxsize=4096)
+def validate_date(date: str) -> bool:
+    return len(date) == 10 and date.isascii() and is_date(date)
+
 # determine if a date and time is in the format YYYY-MM-DD HH:MM:SS
-# also checks that 0 <= HH < 60 etc...
+# also checks that 0 <= HH < 24 etc...
+@lru_cache(maxsize=4096)
 def validate_date_time(date_time: str) -> bool:
-    if len(date_time) != 19:
+    if len(date_time) != 19 or not date_time.isascii() or not is_date(date_time):
         return False
 
-    try:
-        datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S")
-    except ValueError:
+    if date_time[10] != " " or date_time[13] != ":" or date_time[16] != ":":
         return False
-    else:
-        return True
\ No newline at end of file
+
+    (hour, minute, second) = (date_time[11:13], date_time[14:16], date_time[17:19])
+    if not (hour.isdigit() and minute.isdigit() and second.isdigit()):
+        return False
+
+    return hour < "24" and minute < "60" and second < "60"
+
+# returns whether each value is valid with is_valid (e.g. validate_date or Column.is_valid) in the same order
+# used to check a whole column at once (e.g. by Importer). each different value is only checked once
+# so a column with many repeated values (e.g. a flight's destination) is checked much faster
+def validate_many(values: Iterable[str], is_valid: Callable[[str], bool]) -> list[bool]:
+    values = list(values)
+    results = {value: is_valid(value) for value in set(values)}
+    return [results[value] for value in values]
\ No newline at end of file
@@ -1,15 +1,27 @@
+import os
+import sys
 from database.Database import Database
 from cli.menus.MainMenu import MainMenu
+from cli.CommandLine import CommandLine
 
 # initalise database
-db = Database("airline")
+# the connection profile can be changed per deployment with the AIRLINE_DB_PROFILE environment variable
+# see profiles in database/Database.py for the available profiles
+# a command (e.g. python main.py search flights) is run without the menus. see cli/CommandLine.py
+# errors in a command are printed and the command fails instead of exiting straight away so a batch can be rolled back
+is_command = len(sys.argv) > 1
+db = Database("airline", os.environ.get("AIRLINE_DB_PROFILE", "interactive"), exit_on_error=not is_command)
 db.connect()
 db.create_tables()
 
-# initalise main menu
-main_menu = MainMenu(db)
-main_menu.start()
+exit_code = 0
+if is_command:
+    exit_code = CommandLine(db).run(sys.argv[1:])
+else:
+    # initalise main menu
+    main_menu = MainMenu(db)
+    main_menu.start()
 
 # connection is closed when program ends so we dont have any opened connections not being used
-db.cursor.close()
-db.connection.close()
\ No newline at end of file
+db.close()
+sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,25 @@
+import os
+from database.Database import Database
+from web.Server import Server
+
+# serves the tables and statistics as JSON over HTTP for programs to use instead of the menus in main.py
+# see web/RequestHandler.py for the urls. each request is handled on its own thread and reads through its own connection
+# the address can be changed with the AIRLINE_HTTP_HOST and AIRLINE_HTTP_PORT environment variables
+host = os.environ.get("AIRLINE_HTTP_HOST", "127.0.0.1")
+port = int(os.environ.get("AIRLINE_HTTP_PORT", "8000"))
+
+# errors are sent back in the response instead of ending the server
+db = Database("airline", os.environ.get("AIRLINE_DB_PROFILE", "interactive"), num_of_readers=16, exit_on_error=False)
+db.connect()
+db.create_tables()
+
+server = Server((host, port), db)
+
+print(f"Serving the airline database on http://{host}:{port}")
+try:
+    server.serve_forever()
+except KeyboardInterrupt:
+    pass
+
+server.server_close()
+db.close()
\ No newline at end of file
@@ -0,0 +1,6 @@
+# raised by RequestHandler to respond with an error. status is the HTTP status code. e.g. 404
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
\ No newline at end of file
@@ -0,0 +1,368 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from typing import Iterable
+from urllib.parse import urlsplit, parse_qsl
+from database.DatabaseError import DatabaseError
+from database.statistics.Statistics import named_statistics, single_row_statistics
+from web.HttpError import HttpError
+
+# the tables that rows can be inserted into, updated, searched and deleted from. the same tables as the menus
+tables = ["pilots", "customers", "aircrafts", "airports", "terminals", "flights"]
+
+# responds to a request to the server started by server.py. each request is handled on its own thread
+# the bodies of requests and responses are JSON. rows are objects with the names of their columns as keys
+# lists of rows are streamed as JSON lines (one row per line) in chunks so a large table is never all in memory
+#
+#   GET    /<table>                                     every row. ?column=x&value=y only gets the rows where x = y
+#   GET    /<table>/<id>                                one row
+#   POST   /<table>                                     inserts a row. the body is an object of the settable columns
+#                                                       or a list of them to insert many rows at once
+#   PATCH  /<table>/<id>                                updates the columns in the body
+#   DELETE /<table>/<id> or /<table>?column=x&value=y   deletes rows and returns them with the counts of cascaded rows
+#
+#   GET    /flights/<id>/seats                          the free seats on a flight. ?adjacent=n finds n seats next to each other
+#   GET    /flights/<id>/passengers                     the customers on a flight
+#   POST   /flights/<id>/passengers                     assigns a customer a seat. the body is {"customer_id": x, "seat_number": y}
+#                                                       or a list of them. without seat_number they get the next available seat
+#   PATCH  /flights/<id>/passengers/<customer_id>       moves a customer to the seat in the body or the next available seat
+#   DELETE /flights/<id>/passengers/<customer_id>       removes a customer from a flight
+#   GET    /flights/<id>/pilots                         the pilots on a flight
+#   POST   /flights/<id>/pilots                         adds a pilot to a flight. the body is {"pilot_id": x} or a list of them
+#   DELETE /flights/<id>/pilots/<pilot_id>              removes a pilot from a flight
+#
+#   GET    /statistics/<name>                           a statistic from the statistics menu. see named_statistics in Statistics.py
+class RequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 is needed for chunked responses and keeps the connection open between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.respond("GET")
+
+    def do_POST(self) -> None:
+        self.respond("POST")
+
+    def do_PATCH(self) -> None:
+        self.respond("PATCH")
+
+    def do_DELETE(self) -> None:
+        self.respond("DELETE")
+
+    def respond(self, method: str) -> None:
+        self.db = self.server.db
+
+        url = urlsplit(self.path)
+        path = [part for part in url.path.split("/") if part != ""]
+        query = dict(parse_qsl(url.query))
+
+        try:
+            body = self.read_body()
+            self.route(method, path, query, body)
+        except HttpError as error:
+            self.send_json(error.status, {"error": error.message})
+        except DatabaseError as error:
+            self.send_json(500, {"error": str(error)})
+
+    def route(self, method: str, path: list[str], query: dict[str, str], body) -> None:
+        match (method, path):
+            case ("GET", ["flights", flight_id, "seats"]):
+                self.get_seats(self.get_flight_id(flight_id), query)
+            case ("GET", ["flights", flight_id, "passengers"]):
+                self.send_rows(self.db.flight_passengers.get(self.get_flight_id(flight_id)))
+            case ("POST", ["flights", flight_id, "passengers"]):
+                self.send_batch(self.assign_seat, self.get_flight_id(flight_id), body)
+            case ("PATCH", ["flights", flight_id, "passengers", customer_id]):
+                self.change_seat(self.get_flight_id(flight_id), customer_id, body)
+            case ("DELETE", ["flights", flight_id, "passengers", customer_id]):
+                self.remove_passenger(self.get_flight_id(flight_id), customer_id)
+            case ("GET", ["flights", flight_id, "pilots"]):
+                self.send_rows(self.db.flight_pilots.get(self.get_flight_id(flight_id)))
+            case ("POST", ["flights", flight_id, "pilots"]):
+                self.send_batch(self.add_pilot, self.get_flight_id(flight_id), body)
+            case ("DELETE", ["flights", flight_id, "pilots", pilot_id]):
+                self.remove_pilot(self.get_flight_id(flight_id), pilot_id)
+            case ("GET", ["statistics", statistic_name]):
+                self.get_statistic(statistic_name, query)
+            case ("GET", [table_name]) if table_name in tables:
+                self.get_rows(getattr(self.db, table_name), query)
+            case ("GET", [table_name, id]) if table_name in tables:
+                self.get_row(getattr(self.db, table_name), id)
+            case ("POST", [table_name]) if table_name in tables:
+                self.insert(getattr(self.db, table_name), body)
+            case ("PATCH", [table_name, id]) if table_name in tables:
+                self.update(getattr(self.db, table_name), id, body)
+            case ("DELETE", [table_name]) if table_name in tables:
+                table = getattr(self.db, table_name)
+                column = self.get_search_column(table, query)
+                if column is None:
+                    raise HttpError(400, "Deleting rows needs a column and a value")
+                self.delete(table, column, query["value"])
+            case ("DELETE", [table_name, id]) if table_name in tables:
+                table = getattr(self.db, table_name)
+                self.delete(table, self.get_key_column(table), id)
+            case _:
+                self.not_found("Not found")
+
+    def not_found(self, message: str) -> None:
+        raise HttpError(404, message)
+
+    # returns the JSON in the body of the request or None if it has no body
+    def read_body(self):
+        length = self.headers.get("Content-Length", "0").strip()
+        if not length.isascii() or not length.isdigit():
+            # the end of the body can't be found so the connection is closed after the response instead of reading the next request
+            self.close_connection = True
+            raise HttpError(400, "Content-Length must be a non negative integer")
+
+        length = int(length)
+        if length == 0:
+            return None
+
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise HttpError(400, "The body must be JSON")
+
+    def send_json(self, status: int, value) -> None:
+        body = json.dumps(value).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # streams rows (named tuples or dictionaries) as one JSON object per line
+    # the lines are sent in chunks of db.fetch_size rows as they are fetched from the database
+    # the status has already been sent if the database fails part of the way through so an {"error": ...} line is sent instead
+    def send_rows(self, rows: Iterable) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        lines = []
+        try:
+            for row in rows:
+                lines.append(json.dumps(row if isinstance(row, dict) else row._asdict()))
+                if len(lines) == self.db.fetch_size:
+                    self.send_chunk(lines)
+                    lines = []
+        except DatabaseError as error:
+            lines.append(json.dumps({"error": str(error)}))
+        finally:
+            # releases the reader of the rows straight away if the client stopped reading part way through
+            if hasattr(rows, "close"):
+                rows.close()
+
+        self.send_chunk(lines)
+        self.wfile.write(b"0\r\n\r\n") # an empty chunk ends the response
+
+    def send_chunk(self, lines: list[str]) -> None:
+        if len(lines) == 0:
+            return
+
+        data = ("\n".join(lines) + "\n").encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    # responds with respond_to(flight_id, item) for the object in body or a list of them for a list of objects
+    # a list is done in one transaction. an item that can't be done is an {"error": ...} in the list instead
+    def send_batch(self, respond_to, flight_id: int, body) -> None:
+        if isinstance(body, list):
+            results = []
+            with self.db.transaction():
+                for item in body:
+                    try:
+                        results.append(respond_to(flight_id, item))
+                    except HttpError as error:
+                        results.append({"error": error.message})
+
+            self.send_json(200, results)
+        else:
+            self.send_json(201, respond_to(flight_id, body))
+
+    # the first column of every table is its id
+    def get_key_column(self, table: 'Table') -> 'Column':
+        return next(iter(table.columns.values()))
+
+    # returns the Column named by the column in the query string or None if there isn't one
+    def get_search_column(self, table: 'Table', query: dict[str, str]) -> 'Column | None':
+        if "column" not in query:
+            return None
+
+        column = table.get_column(query["column"])
+        if column is None:
+            raise HttpError(400, f"{table.name} has no column named {query['column']}")
+        if "value" not in query:
+            raise HttpError(400, "A column needs a value")
+        if not column.is_valid(query["value"]):
+            raise HttpError(400, column.validation_prompt)
+
+        return column
+
+    def get_flight_id(self, flight_id: str) -> int:
+        if not flight_id.isdigit() or not self.db.flights.exists(flight_id):
+            raise HttpError(404, "That flight does not exist")
+
+        return int(flight_id)
+
+    # returns the value in item named name as a string, which is what the validation of the Columns expects
+    def get_value(self, item, name: str, is_required: bool = True) -> str | None:
+        if not isinstance(item, dict):
+            raise HttpError(400, "The body must be an object or a list of objects")
+        if name not in item or item[name] is None:
+            if is_required:
+                raise HttpError(400, f"Missing {name}")
+            return None
+
+        return str(item[name])
+
+    def get_rows(self, table: 'Table', query: dict[str, str]) -> None:
+        column = self.get_search_column(table, query)
+        self.send_rows(table.get_all() if column is None else table.get(column.name, query["value"]))
+
+    def get_row(self, table: 'Table', id: str) -> None:
+        row = next(table.get(self.get_key_column(table).name, id), None) if id.isdigit() else None
+        if row is None:
+            self.not_found(f"No row in {table.name} has that id")
+
+        self.send_json(200, row._asdict())
+
+    # returns the values in item in the order that the table's insert takes them. see Table.get_insert_values
+    def get_insert_values(self, table: 'Table', item) -> tuple[str]:
+        if not isinstance(item, dict):
+            raise HttpError(400, "The body must be an object or a list of objects")
+
+        try:
+            return table.get_insert_values(item)
+        except ValueError as error:
+            raise HttpError(400, str(error))
+
+    def insert(self, table: 'Table', body) -> None:
+        if isinstance(body, list):
+            # every row is checked before any are inserted so a bad row doesn't insert half of them
+            rows = [self.get_insert_values(table, item) for item in body]
+            summary = table.insert_many(rows)
+            self.send_json(201, {"count": summary.count, "first_id": summary.first_id, "last_id": summary.last_id})
+        else:
+            self.send_json(201, table.insert(self.get_insert_values(table, body))._asdict())
+
+    def update(self, table: 'Table', id: str, body) -> None:
+        if not isinstance(body, dict) or len(body) == 0:
+            raise HttpError(400, "The body must be an object of the columns to update")
+        if not id.isdigit() or not table.exists(id):
+            self.not_found(f"No row in {table.name} has that id")
+
+        changes = []
+        for (name, value) in body.items():
+            column = table.get_column(name)
+            if column is None or not column.settable:
+                raise HttpError(400, f"{name} can't be updated")
+
+            value = self.get_value(body, name)
+            if not column.is_valid(value):
+                raise HttpError(400, f"Invalid {name}. {column.validation_prompt}")
+            changes.append((column, value))
+
+        # every column is changed or none of them are
+        with self.db.transaction():
+            for (column, value) in changes:
+                row = table.update(id, column.name, value)
+
+        self.send_json(200, row._asdict())
+
+    def delete(self, table: 'Table', column: 'Column', value: str) -> None:
+        result = table.delete_and_return(column.name, value)
+        self.send_json(200, {"rows": [row._asdict() for row in result.rows], "cascaded_counts": result.cascaded_counts})
+
+    # returns the seat number in item or None for the next available seat
+    def get_seat_number(self, flight_id: int, item) -> int | None:
+        seat_number = self.get_value(item, "seat_number", is_required=False)
+        if seat_number is None:
+            return None
+
+        max_passengers = self.db.flight_passengers.get_max_passengers(flight_id)
+        if not seat_number.isdigit() or not 1 <= int(seat_number) <= max_passengers:
+            raise HttpError(400, f"Seat number must be an integer between 1 and {max_passengers} inclusive")
+
+        return int(seat_number)
+
+    def assign_seat(self, flight_id: int, item) -> dict:
+        customer_id = self.get_value(item, "customer_id")
+        if not customer_id.isdigit() or not self.db.customers.exists(customer_id):
+            raise HttpError(404, "That customer does not exist")
+        if self.db.flight_passengers.exists(flight_id, customer_id):
+            raise HttpError(409, "That customer is already on that flight")
+
+        seat_number = self.get_seat_number(flight_id, item)
+        flight_passenger = self.db.flight_passengers.assign_seat(flight_id, int(customer_id), seat_number)
+        if flight_passenger is None:
+            raise HttpError(409, "There are no more available seats on this flight" if seat_number is None else "That seat is taken")
+
+        return flight_passenger._asdict()
+
+    def change_seat(self, flight_id: int, customer_id: str, body) -> None:
+        if not self.db.flight_passengers.exists(flight_id, customer_id):
+            self.not_found("That customer is not on that flight")
+
+        seat_number = self.get_seat_number(flight_id, {} if body is None else body)
+        flight_passenger = self.db.flight_passengers.change_seat(flight_id, int(customer_id), seat_number)
+        if flight_passenger is None:
+            raise HttpError(409, "There are no more available seats on this flight" if seat_number is None else "That seat is taken")
+
+        self.send_json(200, flight_passenger._asdict())
+
+    def remove_passenger(self, flight_id: int, customer_id: str) -> None:
+        if not self.db.flight_passengers.exists(flight_id, customer_id):
+            self.not_found("That customer is not on that flight")
+
+        self.send_json(200, self.db.flight_passengers.delete_and_return(flight_id, int(customer_id)).rows[0]._asdict())
+
+    def add_pilot(self, flight_id: int, item) -> dict:
+        pilot_id = self.get_value(item, "pilot_id")
+        if not pilot_id.isdigit() or not self.db.pilots.exists(pilot_id):
+            raise HttpError(404, "That pilot does not exist")
+        if self.db.flight_pilots.exists(flight_id, pilot_id):
+            raise HttpError(409, "That pilot is already on that flight")
+
+        return self.db.flight_pilots.insert(flight_id, int(pilot_id))._asdict()
+
+    def remove_pilot(self, flight_id: int, pilot_id: str) -> None:
+        if not self.db.flight_pilots.exists(flight_id, pilot_id):
+            self.not_found("That pilot is not on that flight")
+
+        self.send_json(200, self.db.flight_pilots.delete_and_return(flight_id, int(pilot_id)).rows[0]._asdict())
+
+    def get_seats(self, flight_id: int, query: dict[str, str]) -> None:
+        seats = {
+            "flight_id": flight_id,
+            "max_passengers": self.db.flight_passengers.get_max_passengers(flight_id),
+            "num_of_free_seats": self.db.flight_passengers.get_num_of_free_seats(flight_id),
+            "next_available_seat": self.db.flight_passengers.get_next_available_seat(flight_id)
+        }
+
+        if "adjacent" in query:
+            if not query["adjacent"].isdigit() or int(query["adjacent"]) == 0:
+                raise HttpError(400, "adjacent must be a positive integer")
+            seats["adjacent_seats"] = self.db.flight_passengers.get_adjacent_available_seats(flight_id, int(query["adjacent"]))
+
+        self.send_json(200, seats)
+
+    def get_statistic(self, statistic_name: str, query: dict[str, str]) -> None:
+        if statistic_name not in named_statistics:
+            self.not_found("No statistic has that name")
+
+        # the rows of a statistic are sent as they are fetched in the same way as the rows of a table
+        try:
+            if statistic_name not in single_row_statistics:
+                rows = self.db.statistics.iterate_named_statistic(statistic_name, query)
+            else:
+                result = self.db.statistics.get_named_statistic(statistic_name, query)
+        except ValueError as error:
+            raise HttpError(400, str(error))
+
+        if statistic_name not in single_row_statistics:
+            self.send_rows(rows)
+        elif result is None:
+            self.not_found("Nothing found for that statistic")
+        else:
+            self.send_json(200, result)
\ No newline at end of file
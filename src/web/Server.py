@@ -0,0 +1,14 @@
+from http.server import ThreadingHTTPServer
+from web.RequestHandler import RequestHandler
+
+# an HTTP server that handles each request with a RequestHandler on its own thread
+# db is the Database that every RequestHandler uses. it is safe to use from many threads (see Database.transaction)
+class Server(ThreadingHTTPServer):
+    daemon_threads = True # requests that are still being handled don't stop the server from closing
+
+    # the number of connections that can wait to be accepted. the default of 5 resets connections when lots of clients connect at once
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], db: 'Database'):
+        super().__init__(address, RequestHandler)
+        self.db = db
\ No newline at end of file
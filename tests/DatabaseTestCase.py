@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from database.Database import Database
+
+# a test case with a new empty database in a temporary directory for each test
+# errors raise a DatabaseError instead of exiting so a test can check for them
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.directory.name, "airline"), exit_on_error=False)
+        self.db.connect()
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    # inserts an airport, terminal, aircraft with max_passengers seats and a flight from that terminal on that aircraft
+    # the flight boards at 09:00 days_from_now days after today so it is always upcoming. returns the id of the flight
+    def insert_flight(self, max_passengers: int = 4, destination: str = "Malaga", days_from_now: int = 30) -> int:
+        airport = self.db.airports.insert(("Heathrow", "Longford, Hounslow"))
+        terminal = self.db.terminals.insert((str(airport.airport_id), "Terminal 1"))
+        aircraft = self.db.aircrafts.insert(("Boeing 747", "1", str(max_passengers)))
+
+        flight_date = self.get_date(days_from_now)
+        times = (f"{flight_date} 09:00:00", f"{flight_date} 10:00:00", f"{flight_date} 12:00:00")
+        return self.db.flights.insert((str(aircraft.aircraft_id), str(terminal.terminal_id), destination, *times)).flight_id
+
+    # the date days_from_now days after today as YYYY-MM-DD
+    def get_date(self, days_from_now: int) -> str:
+        return (date.today() + timedelta(days=days_from_now)).isoformat()
+
+    # inserts num_of_customers customers and returns their ids
+    def insert_customers(self, num_of_customers: int) -> list[int]:
+        return [self.db.customers.insert(("John", f"Smith {n}", "1990-01-01", "1 High Street", "07123456789")).customer_id for n in range(num_of_customers)]
\ No newline at end of file
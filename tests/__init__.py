@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the modules of the program import each other from the src directory (e.g. from database.Database import Database)
+# as main.py is run from there so it is added to the path before the tests import them
+# run from the root of the repository with: python -m unittest discover -s tests -t .
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
\ No newline at end of file
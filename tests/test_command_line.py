@@ -0,0 +1,35 @@
+import io
+import json
+import os
+from contextlib import redirect_stdout, redirect_stderr
+from cli.CommandLine import CommandLine
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestBatch(DatabaseTestCase):
+    # runs the lines as a batch and returns (exit code, stdout, stderr)
+    def run_batch(self, lines: list[str]) -> (int, str, str):
+        file_name = os.path.join(self.directory.name, "batch.txt")
+        with open(file_name, "w") as file:
+            file.write("\n".join(lines))
+
+        (stdout, stderr) = (io.StringIO(), io.StringIO())
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = CommandLine(self.db).run(["batch", file_name])
+
+        return (exit_code, stdout.getvalue(), stderr.getvalue())
+
+    def test_output_is_written_once_the_batch_is_done(self):
+        insert = "insert customers first_name=John last_name=Smith date_of_birth=1990-01-01 home_address='1 High Street' phone_number=07123456789"
+        (exit_code, stdout, stderr) = self.run_batch([insert, "# a comment", "", "search customers"])
+
+        self.assertEqual((exit_code, stderr), (0, ""))
+        self.assertEqual([json.loads(line)["customer_id"] for line in stdout.splitlines()], [1, 1])
+
+    # nothing is printed for the lines before the one that failed as they were rolled back
+    def test_failed_batch_prints_nothing(self):
+        insert = "insert customers first_name=John last_name=Smith date_of_birth=1990-01-01 home_address='1 High Street' phone_number=07123456789"
+        (exit_code, stdout, stderr) = self.run_batch([insert, "insert customers first_name=John"])
+
+        self.assertEqual((exit_code, stdout), (1, ""))
+        self.assertRegex(stderr, r"Line 2 of \S+batch.txt: Missing last_name\. Nothing in the batch was done\n")
+        self.assertEqual(self.db.customers.count_rows(), 0)
\ No newline at end of file
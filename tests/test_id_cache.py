@@ -0,0 +1,27 @@
+from database.Database import Database
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestIdCache(DatabaseTestCase):
+    # another program using the same file (e.g. server.py while main.py is open)
+    def open_other_program(self) -> Database:
+        other_db = Database(self.db.db_name, exit_on_error=False)
+        other_db.connect()
+        self.addCleanup(other_db.close)
+        return other_db
+
+    def test_rows_inserted_by_another_program_are_found(self):
+        self.assertFalse(self.db.customers.exists(1))
+
+        self.open_other_program().customers.insert(("John", "Smith", "1990-01-01", "1 High Street", "07123456789"))
+
+        self.assertTrue(self.db.customers.exists(1))
+
+    def test_missing_ids_are_only_cached_inside_a_transaction(self):
+        self.db.customers.exists(1)
+        self.assertIsNone(self.db.customers.ids.get(1))
+
+        with self.db.transaction():
+            self.assertFalse(self.db.customers.exists(1))
+            self.assertFalse(self.db.customers.ids.get(1))
+
+        self.assertIsNone(self.db.customers.ids.get(1))
\ No newline at end of file
@@ -0,0 +1,109 @@
+import csv
+import gzip
+import json
+import os
+from database.bulk.Importer import Importer
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestImporter(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rejects_file_name = os.path.join(self.directory.name, "rejects.jsonl")
+
+    def write_json_lines(self, file_name: str, rows: list) -> str:
+        path = os.path.join(self.directory.name, file_name)
+        open_file = gzip.open if file_name.endswith(".gz") else open
+        with open_file(path, "wt") as file:
+            for row in rows:
+                file.write((row if isinstance(row, str) else json.dumps(row)) + "\n")
+
+        return path
+
+    # imports files (a table's name to the name of its file) and returns the summaries and the reason for each rejected row by its row number
+    def import_files(self, files: dict[str, str], batch_size: int = 2) -> tuple[dict, dict[str, dict[int, str]]]:
+        summaries = Importer(self.db, self.rejects_file_name, batch_size).import_files(files)
+
+        reasons = {}
+        if os.path.exists(self.rejects_file_name):
+            with open(self.rejects_file_name) as file:
+                for line in file:
+                    reject = json.loads(line)
+                    reasons.setdefault(reject["table"], {})[reject["row_number"]] = reject["reason"]
+
+        return (summaries, reasons)
+
+    def test_invalid_rows_are_rejected(self):
+        pilots = self.write_json_lines("pilots.jsonl", [
+            {"pilot_id": 1, "first_name": "Amelia", "last_name": "Earhart", "date_of_birth": "1897-07-24"},
+            {"pilot_id": 1, "first_name": "Chuck", "last_name": "Yeager", "date_of_birth": "1923-02-13"}, # the same id in the same batch
+            {"first_name": "Bessie", "last_name": "Coleman", "date_of_birth": "1892-02-30"},
+            {"first_name": "Bessie", "date_of_birth": "1892-01-26"},
+            "not json",
+            [1, 2, 3],
+            {"pilot_id": "x", "first_name": "Jean", "last_name": "Batten", "date_of_birth": "1909-09-15"},
+            {"pilot_id": 1, "first_name": "Amy", "last_name": "Johnson", "date_of_birth": "1903-07-01"}, # the same id in a later batch
+            {"first_name": "Bessie", "last_name": "Coleman", "date_of_birth": "1892-01-26"}
+        ])
+
+        (summaries, reasons) = self.import_files({"pilots": pilots})
+
+        self.assertEqual((summaries["pilots"].count, summaries["pilots"].rejected), (2, 7))
+        self.assertEqual(reasons["pilots"], {
+            2: "pilots already has a row with that id",
+            3: f"Invalid date_of_birth. {self.db.pilots.get_column('date_of_birth').validation_prompt}",
+            4: "Missing last_name",
+            5: "A row must be a JSON object",
+            6: "A row must be a JSON object",
+            7: "pilot_id must be a non negative integer",
+            8: "pilots already has a row with that id"
+        })
+        self.assertEqual([(pilot.pilot_id, pilot.last_name) for pilot in self.db.pilots.get_all()], [(1, "Earhart"), (2, "Coleman")])
+
+    def test_foreign_keys_are_checked(self):
+        airports = self.write_json_lines("airports.jsonl.gz", [{"airport_id": 1, "name": "Heathrow", "address": "Longford, Hounslow"}])
+        terminals = os.path.join(self.directory.name, "terminals.csv")
+        with open(terminals, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["terminal_id", "airport_id", "name"])
+            writer.writerows([[1, 1, "Terminal 1"], [2, 7, "Terminal 2"], [3, "", "Terminal 3"]])
+
+        (summaries, reasons) = self.import_files({"terminals": terminals, "airports": airports})
+
+        self.assertEqual(summaries["airports"].count, 1) # imported first as terminals point to airports
+        self.assertEqual((summaries["terminals"].count, summaries["terminals"].rejected), (1, 2))
+        self.assertEqual(reasons["terminals"], {2: "No row in airports has that airport_id", 3: "Missing airport_id"})
+
+    def test_passengers_need_a_free_seat_on_the_flight(self):
+        flight_id = self.insert_flight(max_passengers=3)
+        customer_ids = self.insert_customers(6)
+        self.db.flight_passengers.assign_seat(flight_id, customer_ids[0], 1)
+
+        passengers = self.write_json_lines("flight_passengers.jsonl", [
+            {"flight_id": flight_id, "customer_id": customer_ids[0], "seat_number": 2}, # already on the flight
+            {"flight_id": flight_id, "customer_id": customer_ids[1], "seat_number": 1}, # a taken seat
+            {"flight_id": flight_id, "customer_id": customer_ids[1], "seat_number": 0},
+            {"flight_id": flight_id, "customer_id": customer_ids[1], "seat_number": 4},
+            {"flight_id": flight_id, "customer_id": customer_ids[1], "seat_number": 3},
+            {"flight_id": flight_id, "customer_id": customer_ids[1], "seat_number": 2}, # the same pair in the same batch
+            {"flight_id": flight_id, "customer_id": customer_ids[2]}, # given the next available seat
+            {"flight_id": flight_id, "customer_id": customer_ids[3]}, # the flight is full
+            {"flight_id": 999, "customer_id": customer_ids[4], "seat_number": 1}
+        ])
+
+        (summaries, reasons) = self.import_files({"flight_passengers": passengers}, batch_size=100)
+
+        self.assertEqual((summaries["flight_passengers"].count, summaries["flight_passengers"].rejected), (2, 7))
+        self.assertEqual(reasons["flight_passengers"], {
+            1: "That row is already in flight_passengers",
+            2: "That seat is taken",
+            3: "seat_number must be between 1 and 3 inclusive",
+            4: "seat_number must be between 1 and 3 inclusive",
+            6: "That row is already in flight_passengers",
+            8: "There are no more available seats on this flight",
+            9: "No row in flights has that flight_id"
+        })
+
+        seats = {passenger.customer_id: passenger.seat_number for passenger in self.db.flight_passengers.get_all()}
+        self.assertEqual(seats, {customer_ids[0]: 1, customer_ids[1]: 3, customer_ids[2]: 2})
+        self.assertEqual(self.db.statistics.get_flight_passenger_count(flight_id)[3], 3)
+        self.assertIsNone(self.db.flight_passengers.get_next_available_seat(flight_id))
\ No newline at end of file
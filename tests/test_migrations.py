@@ -0,0 +1,155 @@
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from database.Database import Database, schema_version
+from database.DatabaseError import DatabaseError
+
+# the tables as the first version of the program made them (version 0 of the schema)
+# flight times are text and the junction tables have rowids
+baseline_tables = [
+    "CREATE TABLE pilots (pilot_id INTEGER PRIMARY KEY, first_name VARCHAR(40) NOT NULL, last_name VARCHAR(40) NOT NULL, date_of_birth VARCHAR(19) NOT NULL);",
+    "CREATE TABLE airports (airport_id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, address TEXT NOT NULL);",
+    """
+        CREATE TABLE terminals (
+            terminal_id INTEGER PRIMARY KEY, airport_id INTEGER NOT NULL, name VARCHAR(100) NOT NULL,
+            FOREIGN KEY (airport_id) REFERENCES airports ON DELETE CASCADE
+        );
+    """,
+    """
+        CREATE TABLE customers (
+            customer_id INTEGER PRIMARY KEY, first_name VARCHAR(40) NOT NULL, last_name VARCHAR(40) NOT NULL,
+            date_of_birth VARCHAR(10) NOT NULL, home_address TEXT NOT NULL, phone_number VARCHAR(15)
+        );
+    """,
+    "CREATE TABLE aircrafts (aircraft_id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL, type INTEGER NOT NULL, max_passengers INTEGER NOT NULL);",
+    """
+        CREATE TABLE flights (
+            flight_id INTEGER PRIMARY KEY, aircraft_id INTEGER NOT NULL, terminal_id INTEGER NOT NULL, destination VARCHAR(100) NOT NULL,
+            boarding_time VARCHAR(19) NOT NULL, departure_time VARCHAR(19) NOT NULL, arrival_time VARCHAR(19) NOT NULL,
+            FOREIGN KEY (aircraft_id) REFERENCES aircrafts ON DELETE CASCADE,
+            FOREIGN KEY (terminal_id) REFERENCES terminals ON DELETE CASCADE
+        );
+    """,
+    """
+        CREATE TABLE flight_passengers (
+            flight_id INTEGER, customer_id INTEGER, seat_number INTEGER NOT NULL,
+            PRIMARY KEY (flight_id, customer_id),
+            FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
+            FOREIGN KEY (customer_id) REFERENCES customers ON DELETE CASCADE
+        );
+    """,
+    """
+        CREATE TABLE flight_pilots (
+            flight_id INTEGER, pilot_id INTEGER,
+            PRIMARY KEY (flight_id, pilot_id),
+            FOREIGN KEY (flight_id) REFERENCES flights ON DELETE CASCADE,
+            FOREIGN KEY (pilot_id) REFERENCES pilots ON DELETE CASCADE
+        );
+    """
+]
+
+baseline_flights = [
+    (1, 1, 1, "Malaga", "2030-01-07 09:00:00", "2030-01-07 09:40:00", "2030-01-07 12:25:00"),
+    (2, 2, 1, "Malaga", "2030-01-08 23:30:00", "2030-01-09 00:10:00", "2030-01-09 02:55:00"),
+    (3, 1, 2, "Dublin", "2030-02-01 06:00:00", "2030-02-01 06:40:00", "2030-02-01 07:55:00")
+]
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.directory.name, "airline")
+
+        # a database made by the first version of the program
+        connection = sqlite3.connect(f"{self.db_name}.db")
+        for sql in baseline_tables:
+            connection.execute(sql)
+
+        connection.executemany("INSERT INTO pilots VALUES (?, ?, ?, ?);", [(1, "Amelia", "Earhart", "1897-07-24"), (2, "Chuck", "Yeager", "1923-02-13")])
+        connection.execute("INSERT INTO airports VALUES (1, 'Heathrow', 'Longford, Hounslow');")
+        connection.executemany("INSERT INTO terminals VALUES (?, 1, ?);", [(1, "Terminal 1"), (2, "Terminal 2")])
+        connection.executemany("INSERT INTO customers VALUES (?, 'John', 'Smith', '1990-01-01', '1 High Street', NULL);", [(n,) for n in range(1, 5)])
+        connection.executemany("INSERT INTO aircrafts VALUES (?, ?, 1, ?);", [(1, "Airbus A320", 4), (2, "ATR 72", 2)])
+        connection.executemany("INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?);", baseline_flights)
+        connection.executemany("INSERT INTO flight_passengers VALUES (?, ?, ?);", [(1, 1, 1), (1, 2, 2), (1, 3, 4), (2, 1, 1), (2, 4, 2)])
+        connection.executemany("INSERT INTO flight_pilots VALUES (?, ?);", [(1, 1), (1, 2), (3, 2)])
+        connection.commit()
+        connection.close()
+
+        self.db = Database(self.db_name, exit_on_error=False)
+        self.db.connect()
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    # upgrades the database without printing how far through copying each table it is
+    def upgrade(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            self.db.create_tables()
+
+    def test_upgrade_keeps_every_row(self):
+        self.upgrade()
+
+        self.assertEqual(self.db.connection.execute("PRAGMA user_version;").fetchone()[0], schema_version)
+        self.assertEqual(self.db.connection.execute("PRAGMA foreign_key_check;").fetchall(), [])
+        self.assertEqual(self.db.connection.execute("PRAGMA integrity_check;").fetchone()[0], "ok")
+
+        # the times are stored as epochs but read back as they were written
+        flights = [(flight.flight_id, flight.aircraft_id, flight.terminal_id, flight.destination, flight.boarding_time, flight.departure_time, flight.arrival_time) for flight in self.db.flights.get_all()]
+        self.assertEqual(sorted(flights), baseline_flights)
+        self.assertEqual(self.db.connection.execute("SELECT typeof(boarding_time) FROM flights LIMIT 1;").fetchone()[0], "integer")
+
+        self.assertEqual(sorted(tuple(row) for row in self.db.flight_passengers.get_all()), [(1, 1, 1), (1, 2, 2), (1, 3, 4), (2, 1, 1), (2, 4, 2)])
+        self.assertEqual(sorted(tuple(row) for row in self.db.flight_pilots.get_all()), [(1, 1), (1, 2), (3, 2)])
+        self.assertEqual(sum(1 for _ in self.db.customers.get_all()), 4)
+
+    def test_upgrade_removes_the_rowids_of_the_junction_tables(self):
+        self.upgrade()
+
+        for table_name in ["flight_passengers", "flight_pilots"]:
+            sql = self.db.connection.execute("SELECT sql FROM sqlite_master WHERE name = ?;", (table_name,)).fetchone()[0]
+            self.assertIn("WITHOUT ROWID", sql)
+
+    def test_upgrade_backfills_the_counts(self):
+        self.upgrade()
+
+        passenger_counts = dict(self.db.connection.execute("SELECT flight_id, passenger_count FROM flights;").fetchall())
+        self.assertEqual(passenger_counts, {1: 3, 2: 2, 3: 0})
+        load_factors = dict(self.db.connection.execute("SELECT flight_id, load_factor FROM flights;").fetchall())
+        self.assertEqual(load_factors, {1: 0.75, 2: 1.0, 3: 0.0})
+
+        # 2030-01-07 and 2030-01-09 are in the same ISO week
+        self.assertEqual(self.db.statistics.get_flights_per_week(), [(2030, 5, 1), (2030, 2, 2)])
+        self.assertEqual(self.db.statistics.get_flights_per_month("Malaga"), [(2030, 1, 2)])
+        self.assertEqual(self.db.statistics.get_flights_per_month("Dublin"), [(2030, 2, 1)])
+
+    # the triggers made by the upgrade keep the backfilled columns up to date
+    def test_upgraded_database_can_be_changed(self):
+        self.upgrade()
+
+        self.assertEqual(self.db.flight_passengers.assign_seat(1, 4).seat_number, 3)
+        self.assertIsNone(self.db.flight_passengers.assign_seat(1, 4))
+        self.assertEqual(self.db.statistics.get_flight_passenger_count(1), (1, "Malaga", 4, 4))
+
+        self.db.flights.delete_and_return("flights.flight_id", "3")
+        self.assertEqual(self.db.statistics.get_flights_per_month("Dublin"), [])
+        self.assertEqual(sorted(tuple(row) for row in self.db.flight_pilots.get_all()), [(1, 1), (1, 2)])
+
+    def test_upgrading_again_changes_nothing(self):
+        self.upgrade()
+        before = sorted(self.db.connection.execute("SELECT * FROM flights;").fetchall())
+        self.db.close()
+
+        self.db = Database(self.db_name, exit_on_error=False)
+        self.db.connect()
+        self.upgrade()
+        self.assertEqual(sorted(self.db.connection.execute("SELECT * FROM flights;").fetchall()), before)
+        self.assertEqual(self.db.statistics.get_flights_per_month("Malaga"), [(2030, 1, 2)])
+
+    def test_newer_database_is_not_opened(self):
+        self.db.connection.execute(f"PRAGMA user_version = {schema_version + 1};")
+        with self.assertRaises(DatabaseError):
+            self.db.create_tables()
\ No newline at end of file
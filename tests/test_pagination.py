@@ -0,0 +1,83 @@
+import io
+from contextlib import redirect_stdout
+from unittest import mock
+from cli.KeysetPaginator import KeysetPaginator
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestKeysetPagination(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.customer_ids = self.insert_customers(12)
+
+        # every third customer is called Jane so filtering by first_name skips rows
+        for customer_id in self.customer_ids[::3]:
+            self.db.customers.update(customer_id, "first_name", "Jane")
+        self.jane_ids = self.customer_ids[::3]
+
+    def get_ids(self, rows: list) -> list[int]:
+        return [row.customer_id for row in rows]
+
+    def test_pages_follow_the_last_key(self):
+        pages = []
+        after_key = None
+        while True:
+            rows = self.db.customers.get_page(after_key, 5)
+            if len(rows) == 0:
+                break
+            pages.append(self.get_ids(rows))
+            after_key = rows[-1].customer_id
+
+        self.assertEqual(pages, [self.customer_ids[:5], self.customer_ids[5:10], self.customer_ids[10:]])
+
+    def test_pages_can_be_filtered(self):
+        self.assertEqual(self.get_ids(self.db.customers.get_page(None, 3, "first_name", "Jane")), self.jane_ids[:3])
+        self.assertEqual(self.get_ids(self.db.customers.get_page(self.jane_ids[2], 3, "first_name", "Jane")), self.jane_ids[3:])
+        self.assertEqual(self.db.customers.get_page(None, 3, "first_name", "Nobody"), [])
+
+    def test_key_at(self):
+        self.assertEqual(self.db.customers.get_key_at(0), self.customer_ids[0])
+        self.assertEqual(self.db.customers.get_key_at(11), self.customer_ids[11])
+        self.assertIsNone(self.db.customers.get_key_at(12))
+        self.assertEqual(self.db.customers.get_key_at(1, "first_name", "Jane"), self.jane_ids[1])
+        self.assertIsNone(self.db.customers.get_key_at(4, "first_name", "Jane"))
+
+    def test_count_rows_stops_at_limit(self):
+        self.assertEqual(self.db.customers.count_rows(), 12)
+        self.assertEqual(self.db.customers.count_rows(limit=5), 5)
+        self.assertEqual(self.db.customers.count_rows("first_name", "Jane"), 4)
+
+    def test_paginator_jumps_to_pages(self):
+        paginator = KeysetPaginator(self.db.customers, page_size=5)
+
+        # jump straight to the last page then go back to one that has not been visited
+        self.assertEqual(self.get_ids(paginator.get_page(2)), self.customer_ids[10:])
+        self.assertTrue(paginator.is_last_page())
+        self.assertEqual(self.get_ids(paginator.get_page(1)), self.customer_ids[5:10])
+        self.assertFalse(paginator.is_last_page())
+        self.assertEqual(paginator.get_page(3), [])
+        self.assertEqual(paginator.get_num_of_pages(), (3, True))
+
+    def test_paginator_count_is_a_lower_bound(self):
+        paginator = KeysetPaginator(self.db.customers, "first_name", "Jane", page_size=1, count_limit=3)
+
+        self.assertEqual(paginator.get_num_of_pages(), (3, False))
+        self.assertEqual(self.get_ids(paginator.get_page(0)), self.jane_ids[:1])
+        self.assertEqual(self.get_ids(paginator.get_page(3)), self.jane_ids[3:])
+        self.assertTrue(paginator.is_last_page())
+
+    # runs the paginator with the inputs and returns the number of each page that was shown
+    def start_paginator(self, inputs: list[str]) -> list[int]:
+        paginator = KeysetPaginator(self.db.customers, page_size=5)
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=inputs), redirect_stdout(output):
+            paginator.start()
+
+        return [int(line.split()[1]) for line in output.getvalue().splitlines() if line.startswith("Page ")]
+
+    def test_paginator_input(self):
+        self.assertEqual(self.start_paginator(["", "", ""]), [1, 2, 3])
+        self.assertEqual(self.start_paginator(["3", "1", "0"]), [1, 3, 1])
+        self.assertEqual(self.start_paginator(["00"]), [1])
+        self.assertEqual(self.start_paginator(["-1"]), [1])
+        self.assertEqual(self.start_paginator(["9", "x", "", ""]), [1, 1, 2, 3])
+        self.assertEqual(KeysetPaginator(self.db.customers).get_page(-1), [])
\ No newline at end of file
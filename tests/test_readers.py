@@ -0,0 +1,29 @@
+import gc
+from database.DatabaseError import DatabaseError
+from tests.DatabaseTestCase import DatabaseTestCase
+
+# every read checks a reader out of db.readers so each test checks that it was checked back in
+class TestReaders(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_customers(3)
+        list(self.db.customers.get_all()) # opens a reader and checks it in
+        self.num_of_readers = self.db.readers.qsize()
+
+    def test_failed_query_releases_the_reader(self):
+        with self.assertRaises(DatabaseError):
+            self.db.customers.get_page(None, 5, "no_such_column", "x")
+        self.assertEqual(self.db.readers.qsize(), self.num_of_readers)
+
+        with self.assertRaises(DatabaseError):
+            self.db.statistics.iterate_named_statistic("flights-per-month", {"destination": ["not", "a", "string"]})
+        self.assertEqual(self.db.readers.qsize(), self.num_of_readers)
+
+    def test_rows_that_are_never_iterated_release_the_reader(self):
+        for _ in range(self.db.num_of_readers + 1):
+            self.db.customers.get_all()
+            self.db.statistics.iterate_named_statistic("customers-by-flights", {})
+        gc.collect()
+
+        self.assertEqual(self.db.readers.qsize(), self.num_of_readers)
+        self.assertEqual(len(list(self.db.customers.get_all())), 3)
\ No newline at end of file
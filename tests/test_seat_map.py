@@ -0,0 +1,92 @@
+import unittest
+from database.flight_passenger.SeatMap import SeatMap
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestSeatMap(unittest.TestCase):
+    def test_seats_outside_the_flight_are_never_available(self):
+        seat_map = SeatMap(4)
+        self.assertEqual([seat_map.is_available(n) for n in range(-1, 7)], [False, False, True, True, True, True, False, False])
+        self.assertFalse(seat_map.is_available(99))
+
+    def test_seats_outside_the_flight_cannot_be_taken(self):
+        seat_map = SeatMap(4)
+        self.assertFalse(seat_map.take(0))
+        self.assertFalse(seat_map.take(5))
+        self.assertFalse(seat_map.take(-1))
+        seat_map.free(-1)
+        self.assertEqual(seat_map.get_num_of_free_seats(), 4)
+
+        self.assertTrue(seat_map.take(4))
+        self.assertFalse(seat_map.is_available(4))
+        self.assertEqual(seat_map.get_num_of_free_seats(), 3)
+
+    # e.g. seats taken before the aircraft's number of seats was lowered
+    def test_taken_seats_outside_the_flight_are_ignored(self):
+        seat_map = SeatMap(3, [0, 2, 7])
+        self.assertEqual(seat_map.get_num_of_free_seats(), 2)
+        self.assertEqual(seat_map.get_next_available(), 1)
+
+    def test_next_available(self):
+        seat_map = SeatMap(3, [1, 2])
+        self.assertEqual(seat_map.get_next_available(), 3)
+
+        seat_map.take(3)
+        self.assertIsNone(seat_map.get_next_available())
+        self.assertEqual(seat_map.get_num_of_free_seats(), 0)
+
+        seat_map.free(2)
+        self.assertEqual(seat_map.get_next_available(), 2)
+
+        self.assertIsNone(SeatMap(0).get_next_available())
+
+    def test_adjacent_available(self):
+        seat_map = SeatMap(10, [1, 3, 7])
+        self.assertEqual(seat_map.get_adjacent_available(1), 2)
+        self.assertEqual(seat_map.get_adjacent_available(2), 4)
+        self.assertEqual(seat_map.get_adjacent_available(3), 4)
+        self.assertEqual(seat_map.get_adjacent_available(4), None)
+        self.assertIsNone(seat_map.get_adjacent_available(0))
+
+    def test_adjacent_available_does_not_run_past_the_last_seat(self):
+        seat_map = SeatMap(5, [1, 2])
+        self.assertEqual(seat_map.get_adjacent_available(3), 3)
+        self.assertIsNone(seat_map.get_adjacent_available(4))
+        self.assertEqual(SeatMap(5).get_adjacent_available(5), 1)
+        self.assertIsNone(SeatMap(5).get_adjacent_available(6))
+
+    # compares every length of run against checking each seat one at a time
+    def test_adjacent_available_matches_checking_every_seat(self):
+        taken_seats = [2, 5, 6, 11, 12, 13, 20, 31]
+        seat_map = SeatMap(32, taken_seats)
+        for num_of_seats in range(1, 34):
+            expected = next((start for start in range(1, 34 - num_of_seats) if all(seat_map.is_available(n) for n in range(start, start + num_of_seats))), None)
+            self.assertEqual(seat_map.get_adjacent_available(num_of_seats), expected, num_of_seats)
+
+class TestFlightPassengerSeats(DatabaseTestCase):
+    def test_assign_seat_checks_the_seat_is_on_the_flight(self):
+        flight_id = self.insert_flight(max_passengers=4)
+        (customer_id,) = self.insert_customers(1)
+
+        self.assertFalse(self.db.flight_passengers.is_seat_available(flight_id, 0))
+        self.assertFalse(self.db.flight_passengers.is_seat_available(flight_id, 99))
+        self.assertIsNone(self.db.flight_passengers.assign_seat(flight_id, customer_id, 0))
+        self.assertIsNone(self.db.flight_passengers.assign_seat(flight_id, customer_id, 99))
+        self.assertFalse(self.db.flight_passengers.exists(flight_id, customer_id))
+
+        self.assertEqual(self.db.flight_passengers.assign_seat(flight_id, customer_id, 4).seat_number, 4)
+
+    def test_seats_are_taken_and_freed(self):
+        flight_id = self.insert_flight(max_passengers=3)
+        customer_ids = self.insert_customers(4)
+
+        seats = [self.db.flight_passengers.assign_seat(flight_id, customer_id) for customer_id in customer_ids]
+        self.assertEqual([seat.seat_number for seat in seats[:3]], [1, 2, 3])
+        self.assertIsNone(seats[3]) # the flight is full
+        self.assertEqual(self.db.flight_passengers.get_num_of_free_seats(flight_id), 0)
+
+        self.db.flight_passengers.delete_and_return(flight_id, customer_ids[1])
+        self.assertEqual(self.db.flight_passengers.get_next_available_seat(flight_id), 2)
+
+        self.db.flight_passengers.change_seat(flight_id, customer_ids[0], 2)
+        self.assertEqual(self.db.flight_passengers.get_next_available_seat(flight_id), 1)
+        self.assertEqual(self.db.flight_passengers.get_adjacent_available_seats(flight_id, 2), None)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import http.client
+import json
+import threading
+from web.Server import Server
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestServer(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = Server(("127.0.0.1", 0), self.db) # port 0 lets the os choose a free port
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        super().tearDown()
+
+    # sends a request on connection and returns (status, body). a body of JSON lines is returned as a list
+    def request(self, connection: http.client.HTTPConnection, method: str, path: str, body=None) -> (int, object):
+        connection.request(method, path, None if body is None else json.dumps(body), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        lines = response.read().decode().splitlines()
+
+        if len(lines) == 1:
+            return (response.status, json.loads(lines[0]))
+        return (response.status, [json.loads(line) for line in lines])
+
+    def connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(*self.server.server_address, timeout=10)
+
+    def test_reads_during_writes(self):
+        flight_id = self.insert_flight(max_passengers=150)
+        customer = {"first_name": "John", "last_name": "Smith", "date_of_birth": "1990-01-01", "home_address": "1 High Street", "phone_number": "07123456789"}
+        responses = []
+
+        def get_seats() -> None:
+            connection = self.connect()
+            for _ in range(40):
+                responses.append(self.request(connection, "GET", f"/flights/{flight_id}/seats")[0])
+            connection.close()
+
+        def insert_customers() -> None:
+            connection = self.connect()
+            for _ in range(40):
+                responses.append(self.request(connection, "POST", "/customers", customer)[0])
+            connection.close()
+
+        threads = [threading.Thread(target=target) for target in [get_seats, get_seats, get_seats, insert_customers, insert_customers]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(responses), [200] * 120 + [201] * 80)
+        self.assertEqual(self.db.customers.count_rows(), 80)
+
+    # the row in the response is the row that was stored, not the strings in the request
+    def test_insert_returns_the_stored_row(self):
+        connection = self.connect()
+        (status, aircraft) = self.request(connection, "POST", "/aircrafts", {"name": "Boeing 747", "type": "1", "max_passengers": "400"})
+        self.assertEqual(status, 201)
+        self.assertEqual(aircraft, {"aircraft_id": 1, "name": "Boeing 747", "type": 1, "max_passengers": 400})
+        self.assertEqual(self.request(connection, "GET", "/aircrafts/1"), (200, aircraft))
+
+        self.insert_flight()
+        flight = {"aircraft_id": "1", "terminal_id": "1", "destination": "Paris", "boarding_time": "2030-01-02 09:00:00", "departure_time": "2030-01-02 10:00:00", "arrival_time": "2030-01-02 11:30:00"}
+        (status, flight) = self.request(connection, "POST", "/flights", flight)
+        self.assertEqual(status, 201)
+        self.assertEqual((flight["aircraft_id"], flight["terminal_id"]), (1, 1))
+
+        # a flight from GET also has the names of its aircraft and terminal
+        found_flight = self.request(connection, "GET", f"/flights/{flight['flight_id']}")[1]
+        self.assertEqual({name: found_flight[name] for name in flight}, flight)
+        connection.close()
\ No newline at end of file
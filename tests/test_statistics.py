@@ -0,0 +1,66 @@
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestNamedStatistics(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # three upcoming flights with 1, 3 and 2 of their 4 seats taken
+        self.flight_ids = [self.insert_flight(max_passengers=4, days_from_now=n) for n in range(1, 4)]
+        customer_ids = self.insert_customers(3)
+        for (flight_id, num_of_passengers) in zip(self.flight_ids, [1, 3, 2]):
+            for customer_id in customer_ids[:num_of_passengers]:
+                self.db.flight_passengers.assign_seat(flight_id, customer_id)
+
+    def get_upcoming_flight_ids(self, arguments: dict[str, str]) -> list[int]:
+        rows = self.db.statistics.get_named_statistic("upcoming-flights-by-used-seats", arguments)
+        return [row["flight_id"] for row in rows]
+
+    def test_limit(self):
+        self.assertEqual(self.get_upcoming_flight_ids({"limit": "2"}), [self.flight_ids[1], self.flight_ids[2]])
+        self.assertEqual(self.get_upcoming_flight_ids({"limit": "1"}), [self.flight_ids[1]])
+        self.assertEqual(len(self.get_upcoming_flight_ids({"limit": "10"})), 3)
+
+    # 0 is every flight in the statistics menu so it is for every other way of getting the statistic too
+    def test_no_limit_is_every_row(self):
+        expected = [self.flight_ids[1], self.flight_ids[2], self.flight_ids[0]]
+        for arguments in [{}, {"limit": "0"}, {"limit": "00"}, {"limit": ""}, {"limit": "-1"}, {"limit": None}]:
+            self.assertEqual(self.get_upcoming_flight_ids(arguments), expected, arguments)
+
+    # a limit that isn't a number is an error like a missing argument instead of being every row
+    def test_limit_must_be_a_number(self):
+        for limit in ["ten", "1.5", "2x"]:
+            with self.assertRaises(ValueError):
+                self.db.statistics.get_named_statistic("upcoming-flights-by-used-seats", {"limit": limit})
+            with self.assertRaises(ValueError):
+                self.db.statistics.iterate_named_statistic("upcoming-flights-by-used-seats", {"limit": limit})
+
+    def test_rows_are_named(self):
+        (row,) = self.db.statistics.get_named_statistic("upcoming-flights-by-used-seats", {"limit": "1"})
+        self.assertEqual(row["num_of_passengers"], 3)
+        self.assertEqual(row["max_passengers"], 4)
+        self.assertEqual(row["boarding_time"], f"{self.get_date(2)} 09:00:00")
+
+    def test_missing_argument(self):
+        with self.assertRaises(ValueError):
+            self.db.statistics.get_named_statistic("flights-per-month", {})
+        with self.assertRaises(ValueError):
+            self.db.statistics.iterate_named_statistic("pilot-air-time", {"flight_id": "1"})
+
+    def test_single_row_statistics(self):
+        row = self.db.statistics.get_named_statistic("flight-passenger-count", {"flight_id": str(self.flight_ids[2])})
+        self.assertEqual(row, {"flight_id": self.flight_ids[2], "destination": "Malaga", "max_passengers": 4, "num_of_passengers": 2})
+        self.assertIsNone(self.db.statistics.get_named_statistic("flight-passenger-count", {"flight_id": "999"}))
+        self.assertEqual(list(self.db.statistics.iterate_named_statistic("flight-passenger-count", {"flight_id": "999"})), [])
+
+    def test_iterating_gets_the_same_rows(self):
+        for (statistic_name, arguments) in [("customers-by-flights", {}), ("flights-per-month", {"destination": "Malaga"}), ("upcoming-flights-by-used-seats", {"limit": "2"})]:
+            self.assertEqual(list(self.db.statistics.iterate_named_statistic(statistic_name, arguments)), self.db.statistics.get_named_statistic(statistic_name, arguments))
+
+    # the reader of a statistic that is only partly iterated over is released when it is closed
+    def test_closing_releases_the_reader(self):
+        self.db.fetch_size = 1
+        rows = self.db.statistics.iterate_named_statistic("customers-by-flights", {})
+        next(rows)
+        num_of_readers = self.db.readers.qsize()
+        rows.close()
+        self.assertEqual(self.db.readers.qsize(), num_of_readers + 1)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import threading
+from tests.DatabaseTestCase import DatabaseTestCase
+
+class TestThreads(DatabaseTestCase):
+    # runs each function on its own thread num_of_times times and returns every exception raised
+    def run_threads(self, functions: list, num_of_times: int = 300) -> list[Exception]:
+        errors = []
+
+        def run(function) -> None:
+            try:
+                for _ in range(num_of_times):
+                    function()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(function,)) for function in functions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return errors
+
+    # reads that run outside of a transaction must not use the writer's cursor while another thread is writing with it
+    def test_reads_during_writes(self):
+        flight_id = self.insert_flight(max_passengers=150)
+
+        def read() -> None:
+            self.assertEqual(self.db.flight_passengers.get_max_passengers(flight_id), 150)
+            self.assertEqual(self.db.customers.count_cascaded_rows("customers.customer_id", "1"), {"flight_passengers": 0})
+
+        def write() -> None:
+            self.insert_customers(1)
+
+        self.assertEqual(self.run_threads([read, read, read, write, write]), [])
+        self.assertEqual(self.db.customers.count_rows(), 600)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import unittest
+from database.validation import is_date, validate_date, validate_date_time, validate_many
+
+class TestValidation(unittest.TestCase):
+    def test_leap_years(self):
+        self.assertTrue(validate_date("2024-02-29"))
+        self.assertTrue(validate_date("2000-02-29")) # divisible by 400
+        self.assertFalse(validate_date("2023-02-29"))
+        self.assertFalse(validate_date("1900-02-29")) # divisible by 100 but not 400
+        self.assertFalse(validate_date("2024-02-30"))
+
+    def test_month_lengths(self):
+        lengths = {1: 31, 2: 28, 3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31}
+        for (month, length) in lengths.items():
+            self.assertTrue(validate_date(f"2023-{month:02d}-{length:02d}"))
+            self.assertFalse(validate_date(f"2023-{month:02d}-{length + 1:02d}"))
+            self.assertTrue(validate_date(f"2023-{month:02d}-01"))
+            self.assertFalse(validate_date(f"2023-{month:02d}-00"))
+
+    def test_months_and_years(self):
+        self.assertFalse(validate_date("2023-00-10"))
+        self.assertFalse(validate_date("2023-13-10"))
+        self.assertFalse(validate_date("0000-01-01"))
+        self.assertTrue(validate_date("0001-01-01"))
+        self.assertTrue(validate_date("9999-12-31"))
+
+    def test_format(self):
+        for date in ["2023-1-01", "2023/01/01", "20230101", "2023-01-01 ", "2023-01-1a", " 2023-01-01", "", "2023-01-+1"]:
+            self.assertFalse(validate_date(date), date)
+
+        # str.isdigit is also True for digits that aren't ascii e.g. full width and superscript digits
+        self.assertFalse(validate_date("２０２３-01-01"))
+        self.assertFalse(validate_date("2023-0²-01"))
+
+    def test_is_date_only_checks_the_first_10_characters(self):
+        self.assertTrue(is_date("2024-02-29 anything"))
+        self.assertFalse(is_date("2024-02-30 00:00:00"))
+
+    def test_date_times(self):
+        self.assertTrue(validate_date_time("2024-02-29 23:59:59"))
+        self.assertTrue(validate_date_time("2023-01-01 00:00:00"))
+        self.assertFalse(validate_date_time("2023-02-29 12:00:00"))
+        self.assertFalse(validate_date_time("2023-01-01 24:00:00"))
+        self.assertFalse(validate_date_time("2023-01-01 12:60:00"))
+        self.assertFalse(validate_date_time("2023-01-01 12:00:60"))
+        self.assertFalse(validate_date_time("2023-01-01T12:00:00"))
+        self.assertFalse(validate_date_time("2023-01-01 12:00"))
+        self.assertFalse(validate_date_time("2023-01-01 1 :00:00"))
+        self.assertFalse(validate_date_time("2023-01-01"))
+
+    def test_validate_many_keeps_the_order(self):
+        values = ["2023-01-01", "2023-02-30", "2023-01-01", "x", "2024-02-29"]
+        self.assertEqual(validate_many(values, validate_date), [True, False, True, False, True])
+        self.assertEqual(validate_many(iter(values), validate_date), [True, False, True, False, True])
+        self.assertEqual(validate_many([], validate_date), [])
\ No newline at end of file